@@ -0,0 +1,177 @@
+# ai/context_engine.py
+"""
+Context-based confidence for regex findings. All CONTEXT_KEYWORDS are compiled into one
+Aho-Corasick automaton, so the text around a batch of matches is walked once no matter how
+many keywords there are; each match is then scored by its distance to the nearest keyword of
+its own category.
+"""
+import bisect
+import os
+from collections import deque
+from itertools import accumulate
+
+from ai.pii_categories import canonical_category
+from ai.regex_patterns import CONTEXT_KEYWORDS
+
+try:
+    import ahocorasick  # pyahocorasick: the same automaton, walked in C
+except ImportError:
+    ahocorasick = None
+
+# ==========================================
+# CONFIGURATION (override via .env)
+# ==========================================
+# A keyword this close (in characters) to a match makes it HIGH confidence...
+CONTEXT_NEAR = int(os.getenv("CONTEXT_NEAR", 40))
+# ...and anywhere within this window it lifts the match one level above its base
+CONTEXT_WINDOW = int(os.getenv("CONTEXT_WINDOW", 120))
+# Confidence of a match with no keyword around it. Categories that are missing here have
+# no keywords and keep the detector's default (their patterns are specific enough on their own).
+BASE_CONFIDENCE = {"AADHAAR_ID": "LOW", "PHONE_NUMBER": "LOW", "PAN_CARD": "MEDIUM"}
+LEVELS = ("LOW", "MEDIUM", "HIGH")
+
+# Lower-cases ASCII only, so offsets in the folded text line up with the original
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+class ContextEngine:
+    def __init__(self, keywords=None, near=CONTEXT_NEAR, window=CONTEXT_WINDOW, base=None):
+        keywords = keywords if keywords is not None else CONTEXT_KEYWORDS
+        self.near = near
+        self.window = window
+        self.base = dict(BASE_CONFIDENCE if base is None else base)
+        # keyword -> categories it supports (one word may serve several)
+        self.keywords = {}
+        for category, words in keywords.items():
+            for word in words:
+                self.keywords.setdefault(word.lower(), set()).add(canonical_category(category) or category)
+        self.delta, self.outputs = self._build(self.keywords)
+        self.longest = max(map(len, self.keywords), default=0)
+        self.native = None
+        if ahocorasick is not None and self.keywords:
+            self.native = ahocorasick.Automaton()
+            for word in self.keywords:
+                self.native.add_word(word, word)
+            self.native.make_automaton()
+
+    @staticmethod
+    def _build(keywords):
+        """
+        Classic Aho-Corasick (trie + failure links), then flattened into a full transition table:
+        delta[state][char] is the next state, and any char missing from it means "back to the root".
+        The scan loop is then one dict lookup per character, with no failure-link chasing.
+        """
+        goto, fail, outputs = [{}], [0], [[]]
+        for word in keywords:
+            state = 0
+            for ch in word:
+                if ch not in goto[state]:
+                    goto.append({})
+                    fail.append(0)
+                    outputs.append([])
+                    goto[state][ch] = len(goto) - 1
+                state = goto[state][ch]
+            outputs[state].append(word)
+
+        # Breadth-first: failure links, inherited outputs and the flattened transitions
+        delta = [dict(goto[0])] + [None] * (len(goto) - 1)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            delta[state] = dict(delta[fail[state]])
+            for ch, child in goto[state].items():
+                fail[child] = delta[fail[state]].get(ch, 0) if state else 0
+                delta[state][ch] = child
+                queue.append(child)
+        return delta, outputs
+
+    def find(self, text, start=0, end=None):
+        """Yields (keyword_start, keyword_end, keyword) for whole-word keyword hits in text[start:end]."""
+        end = len(text) if end is None else end
+        folded = text[start:end].translate(_ASCII_LOWER)
+        for last, word in self._walk(folded):
+            lo, hi = start + last + 1 - len(word), start + last + 1
+            # Whole words only: "call" must not fire inside "recall"
+            if (lo == 0 or not text[lo - 1].isalnum()) and (hi == len(text) or not text[hi].isalnum()):
+                yield lo, hi, word
+
+    def _walk(self, folded):
+        """Yields (index of the last character, keyword) for every keyword occurrence."""
+        if self.native is not None:
+            yield from self.native.iter(folded)
+            return
+        delta, outputs = self.delta, self.outputs
+        state = 0
+        for i, ch in enumerate(folded):
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                for word in outputs[state]:
+                    yield i, word
+
+    def confidences(self, text, matches, default="HIGH"):
+        """
+        'matches' is a list of (category, start, end) in document order. Returns one confidence
+        per match. Only the text within 'window' of some match is scanned, once.
+        """
+        if not matches:
+            return []
+        # Merge the windows around all matches into disjoint regions, then run the automaton over them.
+        # Regions are padded by the longest keyword so one that straddles a window edge is still seen.
+        reach = self.window + self.longest
+        regions = []
+        for category, start, end in matches:
+            if category not in self.base:
+                continue
+            lo, hi = max(start - reach, 0), min(end + reach, len(text))
+            if regions and lo <= regions[-1][1]:
+                regions[-1][1] = max(regions[-1][1], hi)
+            else:
+                regions.append([lo, hi])
+
+        hits = {}
+        for lo, hi in regions:
+            for kw_start, kw_end, word in self.find(text, lo, hi):
+                for category in self.keywords[word]:
+                    hits.setdefault(category, []).append((kw_start, kw_end))
+        # Per category: keyword starts in order, and the furthest end reached by any keyword up to
+        # each of them. Both lists are sorted, so each side of a match is one bisect away.
+        starts, ends = {}, {}
+        for category, spans in hits.items():
+            spans.sort()
+            starts[category] = [kw_start for kw_start, _ in spans]
+            ends[category] = list(accumulate((kw_end for _, kw_end in spans), max))
+
+        results = []
+        for category, start, end in matches:
+            base = self.base.get(category)
+            if base is None:
+                results.append(default)
+                continue
+            distance = self._distance(starts.get(category), ends.get(category), start, end)
+            if distance <= self.near:
+                results.append("HIGH")
+            elif distance <= self.window:
+                results.append(LEVELS[min(LEVELS.index(base) + 1, len(LEVELS) - 1)])
+            else:
+                results.append(base)
+        return results
+
+    @staticmethod
+    def _distance(starts, ends, start, end):
+        """
+        Characters between the match and the nearest keyword of its category, 0 if one overlaps it.
+        'starts' are the keyword starts in order; ends[i] is the furthest end of keywords 0..i.
+        """
+        if not starts:
+            return float("inf")
+        best = float("inf")
+        # Keywords starting at or after the match's end: the first of them is the nearest
+        after = bisect.bisect_left(starts, end)
+        if after < len(starts):
+            best = starts[after] - end
+        # Keywords starting before it: the one reaching furthest is the nearest (or overlaps)
+        if after > 0:
+            best = min(best, max(start - ends[after - 1], 0))
+        return best
+
+context_engine = ContextEngine()
@@ -0,0 +1,113 @@
+# ai/findings.py
+"""
+The one in-memory shape of a PII finding, shared by the detector, the DPDP checker, the risk
+scorer and the removal letters. A Finding is slotted and does not copy the matched substring:
+it keeps a reference to the scanned text plus the span, and slices the match out on demand.
+Category and confidence codes are interned, so a million findings share a handful of strings.
+
+Stored reports and older payloads still carry plain dicts; as_finding() converts them at the
+boundary, and Finding.get() answers dict-style reads for code that sees both.
+"""
+import sys
+
+class Finding:
+    __slots__ = ("data_category", "confidence", "start", "length", "severity", "_source", "_base")
+
+    def __init__(self, data_category, confidence="HIGH", start=None, end=None, source=None, base=0, severity=None):
+        self.data_category = data_category
+        self.confidence = confidence
+        # Absolute offset of the match in the scanned document (None for synthetic findings).
+        # The length is stored instead of the end: it is a small int, which Python shares.
+        self.start = start
+        self.length = None if start is None else end - start
+        # Overrides the risk level of the exposure this finding came from (risk scorer only)
+        self.severity = severity
+        # The match is source[start - base:end - base]: source is either the whole scanned text
+        # (base = 0, or the slice offset) or just the matched string itself (base = start).
+        # Without a span, source is the match.
+        self._source = source
+        self._base = base
+
+    @property
+    def end(self):
+        return None if self.start is None else self.start + self.length
+
+    @property
+    def match(self):
+        if self._source is None or self.start is None:
+            return self._source
+        at = self.start - self._base
+        return self._source[at:at + self.length]
+
+    @property
+    def span(self):
+        return None if self.start is None else (self.start, self.start + self.length)
+
+    @property
+    def label(self):
+        """The "Category: Match" line shown in an exposure's pii_found."""
+        return f"{self.data_category}: {self.match}"
+
+    def get(self, key, default=None):
+        value = getattr(self, key, None) if key in _FIELDS else None
+        return default if value is None else value
+
+    def __getitem__(self, key):
+        if key not in _FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def to_dict(self):
+        finding = {"data_category": self.data_category}
+        if self._source is not None:
+            finding["match"] = self.match
+        if self.start is not None:
+            finding["span"] = self.span
+        finding["confidence"] = self.confidence
+        if self.severity is not None:
+            finding["severity"] = self.severity
+        return finding
+
+    @classmethod
+    def from_dict(cls, finding):
+        category = finding.get("data_category") or finding.get("entity_type")
+        confidence = finding.get("confidence")
+        match = finding.get("match")
+        start, end = finding.get("span") or (None, None)
+        return cls(
+            sys.intern(category) if isinstance(category, str) else category,
+            sys.intern(confidence) if isinstance(confidence, str) else confidence,
+            start, end, match, start or 0, finding.get("severity")
+        )
+
+    def detached(self):
+        """This finding holding only its matched string, not the text it was found in (for long-lived caches)."""
+        if self._source is None or self.start is None or self._base == self.start:
+            return self
+        return Finding(self.data_category, self.confidence, self.start, self.end, self.match, self.start, self.severity)
+
+    def __reduce__(self):
+        # Pickled (e.g. back from the enrichment pool) with just the match, never the whole text
+        return Finding, (self.data_category, self.confidence, self.start, self.end, self.match,
+                         self.start or 0, self.severity)
+
+    def __eq__(self, other):
+        if not isinstance(other, Finding):
+            return NotImplemented
+        return (self.data_category, self.span, self.match) == (other.data_category, other.span, other.match)
+
+    def __hash__(self):
+        return hash((self.data_category, self.start, self.length))
+
+    def __repr__(self):
+        return f"Finding({self.data_category!r}, {self.match!r}, span={self.span}, confidence={self.confidence!r})"
+
+# Keys Finding.get() / finding[...] answer, mirroring the dict representation
+_FIELDS = frozenset(("data_category", "confidence", "match", "span", "severity", "start", "end"))
+
+def as_finding(finding):
+    """Passes Findings through and converts dict findings (stored reports, older payloads)."""
+    return finding if finding.__class__ is Finding else Finding.from_dict(finding)
+
+def as_findings(findings):
+    return [f if f.__class__ is Finding else Finding.from_dict(f) for f in findings]
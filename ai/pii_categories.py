@@ -1,28 +1,93 @@
 # ai/pii_categories.py
+"""
+The one registry of PII categories. Detector, risk scorer, DPDP checker and removal letters
+all key on the canonical codes below; anything else (AADHAAR, PHONE, entity_type spellings
+from older payloads) is resolved through CATEGORY_ALIASES. Everything is built once at import
+and exposed read-only.
+"""
+from types import MappingProxyType
 
-PII_CONFIG = {
+# Fallback for data with no specific DPDP mapping (e.g. Email or Phone)
+DEFAULT_VIOLATION = MappingProxyType({
+    "section": "Section 12",
+    "violation": "Right to Correction and Erasure",
+    "clause": "Data principal has the right to seek erasure of data that is no longer necessary.",
+    "penalty": "Standard compliance penalties"
+})
+
+_CATEGORIES = {
     "AADHAAR_ID": {
-        "risk": "HIGH", 
+        "risk": "HIGH",
         "category": "Government ID",
         "legal_impact": "Violation of DPDP Act Sec 4 (Personal Data Breach)",
-        "remediation": "Rotate linked bank accounts and lock Aadhaar via UIDAI portal."
+        "remediation": "Rotate linked bank accounts and lock Aadhaar via UIDAI portal.",
+        "aliases": ("AADHAAR", "AADHAR", "UID", "AADHAAR_NUMBER"),
+        "dpdp": {
+            "section": "Section 8(5)",
+            "violation": "Breach of Security Safeguards",
+            "clause": "Fiduciaries must protect personal data in its custody by taking reasonable security safeguards.",
+            "penalty": "Up to ₹250 Crores"
+        }
     },
     "PAN_CARD": {
-        "risk": "CRITICAL", 
+        "risk": "CRITICAL",
         "category": "Financial Identifier",
         "legal_impact": "Financial Data Exposure under DPDP Rules",
-        "remediation": "Monitor CIBIL report for unauthorized loan applications."
+        "remediation": "Monitor CIBIL report for unauthorized loan applications.",
+        "aliases": ("PAN", "PAN_NUMBER"),
+        "dpdp": {
+            "section": "Section 11",
+            "violation": "Right to Data Portability/Erasure",
+            "clause": "Financial data exposed without active consent or purpose limitation.",
+            "penalty": "Significant administrative fines"
+        }
     },
     "PRIVATE_KEY": {
-        "risk": "CRITICAL", 
+        "risk": "CRITICAL",
         "category": "Security Credential",
         "legal_impact": "Systemic Security Risk",
-        "remediation": "Immediate revocation of the key and audit of access logs."
+        "remediation": "Immediate revocation of the key and audit of access logs.",
+        "aliases": ("API_KEY", "SECRET_KEY", "CREDENTIAL", "RSA_KEY"),
+        "dpdp": {
+            "section": "Section 8(1)",
+            "violation": "General Obligation of Data Fiduciary",
+            "clause": "Failure to ensure the accuracy and safety of sensitive security credentials.",
+            "penalty": "Case-specific high-impact fines"
+        }
     },
     "PHONE_NUMBER": {
-        "risk": "MEDIUM", 
+        "risk": "MEDIUM",
         "category": "Contact Information",
         "legal_impact": "Privacy Invasion / Marketing Harassment",
-        "remediation": "Enable DND and monitor for SIM-swap attempts."
-    }
-}
\ No newline at end of file
+        "remediation": "Enable DND and monitor for SIM-swap attempts.",
+        "aliases": ("PHONE", "MOBILE", "MOBILE_NUMBER"),
+        "dpdp": DEFAULT_VIOLATION
+    },
+    "EMAIL": {
+        "risk": "MEDIUM",
+        "category": "Contact Information",
+        "legal_impact": "Exposure of Personal Contact Data",
+        "remediation": "Enable 2FA on linked accounts and watch for targeted phishing.",
+        "aliases": ("EMAIL_ADDRESS", "MAIL"),
+        "dpdp": DEFAULT_VIOLATION
+    },
+}
+
+def _freeze(code, entry):
+    entry = dict(entry, code=code, dpdp=MappingProxyType(dict(entry["dpdp"])))
+    return MappingProxyType(entry)
+
+# Canonical code -> read-only metadata
+PII_CONFIG = MappingProxyType({code: _freeze(code, entry) for code, entry in _CATEGORIES.items()})
+
+# Any accepted spelling (canonical codes included) -> canonical code
+CATEGORY_ALIASES = MappingProxyType({
+    **{alias: code for code, entry in PII_CONFIG.items() for alias in entry["aliases"]},
+    **{code: code for code in PII_CONFIG},
+})
+
+def canonical_category(name):
+    """Canonical code for a category name or alias; None if it is not a known PII category."""
+    if not name:
+        return None
+    return CATEGORY_ALIASES.get(name) or CATEGORY_ALIASES.get(name.upper())
@@ -1,32 +1,201 @@
+import codecs
 import re
 
+from ai.context_engine import context_engine
+from ai.findings import Finding
+from ai.pii_categories import canonical_category
+from ai.regex_patterns import INDIAN_PATTERNS
+from ai.validators import VALIDATE_FINDINGS, VALIDATORS, filter_matches
+
+# Streaming defaults: read 1 MiB at a time and re-scan the last 4 KiB of every chunk.
+# The overlap must be longer than the longest match we expect, or a match could be split.
+STREAM_CHUNK_SIZE = 1 << 20
+STREAM_OVERLAP = 4096
+# Matches are context-scored in blocks of this many, so finditer() stays lazy
+CONTEXT_BLOCK = 1024
+
 class PIIDetector:
-    def __init__(self):
+    def __init__(self, patterns=None, context=None, validators=None):
         # We removed the (?i) from inside the strings to prevent the PatternError
-        self.patterns = {
-            "EMAIL": r"[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}",
-            "AADHAAR": r"\b\d{4}\s\d{4}\s\d{4}\b",
-            "PAN_CARD": r"[A-Z]{5}[0-9]{4}[A-Z]{1}",
-            "PHONE": r"\b(?:\+91|0)?[6-9]\d{9}\b"
+        # Order matters: when two categories match at the same offset, the earlier one wins.
+        patterns = patterns or {
+            # Possessive local part (++) -- it can never contain '@', so backtracking only burns CPU
+            "EMAIL": r"[A-Za-z0-9._%+-]++@[A-Za-z0-9.-]+\.[A-Za-z]{2,}",
+            "PRIVATE_KEY": INDIAN_PATTERNS["PRIVATE_KEY"],
+            "PAN_CARD": INDIAN_PATTERNS["PAN_CARD"],
+            # Phone before Aadhaar so "+91XXXXXXXXXX" is not swallowed as a 12-digit UID
+            "PHONE_NUMBER": INDIAN_PATTERNS["PHONE_NUMBER"],
+            "AADHAAR_ID": INDIAN_PATTERNS["AADHAAR_ID"],
         }
+        # Findings always carry the registry's canonical code (custom patterns may use aliases like "PAN")
+        self.patterns = {canonical_category(name) or name: pattern for name, pattern in patterns.items()}
+        self.compiled = self._compile(self.patterns)
+        # Keyword proximity decides each finding's confidence (see ai/context_engine.py)
+        self.context = context or context_engine
+        # Checksum / structure checks that weed out look-alikes (see ai/validators.py); {} disables them
+        if validators is None:
+            validators = VALIDATORS if VALIDATE_FINDINGS else {}
+        self.validators = validators
+
+    @staticmethod
+    def _compile(patterns):
+        """
+        Folds every category into ONE alternation of named groups, compiled once.
+        The text is then walked a single time and m.lastgroup tells us the category.
+        """
+        branches = "|".join(f"(?P<{category}>{pattern})" for category, pattern in patterns.items())
+        # Every category starts at the beginning of a token, so one shared lookbehind
+        # rejects mid-word offsets before any branch is tried. This is where the speed comes from.
+        # No re.IGNORECASE: the patterns spell out their own case classes, and the flag
+        # makes the regex engine fold every character it looks at.
+        return re.compile(f"(?<![A-Za-z0-9])(?:{branches})")
+
+    def _findings(self, text, matches, offset, copy=False):
+        """
+        Validates a block of matches, then builds findings scored against 'text' in one context pass.
+        Findings point into 'text' (no substring copies) unless 'copy' is set -- the stream scanner
+        sets it, since its buffer is thrown away chunk after chunk.
+        """
+        if self.validators:
+            matches = filter_matches(matches, self.validators)
+            if not matches:
+                return []
+        spans = [(m.lastgroup, m.start(), m.end()) for m in matches]
+        confidences = self.context.confidences(text, spans)
+        if copy:
+            return [
+                Finding(category, confidence, start + offset, end + offset, m[0], start + offset)
+                for (category, start, end), m, confidence in zip(spans, matches, confidences)
+            ]
+        return [
+            Finding(category, confidence, start + offset, end + offset, text, offset)
+            for (category, start, end), confidence in zip(spans, confidences)
+        ]
+
+    def finditer(self, text, offset=0):
+        """
+        Lazily yields findings in document order.
+        'offset' is added to the reported span (used when scanning a slice of a bigger document).
+        """
+        if not text:
+            return
+        block = []
+        for m in self.compiled.finditer(text):
+            block.append(m)
+            if len(block) >= CONTEXT_BLOCK:
+                yield from self._findings(text, block, offset)
+                block = []
+        if block:
+            yield from self._findings(text, block, offset)
 
     def scan_text(self, text):
         if not text:
             return []
-        
+        return list(self.finditer(text))
+
+    # ==========================================
+    # STREAMING API (dumps too big to hold in memory)
+    # ==========================================
+    def scan_stream(self, chunks, overlap=STREAM_OVERLAP):
+        """
+        Yields findings from an iterable of str or bytes chunks as soon as they are safe to report.
+        Spans are absolute offsets into the decoded stream.
+        """
+        scanner = _StreamScanner(self, overlap)
+        for chunk in chunks:
+            yield from scanner.feed(chunk)
+        yield from scanner.close()
+
+    def scan_chunks(self, chunks, state=None, final=False, overlap=STREAM_OVERLAP):
+        """
+        One leg of a stream scan, resumable in another process: feeds 'chunks' to a scanner picked up
+        from 'state' (None at the start of a stream) and returns (findings, state). The state is only
+        the overlap tail, its offsets and any undecoded bytes, so it is cheap to pickle.
+        'final' marks the last leg, which flushes the tail.
+        """
+        scanner = _StreamScanner(self, overlap, state)
         findings = []
-        for category, pattern in self.patterns.items():
-            # We apply re.IGNORECASE here instead of inside the pattern string
-            try:
-                matches = re.finditer(pattern, text, re.IGNORECASE)
-                for m in matches:
-                    findings.append({
-                        "data_category": category,
-                        "match": m.group(),
-                        "confidence": "HIGH"
-                    })
-            except Exception as e:
-                print(f"Regex error: {e}")
-        return findings
-
-detector = PIIDetector()
\ No newline at end of file
+        for chunk in chunks:
+            findings.extend(scanner.feed(chunk))
+        if final:
+            findings.extend(scanner.close())
+        return findings, scanner.state()
+
+    def scan_file(self, source, chunk_size=STREAM_CHUNK_SIZE, overlap=STREAM_OVERLAP):
+        """
+        Streams a file path or an open (binary or text) file object through the detector.
+        """
+        if isinstance(source, (str, bytes)) or hasattr(source, "__fspath__"):
+            with open(source, "rb") as file:
+                yield from self.scan_stream(iter(lambda: file.read(chunk_size), b""), overlap)
+            return
+        sentinel = "" if isinstance(source.read(0), str) else b""
+        yield from self.scan_stream(iter(lambda: source.read(chunk_size), sentinel), overlap)
+
+    async def ascan_stream(self, chunks, overlap=STREAM_OVERLAP):
+        """
+        Async twin of scan_stream, e.g. for an httpx body:
+            async for finding in detector.ascan_stream(response.aiter_bytes()): ...
+        """
+        scanner = _StreamScanner(self, overlap)
+        async for chunk in chunks:
+            for finding in scanner.feed(chunk):
+                yield finding
+        for finding in scanner.close():
+            yield finding
+
+class _StreamScanner:
+    """
+    Carries the state between chunks: the unscanned tail, its absolute offset, and where to resume.
+
+    Only matches that START at least 'overlap' characters before the end of the buffer are reported;
+    everything after that point is kept and re-scanned with the next chunk, so a match straddling a
+    boundary is found exactly once. The context window (plus one character for the leading
+    lookbehind and \\b anchors) is kept before the resume point so keyword scoring sees it too.
+    """
+
+    def __init__(self, detector, overlap, state=None):
+        self.compiled = detector.compiled
+        self.findings = detector._findings
+        self.context_chars = max(detector.context.window + detector.context.longest, 1)
+        self.overlap = max(overlap, self.context_chars + 1)
+        self.decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self.buffer = ""
+        self.base = 0  # Absolute offset of buffer[0]
+        self.pos = 0   # Resume point inside buffer (end of the last reported match)
+        if state is not None:
+            self.buffer, self.base, self.pos, decoder_state = state
+            self.decoder.setstate(decoder_state)
+
+    def state(self):
+        return self.buffer, self.base, self.pos, self.decoder.getstate()
+
+    def feed(self, chunk, final=False):
+        if isinstance(chunk, bytes):
+            chunk = self.decoder.decode(chunk, final)
+        self.buffer += chunk
+
+        cut = len(self.buffer) if final else len(self.buffer) - self.overlap
+        if cut <= self.pos:
+            return
+
+        matches = []
+        for m in self.compiled.finditer(self.buffer, self.pos):
+            if m.start() >= cut:
+                break
+            self.pos = m.end()
+            matches.append(m)
+        if matches:
+            yield from self.findings(self.buffer, matches, self.base, copy=True)
+
+        # Drop everything we are done with, keeping the look-behind / keyword context
+        self.pos = max(self.pos, cut)
+        keep = max(self.pos - self.context_chars, 0)
+        self.buffer = self.buffer[keep:]
+        self.base += keep
+        self.pos -= keep
+
+    def close(self):
+        return self.feed(b"", final=True)
+
+detector = PIIDetector()
@@ -2,9 +2,12 @@
 
 INDIAN_PATTERNS = {
     "AADHAAR_ID": r"\b[2-9]{1}[0-9]{3}\s[0-9]{4}\s[0-9]{4}\b|\b[2-9]{1}[0-9]{11}\b",
-    "PAN_CARD": r"\b[A-Z]{5}[0-9]{4}[A-Z]{1}\b",
-    "PHONE_NUMBER": r"\b(?:\+91|91)?[6-9][0-9]{9}\b",
-    "PRIVATE_KEY": r"-----BEGIN\sRSA\sPRIVATE\sKEY-----|(?i)secret_key|(?i)api_key|(?i)passwd",
+    # Both cases spelled out: PANs are often typed in lower case, and the detector runs without re.IGNORECASE
+    "PAN_CARD": r"\b[A-Za-z]{5}[0-9]{4}[A-Za-z]{1}\b",
+    # "+91" is kept in the match ('\b' cannot sit before '+'), and so is a "0" trunk prefix
+    "PHONE_NUMBER": r"(?:\+91|\b(?:91|0)?)[6-9][0-9]{9}\b",
+    # Scoped (?i:...) instead of bare (?i) -- global flags mid-pattern are a hard error on Python 3.11+
+    "PRIVATE_KEY": r"-----BEGIN\sRSA\sPRIVATE\sKEY-----|(?i:secret_key|api_key|passwd)",
 }
 
 # Contextual keywords to increase confidence
@@ -12,4 +15,4 @@ CONTEXT_KEYWORDS = {
     "AADHAAR_ID": ["uidai", "aadhaar", "dob", "identity"],
     "PAN_CARD": ["income tax", "permanent account", "nsdl", "taxpayer"],
     "PHONE_NUMBER": ["mobile", "call", "whatsapp", "contact"]
-}
\ No newline at end of file
+}
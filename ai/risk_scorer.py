@@ -1,12 +1,167 @@
+import itertools
+import json
+import os
+
+from ai.pii_categories import CATEGORY_ALIASES, PII_CONFIG
+
+try:
+    import numpy as np
+except ImportError:  # Scoring still works without NumPy, just one finding at a time
+    np = None
+
+# ==========================================
+# CONFIGURATION (override via .env)
+# ==========================================
+# Points one finding is worth, by the risk level of its category (PII_CONFIG "risk")
+LEVEL_POINTS = {"LOW": 10, "MEDIUM": 20, "HIGH": 30, "CRITICAL": 40}
+# Categories missing from PII_CONFIG (GENERAL_EXPOSURE, ...) score as this level
+DEFAULT_LEVEL = "MEDIUM"
+# How much we trust the detector's match
+CONFIDENCE_WEIGHTS = {"LOW": 0.5, "MEDIUM": 0.75, "HIGH": 1.0}
+# How bad the exposure the finding came from is (the exposure's risk_level)
+SEVERITY_WEIGHTS = {"LOW": 0.5, "MEDIUM": 0.75, "HIGH": 1.0, "CRITICAL": 1.25}
+MAX_SCORE = 100
+# Optional JSON file overriding any of the tables above:
+# {"levels": {...}, "categories": {"EMAIL": 15}, "confidence": {...}, "severity": {...}}
+RISK_WEIGHTS_PATH = os.getenv("RISK_WEIGHTS_PATH")
+
+def _load_overrides(path):
+    if not path:
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
 class RiskScorer:
-    def calculate(self, findings):
+    """
+    Weighted risk score: every finding is worth its category's points, scaled by the detector's
+    confidence and by the severity of the exposure it came from; a target's score is the sum,
+    capped at MAX_SCORE.
+
+    Findings are encoded into small integer codes once, so scoring a whole batch of targets is
+    a handful of NumPy array operations (a weight lookup per axis and one bincount).
+    """
+
+    def __init__(self, category_points=None, confidence_weights=None, severity_weights=None,
+                 max_score=MAX_SCORE, overrides=None):
+        overrides = _load_overrides(RISK_WEIGHTS_PATH) if overrides is None else overrides
+        levels = {**LEVEL_POINTS, **overrides.get("levels", {})}
+        self.default_points = levels[DEFAULT_LEVEL]
+        self.category_points = dict(category_points or {
+            category: levels[config["risk"]] for category, config in PII_CONFIG.items()
+        })
+        self.category_points.update(overrides.get("categories", {}))
+        self.confidence_weights = confidence_weights or {**CONFIDENCE_WEIGHTS, **overrides.get("confidence", {})}
+        self.severity_weights = severity_weights or {**SEVERITY_WEIGHTS, **overrides.get("severity", {})}
+        self.max_score = max_score
+
+        # Code tables: index 0 is the fallback for unknown / missing values
+        self.category_codes = {category: i + 1 for i, category in enumerate(self.category_points)}
+        # Aliases ("AADHAAR", "PHONE", ...) share their canonical category's code
+        for alias, code in CATEGORY_ALIASES.items():
+            if code in self.category_codes:
+                self.category_codes.setdefault(alias, self.category_codes[code])
+        self.confidence_codes = {level: i + 1 for i, level in enumerate(self.confidence_weights)}
+        self.severity_codes = {level: i + 1 for i, level in enumerate(self.severity_weights)}
+        self.category_table = [self.default_points, *self.category_points.values()]
+        self.confidence_table = [1.0, *self.confidence_weights.values()]
+        self.severity_table = [1.0, *self.severity_weights.values()]
+        if np is not None:
+            self.arrays = tuple(
+                np.asarray(table, dtype=np.float64)
+                for table in (self.category_table, self.confidence_table, self.severity_table)
+            )
+
+    # ==========================================
+    # ENCODING (findings -> integer codes)
+    # ==========================================
+    def encode(self, findings, severity=None):
+        """
+        Returns (category, confidence, severity) code lists for a list of findings.
+        'severity' is the exposure risk level shared by all of them, or a list aligned with them;
+        a finding's own severity wins over either. Dict findings (stored reports) are accepted too.
+        """
+        category_code, confidence_code, severity_code = (
+            self.category_codes.get, self.confidence_codes.get, self.severity_codes.get
+        )
+        if severity is None or isinstance(severity, str):
+            severity = itertools.repeat(severity)
+        if findings and findings[0].__class__ is not dict:
+            try:
+                categories = [category_code(f.data_category, 0) for f in findings]
+                confidences = [confidence_code(f.confidence, 0) for f in findings]
+                severities = [severity_code(f.severity or level, 0) for f, level in zip(findings, severity)]
+                return categories, confidences, severities
+            except AttributeError:
+                pass  # A dict further down the list
+        # Stored reports hold dicts; Finding.get() lets a list that mixes both go this way too
+        categories = [category_code(f.get("data_category"), 0) for f in findings]
+        confidences = [confidence_code(f.get("confidence"), 0) for f in findings]
+        severities = [severity_code(f.get("severity", level), 0) for f, level in zip(findings, severity)]
+        return categories, confidences, severities
+
+    # ==========================================
+    # SCORING
+    # ==========================================
+    def score_arrays(self, categories, confidences, severities, owners, n_targets):
+        """
+        The vectorized core. Each argument is an array of codes, one entry per finding;
+        'owners' says which of the 'n_targets' targets each finding belongs to.
+        Returns one integer score per target.
+        """
+        if np is None:
+            totals = [0.0] * n_targets
+            for cat, conf, sev, owner in zip(categories, confidences, severities, owners):
+                totals[owner] += self.category_table[cat] * self.confidence_table[conf] * self.severity_table[sev]
+            return [min(int(round(total)), self.max_score) for total in totals]
+
+        category_table, confidence_table, severity_table = self.arrays
+        points = (
+            category_table[np.asarray(categories, dtype=np.intp)]
+            * confidence_table[np.asarray(confidences, dtype=np.intp)]
+            * severity_table[np.asarray(severities, dtype=np.intp)]
+        )
+        totals = np.bincount(np.asarray(owners, dtype=np.intp), weights=points, minlength=n_targets)
+        return np.minimum(np.rint(totals), self.max_score).astype(np.int64).tolist()
+
+    def calculate(self, findings, severity=None):
         if not findings:
             return 0
-        
-        # Calculate: 20 points per leak, capped at 100
-        # If you have 2 findings, this will show 40%
-        base_score = len(findings) * 20
-        
-        return min(base_score, 100)
-
-scorer = RiskScorer()
\ No newline at end of file
+        categories, confidences, severities = self.encode(findings, severity)
+        # A single target: plain Python beats building arrays for a few dozen findings
+        total = sum(
+            self.category_table[cat] * self.confidence_table[conf] * self.severity_table[sev]
+            for cat, conf, sev in zip(categories, confidences, severities)
+        )
+        return min(int(round(total)), self.max_score)
+
+    def calculate_batch(self, targets):
+        """
+        Scores many targets in one pass. 'targets' is a list where each item is either a list of
+        findings or a (findings, severity) pair as accepted by encode(). Returns a list of scores.
+        """
+        categories, confidences, severities, owners = [], [], [], []
+        for owner, target in enumerate(targets):
+            findings, severity = target if isinstance(target, tuple) else (target, None)
+            cats, confs, sevs = self.encode(findings, severity)
+            categories.extend(cats)
+            confidences.extend(confs)
+            severities.extend(sevs)
+            owners.extend([owner] * len(cats))
+        return self.score_arrays(categories, confidences, severities, owners, len(targets))
+
+    def rescore_reports(self, reports):
+        """
+        Recomputes risk_score for stored reports (e.g. after the weights changed), from their
+        per-source findings and each exposure's risk_level. Returns a list of scores.
+        """
+        targets = []
+        for report in reports:
+            levels = {exp.get("source"): exp.get("risk_level") for exp in report.get("exposures", [])}
+            findings, severities = [], []
+            for source, source_findings in (report.get("source_findings") or {}).items():
+                findings.extend(source_findings)
+                severities.extend([levels.get(source)] * len(source_findings))
+            targets.append((findings, severities))
+        return self.calculate_batch(targets)
+
+scorer = RiskScorer()
@@ -0,0 +1,120 @@
+# ai/validators.py
+"""
+Structural checks that run after the regex pass. The patterns alone accept any 12-digit or
+10-digit group, so order numbers and timestamps in big dumps come back as Aadhaar and phone
+findings. Every validator takes a batch of matched strings of one category and returns one
+bool per value, so the detector calls each of them once per block of matches.
+"""
+import os
+from types import MappingProxyType
+
+# ==========================================
+# CONFIGURATION (override via .env)
+# ==========================================
+VALIDATE_FINDINGS = os.getenv("VALIDATE_FINDINGS", "true").lower() not in ("0", "false", "no")
+# 4th character of a PAN is the holder type: Person, Company, HUF, Firm, AOP, Trust,
+# Body of individuals, Local authority, artificial Juridical person, Government
+PAN_HOLDER_TYPES = frozenset(os.getenv("PAN_HOLDER_TYPES", "PCHFATBLJG"))
+# First digit of a 10-digit Indian mobile number
+MOBILE_PREFIXES = frozenset(os.getenv("MOBILE_PREFIXES", "6789"))
+# Fewer distinct digits than this is a placeholder (9999999999, 9000000000), not a subscriber
+MOBILE_MIN_DISTINCT_DIGITS = int(os.getenv("MOBILE_MIN_DISTINCT_DIGITS", 4))
+
+# ==========================================
+# VERHOEFF (Aadhaar check digit)
+# ==========================================
+# Multiplication table of the dihedral group D5
+_D = (
+    (0, 1, 2, 3, 4, 5, 6, 7, 8, 9),
+    (1, 2, 3, 4, 0, 6, 7, 8, 9, 5),
+    (2, 3, 4, 0, 1, 7, 8, 9, 5, 6),
+    (3, 4, 0, 1, 2, 8, 9, 5, 6, 7),
+    (4, 0, 1, 2, 3, 9, 5, 6, 7, 8),
+    (5, 9, 8, 7, 6, 0, 4, 3, 2, 1),
+    (6, 5, 9, 8, 7, 1, 0, 4, 3, 2),
+    (7, 6, 5, 9, 8, 2, 1, 0, 4, 3),
+    (8, 7, 6, 5, 9, 3, 2, 1, 0, 4),
+    (9, 8, 7, 6, 5, 4, 3, 2, 1, 0),
+)
+# Position permutations (repeat every 8 digits)
+_P = (
+    (0, 1, 2, 3, 4, 5, 6, 7, 8, 9),
+    (1, 5, 7, 6, 2, 8, 3, 0, 9, 4),
+    (5, 8, 0, 3, 7, 9, 6, 1, 4, 2),
+    (8, 9, 1, 6, 0, 4, 3, 5, 7, 2),
+    (9, 4, 5, 3, 1, 2, 8, 7, 0, 6),
+    (4, 2, 8, 6, 5, 7, 3, 9, 0, 1),
+    (2, 7, 9, 3, 8, 0, 6, 4, 1, 5),
+    (7, 0, 4, 2, 6, 5, 3, 1, 9, 8),
+)
+# Both tables folded into one: _STEP[position % 8][check][digit char] -> next check.
+# Keyed by the character itself, so the loop never converts digits to ints.
+_STEP = tuple(
+    tuple({str(digit): _D[check][_P[position][digit]] for digit in range(10)} for check in range(10))
+    for position in range(8)
+)
+# Aadhaar is always 12 digits, so the table for each position can be picked once, up front
+_AADHAAR_STEPS = tuple(_STEP[position & 7] for position in range(12))
+
+def verhoeff_valid(digits):
+    """True if the last digit of 'digits' (a string of 0-9) is its Verhoeff check digit."""
+    check = 0
+    for position, ch in enumerate(reversed(digits)):
+        check = _STEP[position & 7][check][ch]
+    return check == 0
+
+# ==========================================
+# BATCH VALIDATORS
+# ==========================================
+def validate_aadhaar(values):
+    steps = _AADHAAR_STEPS
+    results = []
+    for value in values:
+        # "2345 6789 0127" and "234567890127" are both accepted by the pattern
+        digits = value if len(value) == 12 else "".join(value.split())
+        check = 0
+        for table, ch in zip(steps, reversed(digits)):
+            check = table[check][ch]
+        results.append(check == 0 and len(digits) == 12)
+    return results
+
+def validate_pan(values):
+    holder_types = PAN_HOLDER_TYPES
+    return [len(value) == 10 and value[3].upper() in holder_types for value in values]
+
+def validate_mobile(values):
+    prefixes, min_distinct = MOBILE_PREFIXES, MOBILE_MIN_DISTINCT_DIGITS
+    results = []
+    for value in values:
+        number = value.lstrip("+")
+        if len(number) == 12 and number.startswith("91"):
+            number = number[2:]
+        elif len(number) == 11 and number.startswith("0"):
+            number = number[1:]
+        results.append(len(number) == 10 and number[0] in prefixes and len(set(number)) >= min_distinct)
+    return results
+
+# Canonical category code -> batch validator. Categories without one are kept as matched.
+VALIDATORS = MappingProxyType({
+    "AADHAAR_ID": validate_aadhaar,
+    "PAN_CARD": validate_pan,
+    "PHONE_NUMBER": validate_mobile,
+})
+
+def filter_matches(matches, validators=VALIDATORS):
+    """
+    Drops the regex matches that fail their category's validator, keeping document order.
+    Matches are grouped by category first so each validator runs once over its whole batch.
+    """
+    batches = {}
+    for index, m in enumerate(matches):
+        if m.lastgroup in validators:
+            batches.setdefault(m.lastgroup, []).append(index)
+    if not batches:
+        return matches
+
+    keep = [True] * len(matches)
+    for category, indices in batches.items():
+        for index, valid in zip(indices, validators[category]([matches[i][0] for i in indices])):
+            keep[index] = valid
+    return [m for m, valid in zip(matches, keep) if valid]
@@ -1,7 +1,14 @@
+import time
+# Startup is measured from here: everything below is this worker's import cost
+_import_started = time.perf_counter()
+
+import logging
 import os
 import sys
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from dotenv import load_dotenv
 
 # --- MANDATORY PATH INJECTION ---
@@ -15,14 +22,52 @@ if root_path not in sys.path:
 # Load .env from root
 load_dotenv(os.path.join(root_path, ".env"))
 
+# Logging is configured once, here -- library modules only ever call getLogger(__name__)
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+)
+# httpx logs every upstream request at INFO; those are counted in /metrics instead
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
 # Now we import using the absolute path from root
-from backend.app.routers import scan
+from backend.app.routers import scan, report
+from backend.app.services.enrichment import enricher
+from backend.app.services.report_store import report_store
+from backend.app.services.jobs import job_queue
+from backend.app.services.metrics import metrics, profiler, RequestTimingMiddleware
+from backend.app.services.warmup import warm_up, record_startup
+from backend.app.scrapers.http_client import start_clients, close_clients
 # --------------------------------
+IMPORT_SECONDS = time.perf_counter() - _import_started
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    started = time.perf_counter()
+    # One pooled keep-alive client per upstream for the whole app lifetime
+    await start_clients()
+    # Background writer that persists finished scan reports
+    await report_store.start()
+    # Worker pool for queued (background) scans
+    await job_queue.start()
+    # Opt-in (PROFILE_SLOW_MS): samples the event loop thread so slow requests can be explained
+    profiler.start()
+    services = time.perf_counter() - started
+    # First-use costs (enrichment processes, letter template, breach index...) paid before serving
+    record_startup({"imports": IMPORT_SECONDS, "services": services, **warm_up()})
+    yield
+    profiler.stop()
+    await job_queue.close()
+    await report_store.close()
+    await close_clients()
+    # Release the enrichment worker processes on shutdown
+    enricher.shutdown()
 
 app = FastAPI(
     title="ShadowTrace OSINT Engine",
     description="AI-Powered Digital Footprint & DPDP Compliance Platform",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS CONFIGURATION
@@ -33,9 +78,12 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Per-route latency histograms (and the slow-request profiler hook) for /metrics
+app.add_middleware(RequestTimingMiddleware)
 
 # INCLUDE ROUTERS
 app.include_router(scan.router, prefix="/api/v1")
+app.include_router(report.router, prefix="/api/v1")
 
 @app.get("/")
 async def root():
@@ -45,6 +93,16 @@ async def root():
         "root_path": root_path
     }
 
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics(format: str = Query("prometheus", pattern="^(prometheus|json)$")):
+    """
+    Stage / source / route latency histograms and upstream status and byte counters,
+    in the Prometheus text format (or ?format=json for p50/p95/p99 per series).
+    """
+    if format == "json":
+        return {"histograms": metrics.summary(), "profiled_slow_requests": profiler.reports}
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("backend.app.main:app", host="127.0.0.1", port=8000, reload=True)
\ No newline at end of file
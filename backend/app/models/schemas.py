@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 # ==========================================
 # 1. THE REQUEST MODEL (Flexible Input)
@@ -10,6 +10,7 @@ class ScanRequest(BaseModel):
     
     # Optional field remains for cases where both are known
     target_username: Optional[str] = Field(None, description="Optional: Known username used by the target.")
+    incremental: bool = Field(False, description="Optional: compare with the last stored report and only re-analyse what changed.")
 
     class Config:
         json_schema_extra = {
@@ -32,8 +33,76 @@ class ExposedData(BaseModel):
 # ==========================================
 # 3. THE FINAL RESPONSE MODEL
 # ==========================================
+class ScanDelta(BaseModel):
+    baseline_report_id: Optional[int] = Field(None, description="The stored report this scan was compared with (None on a first scan).")
+    baseline_scanned_at: Optional[float] = Field(None, description="When the baseline scan ran (Unix time).")
+    new: List[dict] = Field(default_factory=list, description="Exposures on sources that had none before.")
+    changed: List[dict] = Field(default_factory=list, description="Exposures whose fingerprint changed, with added/removed items.")
+    resolved: List[dict] = Field(default_factory=list, description="Exposures that are gone since the baseline.")
+    unchanged: List[str] = Field(default_factory=list, description="Sources whose exposure is identical to the baseline.")
+
 class ScanResponse(BaseModel):
     target: str = Field(..., description="The original identifier that was scanned.")
     total_leaks: int = Field(..., description="Total number of platforms where data was found.")
     risk_score: int = Field(..., description="Calculated risk score from 0 to 100.")
-    exposures: List[ExposedData] = Field(..., description="Detailed list of all findings.")
\ No newline at end of file
+    exposures: List[ExposedData] = Field(..., description="Detailed list of all findings.")
+    timed_out_sources: List[str] = Field(default_factory=list, description="Sources cancelled at the scan deadline.")
+    failed_sources: List[str] = Field(default_factory=list, description="Sources that errored out.")
+    partial: bool = Field(False, description="True when some sources are missing from this report.")
+    delta: Optional[ScanDelta] = Field(None, description="Incremental scans only: what changed since the last report.")
+
+class StoredReport(ScanResponse):
+    report_id: Optional[int] = Field(None, description="Row ID of the stored report.")
+    scanned_at: Optional[float] = Field(None, description="When the scan ran (Unix time).")
+
+class ScanJobRequest(ScanRequest):
+    priority: str = Field("normal", pattern="^(high|normal|low)$", description="Optional: queue priority (high, normal or low).")
+
+class PivotScanRequest(BaseModel):
+    target_email: str = Field(..., description="The seed identifier (Email, Username, or UID) the investigation starts from.")
+    max_depth: Optional[int] = Field(None, ge=0, description="Optional: lower the number of hops followed from the seed.")
+    max_nodes: Optional[int] = Field(None, ge=1, description="Optional: lower the number of identifiers scanned in total.")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "target_email": "alice@example.com",
+                "max_depth": 1
+            }
+        }
+
+# ==========================================
+# 4. THE BATCH REQUEST MODEL
+# ==========================================
+class BatchScanRequest(BaseModel):
+    targets: List[str] = Field(..., min_length=1, description="Identifiers (Email, Username, or UID) to investigate.")
+    concurrency: Optional[int] = Field(None, ge=1, description="Optional: lower the number of targets scanned at once.")
+    incremental: bool = Field(False, description="Optional: report each target's delta against its last stored report.")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "targets": ["alice@example.com", "bob_dev"],
+                "concurrency": 10
+            }
+        }
+
+class BatchJobRequest(BaseModel):
+    targets: List[str] = Field(..., min_length=1, description="Identifiers (Email, Username, or UID) to investigate.")
+    incremental: bool = Field(False, description="Optional: report each target's delta against its last stored report.")
+    priority: str = Field("low", pattern="^(high|normal|low)$", description="Optional: queue priority (high, normal or low).")
+
+# ==========================================
+# 5. THE REMOVAL LETTERS REQUEST MODEL
+# ==========================================
+class RemovalLettersRequest(BaseModel):
+    targets: List[str] = Field(..., min_length=1, description="Identifiers whose latest stored reports the letters are written from.")
+    names: Dict[str, str] = Field(default_factory=dict, description="Optional: the name each target's letters are signed with (defaults to the identifier).")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "targets": ["alice@example.com", "bob_dev"],
+                "names": {"alice@example.com": "Alice Sharma"}
+            }
+        }
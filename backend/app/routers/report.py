@@ -1,23 +1,37 @@
-from fastapi import APIRouter, HTTPException
+import asyncio
+import json
+import os
+import re
+import zipfile
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from backend.app.models.schemas import RemovalLettersRequest, StoredReport
+from backend.app.services.report_store import report_store
+from compliance.removal_request import generator
 
 router = APIRouter(
     prefix="/report",
     tags=["Compliance & Reporting"]
 )
 
-# In-memory database for the hackathon (resets when server restarts)
-# In a real app, this would be MySQL or MongoDB.
-mock_db = {}
+# Mass takedown runs: how many targets one request may cover, and how many reports are read at once
+LETTERS_MAX_TARGETS = int(os.getenv("LETTERS_MAX_TARGETS", 50000))
+LETTERS_FETCH_CONCURRENCY = int(os.getenv("LETTERS_FETCH_CONCURRENCY", 32))
+# Letters are ~1 KiB compressed; ZIP output is sent in chunks of at least this many bytes
+LETTERS_ZIP_CHUNK = int(os.getenv("LETTERS_ZIP_CHUNK", 64 * 1024))
 
 @router.get("/{target_email}")
 async def get_scan_report(target_email: str):
     """
-    Fetches a previously completed scan report.
+    Fetches the most recent completed scan report (an indexed read, no rescan).
     """
-    # If we have it in our mock DB, return it
-    if target_email in mock_db:
-        return mock_db[target_email]
-        
+    report = await report_store.latest(target_email)
+    if report is not None:
+        # Same shape as the scan response: raw findings and fingerprints stay in the store
+        return StoredReport.model_validate(report).model_dump()
+
     # Otherwise, return a default response for the demo
     return {
         "target": target_email,
@@ -25,10 +39,107 @@ async def get_scan_report(target_email: str):
         "dpdp_compliant": False
     }
 
+@router.get("/{target_email}/history")
+async def get_scan_history(
+    target_email: str,
+    limit: int = Query(20, ge=1, le=200),
+    before: Optional[float] = Query(None, description="'next_before' from the previous page")
+):
+    """
+    Past scans of an identifier, newest first. Pass 'next_before' back as 'before' for the next page.
+    """
+    items = await report_store.history(target_email, limit, before)
+    return {
+        "target": target_email,
+        "items": items,
+        "next_before": items[-1]["scanned_at"] if len(items) == limit else None
+    }
+
+# ==========================================
+# DPDP TAKEDOWN LETTERS (streamed, never held in memory)
+# ==========================================
+class _ZipSink:
+    """Write-only file for zipfile: hands back whatever was written since the last drain()."""
+
+    def __init__(self):
+        self.chunks = []
+        self.size = 0
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data, self.chunks, self.size = b"".join(self.chunks), [], 0
+        return data
+
+def _entry_name(name: str) -> str:
+    return re.sub(r"[^\w.@+-]+", "_", name).strip("_") or "unknown"
+
+def _zip_letters(letters):
+    """One <company>/<target>.txt entry per letter, sent on as soon as a chunk's worth is written."""
+    sink = _ZipSink()
+    # zipfile sees an unseekable file and writes data descriptors instead of seeking back
+    with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as archive:
+        for company, target, letter in letters:
+            archive.writestr(f"{_entry_name(company)}/{_entry_name(target)}.txt", letter)
+            if sink.size >= LETTERS_ZIP_CHUNK:
+                yield sink.drain()
+    yield sink.drain()
+
+def _ndjson_letters(letters):
+    for company, target, letter in letters:
+        yield json.dumps({"company": company, "target": target, "letter": letter}) + "\n"
+
+def _letters_response(grouped: dict, fmt: str, filename: str, names: dict = None, missing: list = ()):
+    try:
+        letters = generator.iter_letters(grouped, names)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    headers = {"X-Letter-Count": str(sum(len(targets) for targets in grouped.values()))}
+    if missing:
+        headers["X-Missing-Targets"] = str(len(missing))
+    if fmt == "ndjson":
+        return StreamingResponse(_ndjson_letters(letters), media_type="application/x-ndjson", headers=headers)
+    headers["Content-Disposition"] = f'attachment; filename="{filename}.zip"'
+    return StreamingResponse(_zip_letters(letters), media_type="application/zip", headers=headers)
+
 @router.get("/{target_email}/download")
-async def download_dpdp_notice(target_email: str):
+async def download_dpdp_notice(target_email: str, format: str = Query("zip", pattern="^(zip|ndjson)$")):
     """
-    Generates a DPDP Act Takedown Notice PDF.
+    DPDP Act takedown notices for the latest scan: one removal letter per company holding the
+    target's data, as a ZIP (default) or NDJSON stream.
     """
-    # Member 4 will connect the PDF generation script here later!
-    return {"message": f"PDF generation initiated for {target_email}. Ready for download."}
\ No newline at end of file
+    report = await report_store.latest(target_email)
+    if report is None:
+        raise HTTPException(status_code=404, detail="No previous scans found. Please initiate a new scan.")
+    grouped = generator.group_by_company([report])
+    return _letters_response(grouped, format, f"dpdp_notices_{_entry_name(target_email)}")
+
+@router.post("/letters")
+async def bulk_removal_letters(request: RemovalLettersRequest, format: str = Query("zip", pattern="^(zip|ndjson)$")):
+    """
+    Mass takedown run: letters for many targets at once, grouped by the company they go to.
+    Reports are folded in as they are read, so only the letter lines stay in memory, and the
+    letters themselves are rendered while the response streams.
+    Targets without a stored report are skipped and counted in X-Missing-Targets.
+    """
+    targets = list(dict.fromkeys(t.strip().lower() for t in request.targets if t.strip()))
+    if not targets:
+        raise HTTPException(status_code=400, detail="No identifiers supplied.")
+    if len(targets) > LETTERS_MAX_TARGETS:
+        raise HTTPException(status_code=413, detail=f"A letters run is limited to {LETTERS_MAX_TARGETS} identifiers.")
+
+    grouped, missing = {}, []
+    for i in range(0, len(targets), LETTERS_FETCH_CONCURRENCY):
+        chunk = targets[i:i + LETTERS_FETCH_CONCURRENCY]
+        reports = await asyncio.gather(*(report_store.latest(target) for target in chunk))
+        missing.extend(target for target, report in zip(chunk, reports) if report is None)
+        generator.group_by_company([report for report in reports if report is not None], grouped)
+
+    names = {name.lower(): value for name, value in request.names.items()}
+    return _letters_response(grouped, format, "dpdp_notices", names, missing)
@@ -1,7 +1,13 @@
 import sys
 import os
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, UploadFile, File, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import Optional
 import asyncio
+import csv
+import hashlib
+import io
+import json
 import logging
 
 # --- DYNAMIC PATH INJECTION ---
@@ -14,9 +20,8 @@ if root_path not in sys.path:
 # --- SAFE IMPORTS ---
 try:
     from Demo.seed_demo import seeder 
-    from ai.pii_detector import detector
     from ai.risk_scorer import scorer
-    from compliance.dpdp_checker import checker
+    from ai.findings import Finding, as_findings
 except ImportError as e:
     print(f"CRITICAL IMPORT ERROR: {e}")
     seeder = None 
@@ -25,83 +30,567 @@ from backend.app.scrapers.github_scraper import scan_github
 from backend.app.scrapers.hibp import scan_hibp
 from backend.app.scrapers.reddit_scraper import scan_reddit
 from backend.app.scrapers.pastebin_scraper import scan_pastebin
-from backend.app.models.schemas import ScanRequest, ScanResponse
+from backend.app.scrapers.local_breaches import scan_local_breaches, local_breaches_enabled
+from backend.app.scrapers.raw_content import raw_scanner
+from backend.app.scrapers.cache import result_cache
+from backend.app.scrapers.rate_limit import governor
+from backend.app.models.schemas import ExposedData, ScanRequest, ScanResponse, BatchScanRequest, ScanJobRequest, BatchJobRequest, PivotScanRequest
+from backend.app.services.enrichment import enricher
+from backend.app.services.orchestrator import orchestrator, SCAN_DEADLINE
+from backend.app.services.report_store import report_store
+from backend.app.services.jobs import job_queue, QueueFull
+from backend.app.services.pivots import pivot_engine, extract_pivots
+from backend.app.services.metrics import metrics, STAGE_SECONDS
 
 router = APIRouter(prefix="/scan", tags=["Scanning Engine"])
 logger = logging.getLogger(__name__)
 
-@router.post("/", response_model=ScanResponse)
-async def start_new_scan(request: ScanRequest):
-    # The input is now flexible (Email, Username, or UID)
-    identifier = request.target_email.lower()
-    
-    # 1. DEMO TRIGGER
-    if identifier == "demo@tracepoint.com" or identifier == "demo_user":
-        if seeder:
-            return seeder.load_demo_data()
-        raise HTTPException(status_code=500, detail="Demo module not loaded")
+# Batch audits: how many targets scan at once, and how many calls each source may have in flight
+BATCH_MAX_TARGETS = int(os.getenv("BATCH_MAX_TARGETS", 10000))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", 20))
+# Batch targets may queue for per-source slots, so they get a longer overall deadline
+BATCH_SCAN_DEADLINE = float(os.getenv("BATCH_SCAN_DEADLINE", 60.0))
+BATCH_SOURCE_CONCURRENCY = {
+    "github": int(os.getenv("BATCH_GITHUB_CONCURRENCY", 4)),
+    "hibp": int(os.getenv("BATCH_HIBP_CONCURRENCY", 2)),
+    "reddit": int(os.getenv("BATCH_REDDIT_CONCURRENCY", 8)),
+    "pastebin": int(os.getenv("BATCH_PASTEBIN_CONCURRENCY", 8)),
+}
 
-    # 2. INTELLIGENT ROUTING
+def plan_sources(identifier: str) -> list:
+    """
+    INTELLIGENT ROUTING: decides which scrapers run for an identifier.
+    Returns (source, scraper, argument) triples.
+    """
     is_email = "@" in identifier
     username_part = identifier.split('@')[0] if is_email else identifier
 
-    tasks = []
-    
     # Always scan GitHub and Pastebin (they support both)
-    tasks.append(scan_github(identifier))
-    tasks.append(scan_pastebin(identifier))
-    
-    # Only scan Reddit for usernames
-    tasks.append(scan_reddit(username_part))
-
+    sources = [
+        ("github", scan_github, identifier),
+        ("pastebin", scan_pastebin, identifier),
+        # Only scan Reddit for usernames
+        ("reddit", scan_reddit, username_part),
+    ]
     # Only scan HIBP if it's a valid email format
     if is_email:
-        tasks.append(scan_hibp(identifier))
-    else:
-        # If not an email, we just add a placeholder task
-        tasks.append(asyncio.sleep(0))
-
-    # 3. GATHER RESULTS
-    raw_results = await asyncio.gather(*tasks)
-    # Filter out None results or the sleep placeholder
-    exposures = [res for res in raw_results if res is not None and isinstance(res, dict)]
-
-    # 4. AI & COMPLIANCE ENRICHMENT
-    all_findings = []
-    for exp in exposures:
-        # Initialize pii_found if missing
-        if "pii_found" not in exp:
-            exp["pii_found"] = []
-
-        description = exp.get("description", "")
-        ai_findings = detector.scan_text(description)
-        
-        # EVERY exposure counts as at least a basic finding for the risk scorer
-        if not ai_findings:
-            # Create a generic finding so the risk scorer can count the exposure quantity
-            all_findings.append({"data_category": "GENERAL_EXPOSURE", "confidence": "LOW"})
-            if "compliance_notes" not in exp:
-                exp["compliance_notes"] = ["DPDP Audit: Potential Exposure"]
+        sources.append(("hibp", scan_hibp, identifier))
+    # Licensed breach dumps indexed on disk (emails and usernames alike), when configured
+    if local_breaches_enabled():
+        sources.append(("local_breaches", scan_local_breaches, identifier))
+    return sources
+
+async def enrich_exposure(exp: dict) -> list:
+    """
+    AI & COMPLIANCE ENRICHMENT for one exposure (mutates it in place).
+    Returns the findings it contributes to the risk score.
+    """
+    # Initialize pii_found if missing
+    if "pii_found" not in exp:
+        exp["pii_found"] = []
+
+    # Leaked bodies (paste dumps, matched source files), byte-capped and scanned once per distinct content
+    raw_findings = await raw_scanner.scan_all(exp.pop("raw_urls", []), exp.pop("raw_digests", None))
+    # Regex + DPDP mapping runs through the executor so big inputs never block the event loop
+    ai_findings, violations = await enricher.enrich(exp.get("description", ""), raw_findings)
+
+    # EVERY exposure counts as at least a basic finding for the risk scorer
+    if not ai_findings:
+        if "compliance_notes" not in exp:
+            exp["compliance_notes"] = ["DPDP Audit: Potential Exposure"]
+        # Create a generic finding so the risk scorer can count the exposure quantity
+        return [Finding("GENERAL_EXPOSURE", "LOW")]
+
+    exp["risk_level"] = "CRITICAL"
+    # Format: "Category: Match" -- de-duplicated through an ordered set, not a list scan per finding
+    labels = dict.fromkeys(exp["pii_found"])
+    labels.update(dict.fromkeys(finding.label for finding in ai_findings))
+    exp["pii_found"] = list(labels)
+
+    # Map findings to DPDP violations
+    exp["compliance_notes"] = [v["section"] for v in violations]
+    return ai_findings
+
+# ==========================================
+# INCREMENTAL RE-SCANS (delta against the last report)
+# ==========================================
+def exposure_fingerprint(exp: dict) -> dict:
+    """
+    What an incremental re-scan compares between runs. Scrapers supply their own
+    (commit counts, breach names, paste IDs); anything else falls back to a content digest.
+    """
+    if exp.get("fingerprint"):
+        return exp["fingerprint"]
+    content = json.dumps([exp.get("description", ""), sorted(exp.get("raw_urls", []))])
+    return {"digest": hashlib.sha1(content.encode()).hexdigest()}
+
+async def load_baseline(identifier: str) -> Optional[dict]:
+    """The previous report of an identifier, indexed by source, or None on a first scan."""
+    report = await report_store.latest(identifier)
+    if not report:
+        return None
+    return {
+        "report_id": report.get("report_id"),
+        "scanned_at": report.get("scanned_at"),
+        "exposures": {exp["source"]: exp for exp in report.get("exposures", []) if exp.get("source")},
+        "findings": {source: as_findings(findings) for source, findings in report.get("source_findings", {}).items()}
+    }
+
+async def enrich_or_reuse(source: str, exp: dict, baseline: Optional[dict] = None) -> list:
+    """
+    Tags the exposure with its source and fingerprint, then enriches it -- unless the baseline
+    holds the same fingerprint for this source, in which case last run's enrichment is reused
+    and the detector / DPDP checker are skipped entirely.
+    """
+    exp["source"] = source
+    exp["fingerprint"] = exposure_fingerprint(exp)
+
+    previous = baseline["exposures"].get(source) if baseline else None
+    if previous and previous.get("fingerprint") == exp["fingerprint"] and source in baseline["findings"]:
+        exp.pop("raw_urls", None)
+        exp.pop("raw_digests", None)
+        for field in ("pii_found", "compliance_notes", "risk_level"):
+            if field in previous:
+                exp[field] = previous[field]
+        return baseline["findings"][source]
+    return await enrich_exposure(exp)
+
+def _fingerprint_diff(before: dict, after: dict) -> dict:
+    """Item-level changes: list fields report added/removed items, scalars before/after."""
+    added, removed, updated = {}, {}, {}
+    for field in sorted(before.keys() | after.keys()):
+        old, new = before.get(field), after.get(field)
+        if old == new:
+            continue
+        if isinstance(old, list) or isinstance(new, list):
+            old, new = set(old or []), set(new or [])
+            if new - old:
+                added[field] = sorted(new - old)
+            if old - new:
+                removed[field] = sorted(old - new)
         else:
-            exp["risk_level"] = "CRITICAL"
-            for finding in ai_findings:
-                # Format: "Category: Match"
-                label = f"{finding['data_category']}: {finding['match']}"
-                if label not in exp["pii_found"]:
-                    exp["pii_found"].append(label)
-                all_findings.append(finding)
-            
-            # Map findings to DPDP violations
-            violations = checker.analyze_findings(ai_findings)
-            exp["compliance_notes"] = [v["section"] for v in violations]
+            updated[field] = {"before": old, "after": new}
+    return {"added": added, "removed": removed, "updated": updated}
 
-    # 5. FINAL CALCULATION
-    # This now receives a list containing an item for every single exposure found
-    final_score = scorer.calculate(all_findings) if all_findings else 0
+def build_delta(baseline: Optional[dict], exposures: list, timed_out: list = (), failed: list = ()) -> dict:
+    """
+    New / changed / resolved / unchanged exposures compared with the baseline.
+    A source that timed out or failed this run is never reported as resolved.
+    """
+    previous = baseline["exposures"] if baseline else {}
+    delta = {
+        "baseline_report_id": baseline["report_id"] if baseline else None,
+        "baseline_scanned_at": baseline["scanned_at"] if baseline else None,
+        "new": [],
+        "changed": [],
+        "resolved": [],
+        "unchanged": []
+    }
+    current = {exp["source"]: exp for exp in exposures}
+    for source, exp in current.items():
+        old = previous.get(source)
+        if old is None:
+            delta["new"].append({"source": source, "platform": exp.get("platform")})
+        elif old.get("fingerprint") == exp["fingerprint"]:
+            delta["unchanged"].append(source)
+        else:
+            delta["changed"].append({
+                "source": source,
+                "platform": exp.get("platform"),
+                **_fingerprint_diff(old.get("fingerprint") or {}, exp["fingerprint"])
+            })
+
+    unknown = set(timed_out) | set(failed)
+    for source, old in previous.items():
+        if source not in current and source not in unknown:
+            delta["resolved"].append({"source": source, "platform": old.get("platform")})
+    return delta
+
+def build_report(identifier: str, exposures: list, source_findings: dict, timed_out: list = (), failed: list = ()) -> dict:
+    # This now receives the findings of every single exposure found, per source;
+    # each finding is weighted by the risk level of the exposure it came from
+    severity = {exp.get("source"): exp.get("risk_level") for exp in exposures}
+    all_findings, severities = [], []
+    for source, findings in source_findings.items():
+        all_findings.extend(findings)
+        severities.extend([severity.get(source)] * len(findings))
+    with metrics.time(STAGE_SECONDS, stage="risk_score"):
+        final_score = scorer.calculate(all_findings, severities) if all_findings else 0
 
     return {
         "target": identifier,
         "total_leaks": len(exposures),
         "risk_score": final_score,
-        "exposures": exposures
-    }
\ No newline at end of file
+        "exposures": exposures,
+        # Sources that missed the deadline; the report is partial if any are listed
+        "timed_out_sources": list(timed_out),
+        "failed_sources": list(failed),
+        "partial": bool(timed_out or failed),
+        # Kept in the stored report so the next incremental scan can reuse unchanged enrichment
+        "source_findings": source_findings
+    }
+
+def persist_report(report: dict) -> dict:
+    """Queues the full report for the store; what callers get back omits the raw findings."""
+    report_store.submit(report)
+    return {key: value for key, value in report.items() if key != "source_findings"}
+
+def _public_exposure(exp: dict) -> dict:
+    """
+    An exposure in the ExposedData shape the scan response uses: internal fields
+    (source, fingerprint, pivots, ...) stay out. The demo records name their platform under 'source'.
+    """
+    return ExposedData.model_validate({"platform": exp.get("source"), **exp}).model_dump()
+
+def _public_report(report: dict) -> dict:
+    """A report in the ScanResponse shape, for the outputs that are not validated by a response_model."""
+    public = {**report, "exposures": [_public_exposure(exp) for exp in report.get("exposures", [])]}
+    return ScanResponse.model_validate(public).model_dump()
+
+@metrics.timed(STAGE_SECONDS, stage="scan")
+async def run_scan(identifier: str, source_limits: dict = None, deadline: float = SCAN_DEADLINE, incremental: bool = False) -> dict:
+    """
+    The full scan pipeline for one identifier: scrapers -> enrichment -> risk score.
+    Sources are bounded by the orchestrator's per-source budgets and the overall 'deadline'.
+    'source_limits' optionally caps concurrent calls per source (used by batch scans).
+    'incremental' compares against the last stored report: unchanged exposures skip
+    enrichment and the report carries a 'delta'.
+    """
+    # The input is now flexible (Email, Username, or UID)
+    identifier = identifier.lower()
+
+    # 1. DEMO TRIGGER
+    if identifier == "demo@tracepoint.com" or identifier == "demo_user":
+        if seeder:
+            return seeder.load_demo_data()
+        raise HTTPException(status_code=500, detail="Demo module not loaded")
+
+    # 2. - 5. SCAN, THEN 6. PERSIST (queued; the response never waits on the disk)
+    return persist_report(await scan_identifier(identifier, source_limits, deadline, incremental))
+
+async def scan_identifier(identifier: str, source_limits: dict = None, deadline: float = SCAN_DEADLINE, incremental: bool = False) -> dict:
+    """
+    Steps 2-5 of run_scan for an already lower-cased identifier. Returns the report before it is
+    persisted, raw findings included under 'source_findings'.
+    """
+    # 2. + 3. ROUTE AND GATHER WITHIN THE DEADLINE
+    plan = plan_sources(identifier)
+    (results, timed_out, failed), baseline = await asyncio.gather(
+        orchestrator.run(plan, deadline, source_limits),
+        load_baseline(identifier) if incremental else asyncio.sleep(0)
+    )
+    # Filter out None results, keeping the routing order so reports are stable
+    found = [(source, results.get(source)) for source, _, _ in plan]
+    found = [(source, res) for source, res in found if res is not None and isinstance(res, dict)]
+
+    # 4. AI & COMPLIANCE ENRICHMENT (skipped for exposures unchanged since the baseline)
+    findings = await asyncio.gather(*(enrich_or_reuse(source, exp, baseline) for source, exp in found))
+    exposures = [exp for _, exp in found]
+
+    # 5. FINAL CALCULATION
+    report = build_report(identifier, exposures, {source: f for (source, _), f in zip(found, findings)}, timed_out, failed)
+    if incremental:
+        report["delta"] = build_delta(baseline, exposures, timed_out, failed)
+    return report
+
+@router.post("/", response_model=ScanResponse)
+async def start_new_scan(request: ScanRequest):
+    return await run_scan(request.target_email, incremental=request.incremental)
+
+# ==========================================
+# PIVOT SCAN (expand across linked identifiers)
+# ==========================================
+@router.post("/pivot")
+async def start_pivot_scan(request: PivotScanRequest):
+    """
+    Scans the identifier, then the identifiers its results lead to (the email's username, GitHub
+    commit authors, emails inside leaked pastes), breadth-first up to 'max_depth' hops and 'max_nodes'
+    scans. Returns the identity graph: one node per identifier with its report, and the edges between them.
+    """
+    # Shared by every scan of the investigation, so a wide fan-out can't flood one upstream
+    source_limits = {source: asyncio.Semaphore(limit) for source, limit in BATCH_SOURCE_CONCURRENCY.items()}
+
+    async def expand(identifier, remaining):
+        report = await scan_identifier(identifier, source_limits, min(SCAN_DEADLINE, remaining))
+        return _public_report(persist_report(report)), extract_pivots(identifier, report)
+
+    return await pivot_engine.run(request.target_email, expand, request.max_depth, request.max_nodes)
+
+# ==========================================
+# STREAMING SCAN (results as each source lands)
+# ==========================================
+def _stream_event(event: str, data: dict, fmt: str) -> str:
+    if fmt == "sse":
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+    return json.dumps({"event": event, **data}) + "\n"
+
+async def _stream_scan(identifier: str, fmt: str, incremental: bool = False):
+    """
+    Emits one 'exposure' event per source as soon as its scraper returns and it is enriched,
+    then a final 'summary' carrying the risk score (and the delta, for incremental scans).
+    A slow source only delays itself.
+    """
+    identifier = identifier.lower()
+
+    # 1. DEMO TRIGGER
+    if identifier == "demo@tracepoint.com" or identifier == "demo_user":
+        demo = seeder.load_demo_data() if seeder else None
+        for exp in (demo or {}).get("exposures", []):
+            yield _stream_event("exposure", {"source": "demo", "exposure": _public_exposure(exp)}, fmt)
+        yield _stream_event("summary", {
+            "target": identifier,
+            "total_leaks": (demo or {}).get("total_leaks", 0),
+            "risk_score": (demo or {}).get("risk_score", 0)
+        }, fmt)
+        return
+
+    # 2. INTELLIGENT ROUTING -- every scraper starts right away, bounded by the deadline
+    baseline = await load_baseline(identifier) if incremental else None
+    exposures = []
+    source_findings = {}
+    timed_out = []
+    failed = []
+
+    # 3. + 4. ENRICH AND EMIT IN COMPLETION ORDER
+    # (closing this generator on client disconnect cancels the sources still running)
+    async for source, exp, status in orchestrator.stream(plan_sources(identifier)):
+        if status == "timeout":
+            timed_out.append(source)
+            yield _stream_event("timeout", {"source": source}, fmt)
+            continue
+        if status == "error":
+            failed.append(source)
+            continue
+        if not isinstance(exp, dict):
+            continue
+        source_findings[source] = await enrich_or_reuse(source, exp, baseline)
+        exposures.append(exp)
+        yield _stream_event("exposure", {"source": source, "exposure": _public_exposure(exp)}, fmt)
+
+    # 5. FINAL CALCULATION
+    report = build_report(identifier, exposures, source_findings, timed_out, failed)
+    if incremental:
+        report["delta"] = build_delta(baseline, exposures, timed_out, failed)
+    summary = persist_report(report)
+    del summary["exposures"]
+    yield _stream_event("summary", summary, fmt)
+
+@router.post("/stream")
+async def start_streaming_scan(request: ScanRequest, format: str = Query("ndjson", pattern="^(ndjson|sse)$")):
+    """
+    Streaming variant of the scan: 'exposure' events as each source completes, then a 'summary'.
+    Use ?format=sse for Server-Sent Events or the default NDJSON.
+    """
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(
+        _stream_scan(request.target_email, format, request.incremental),
+        media_type=media_type,
+        # Stop reverse proxies from buffering the events
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# ==========================================
+# BATCH SCANNING (compliance audits)
+# ==========================================
+async def _batch_results(targets: list, concurrency: int, incremental: bool = False):
+    """
+    Runs many scans with a global concurrency cap plus per-source caps,
+    yielding one NDJSON line per target as soon as it finishes.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    # Shared across the whole batch so a 5,000-email audit can't flood one upstream
+    source_limits = {source: asyncio.Semaphore(limit) for source, limit in BATCH_SOURCE_CONCURRENCY.items()}
+
+    async def scan_one(target):
+        async with semaphore:
+            try:
+                return _public_report(await run_scan(target, source_limits, BATCH_SCAN_DEADLINE, incremental))
+            except Exception as e:
+                logger.error(f"Batch scan failed for {target}: {e}")
+                return {"target": target, "error": str(e)}
+
+    tasks = [asyncio.create_task(scan_one(target)) for target in targets]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            yield json.dumps(await finished) + "\n"
+    finally:
+        # Client went away mid-stream: don't keep scanning for nobody
+        for task in tasks:
+            task.cancel()
+
+def _normalize_targets(targets) -> list:
+    """Lower-cases, strips and de-duplicates while keeping the original order."""
+    seen = {}
+    for target in targets:
+        target = (target or "").strip().lower()
+        if target:
+            seen.setdefault(target, None)
+    if not seen:
+        raise HTTPException(status_code=400, detail="No identifiers supplied.")
+    if len(seen) > BATCH_MAX_TARGETS:
+        raise HTTPException(status_code=413, detail=f"A batch is limited to {BATCH_MAX_TARGETS} identifiers.")
+    return list(seen)
+
+def _parse_upload(filename: str, content: bytes) -> list:
+    """Accepts NDJSON (strings or {"target_email": ...} objects) or CSV (first column)."""
+    text = content.decode("utf-8", errors="replace")
+    stripped = text.lstrip()
+    if (filename or "").lower().endswith((".ndjson", ".jsonl")) or stripped.startswith(("{", '"')):
+        targets = []
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError:
+                raise HTTPException(status_code=400, detail=f"Invalid NDJSON line: {line[:80]}")
+            targets.append(item.get("target_email") if isinstance(item, dict) else str(item))
+        return targets
+
+    rows = [row[0] for row in csv.reader(io.StringIO(text)) if row]
+    # Skip a header row like "email" / "target_email"
+    if rows and rows[0].strip().lower() in ("email", "target_email", "identifier", "username"):
+        rows = rows[1:]
+    return rows
+
+def _batch_response(targets: list, concurrency: int = None, incremental: bool = False) -> StreamingResponse:
+    concurrency = max(1, min(concurrency or BATCH_CONCURRENCY, BATCH_CONCURRENCY))
+    return StreamingResponse(_batch_results(targets, concurrency, incremental), media_type="application/x-ndjson")
+
+@router.post("/batch")
+async def start_batch_scan(request: BatchScanRequest):
+    """
+    Scans many identifiers in one request. Results stream back as NDJSON, one line per target, in completion order.
+    Set 'incremental' for monitoring re-scans: each line then carries the delta against that target's last report.
+    """
+    return _batch_response(_normalize_targets(request.targets), request.concurrency, request.incremental)
+
+@router.post("/batch/upload")
+async def start_batch_scan_upload(file: UploadFile = File(...), concurrency: Optional[int] = None, incremental: bool = False):
+    """
+    Same as /batch, but takes an uploaded CSV (first column) or NDJSON file of identifiers.
+    """
+    targets = _parse_upload(file.filename, await file.read())
+    return _batch_response(_normalize_targets(targets), concurrency, incremental)
+
+# ==========================================
+# BACKGROUND JOBS (submit now, poll or stream later)
+# ==========================================
+def _job_links(job, http_request: Request) -> dict:
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": str(http_request.url_for("get_scan_job", job_id=job.id)),
+        "stream_url": str(http_request.url_for("stream_scan_job", job_id=job.id))
+    }
+
+def _queue_full(retry_after: int) -> HTTPException:
+    # Backpressure: tell the client (or load balancer) when to come back instead of holding the connection
+    return HTTPException(status_code=503, detail="Scan queue is full, retry later.", headers={"Retry-After": str(retry_after)})
+
+async def _public_scan(target: str, **kwargs) -> dict:
+    """run_scan() for a background job: its result is kept and served in the ScanResponse shape."""
+    return _public_report(await run_scan(target, **kwargs))
+
+@router.post("/jobs", status_code=202)
+async def submit_scan_job(request: ScanJobRequest, http_request: Request):
+    """
+    Queues a scan and returns its job ID immediately. The scan keeps running if the client disconnects.
+    """
+    target, incremental = request.target_email, request.incremental
+    try:
+        job = job_queue.submit("scan", lambda: _public_scan(target, incremental=incremental), request.priority, target=target.lower())
+    except QueueFull as e:
+        raise _queue_full(e.retry_after)
+    return _job_links(job, http_request)
+
+@router.post("/jobs/batch", status_code=202)
+async def submit_batch_jobs(request: BatchJobRequest, http_request: Request):
+    """
+    Queues one job per identifier (low priority by default, so interactive scans go first).
+    The whole batch is refused if the queue cannot take all of it.
+    """
+    targets = _normalize_targets(request.targets)
+    try:
+        job_queue.ensure_capacity(len(targets))
+    except QueueFull as e:
+        raise _queue_full(e.retry_after)
+
+    jobs = []
+    for target in targets:
+        job = job_queue.submit(
+            "scan",
+            lambda target=target: _public_scan(target, deadline=BATCH_SCAN_DEADLINE, incremental=request.incremental),
+            request.priority,
+            target=target
+        )
+        jobs.append({"target": target, **_job_links(job, http_request)})
+    return {"jobs": jobs}
+
+@router.get("/jobs/stats")
+async def get_job_stats():
+    """
+    Queue depth, running jobs and worker utilisation of the background scan queue.
+    """
+    return job_queue.stats()
+
+@router.get("/jobs/{job_id}")
+async def get_scan_job(job_id: str):
+    """
+    Current status of a job; finished scan jobs include the report under 'result'.
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job.")
+    return job.snapshot()
+
+async def _stream_job(job, fmt: str):
+    async for snapshot in job_queue.watch(job):
+        yield _stream_event("status", snapshot, fmt)
+
+@router.get("/jobs/{job_id}/stream")
+async def stream_scan_job(job_id: str, format: str = Query("ndjson", pattern="^(ndjson|sse)$")):
+    """
+    One 'status' event now and on every change (queued -> running -> done/failed/cancelled).
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job.")
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(
+        _stream_job(job, format),
+        media_type=media_type,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.delete("/jobs/{job_id}")
+async def cancel_scan_job(job_id: str, http_request: Request):
+    """
+    Cancels a queued or running job.
+    """
+    job = job_queue.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job.")
+    return _job_links(job, http_request)
+
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """
+    Hit/miss/eviction counters for the upstream result cache (use these to size CACHE_MAX_ENTRIES and the TTLs),
+    plus the raw-content findings cached per content hash.
+    """
+    return {**result_cache.stats(), "raw_content": raw_scanner.stats()}
+
+@router.get("/rate-limits")
+async def get_rate_limit_stats():
+    """
+    Current pacing per upstream, as learned from X-RateLimit-* / Retry-After headers.
+    """
+    return governor.stats()
+
+@router.get("/sources/stats")
+async def get_source_stats():
+    """
+    Rolling latency / failure history per source, and whether it is currently being hedged.
+    """
+    return orchestrator.stats()
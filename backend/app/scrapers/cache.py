@@ -0,0 +1,180 @@
+import asyncio
+import copy
+import functools
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from backend.app.scrapers.singleflight import inflight
+
+logger = logging.getLogger(__name__)
+
+# ==========================================
+# CONFIGURATION (override via .env)
+# ==========================================
+# How long a positive result stays fresh, per source (seconds)
+SOURCE_TTLS = {
+    "github": int(os.getenv("CACHE_TTL_GITHUB", 3600)),
+    "hibp": int(os.getenv("CACHE_TTL_HIBP", 6 * 3600)),
+    "reddit": int(os.getenv("CACHE_TTL_REDDIT", 3600)),
+    "pastebin": int(os.getenv("CACHE_TTL_PASTEBIN", 1800)),
+}
+# "Nothing found" answers are cached too, but for much less time
+NEGATIVE_TTL = int(os.getenv("CACHE_NEGATIVE_TTL", 300))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 10000))
+# Optional on-disk tier that survives restarts, e.g. CACHE_DB_PATH=shadowtrace_cache.db
+CACHE_DB_PATH = os.getenv("CACHE_DB_PATH")
+
+class LRUCache:
+    """In-process tier: an OrderedDict kept in recency order, bounded by entry count."""
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.evictions = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.time():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key, payload, expires_at):
+        self.entries[key] = (expires_at, payload)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+class SQLiteCache:
+    """Optional persistent tier. Blocking sqlite calls are pushed to a thread by ResultCache."""
+
+    def __init__(self, path):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS scraper_cache (key TEXT PRIMARY KEY, payload TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self.conn.commit()
+
+    def get(self, key):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT payload, expires_at FROM scraper_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return row
+
+    def set(self, key, payload, expires_at):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO scraper_cache (key, payload, expires_at) VALUES (?, ?, ?)",
+                (key, payload, expires_at),
+            )
+            self.conn.commit()
+
+class ResultCache:
+    """
+    Two-tier cache for upstream lookups. Results are stored as JSON so callers always get a
+    fresh copy (the scan router mutates exposures in place during enrichment).
+    """
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, db_path=CACHE_DB_PATH):
+        self.memory = LRUCache(max_entries)
+        self.disk = SQLiteCache(db_path) if db_path else None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.by_source = {}
+
+    def _count(self, key, outcome):
+        counts = self.by_source.setdefault(key.split(":", 1)[0], {"hits": 0, "misses": 0})
+        counts[outcome] += 1
+
+    async def get(self, key):
+        """Returns (hit, value). A cached "nothing found" comes back as (True, None)."""
+        payload = self.memory.get(key)
+        if payload is None and self.disk:
+            row = await asyncio.to_thread(self.disk.get, key)
+            if row:
+                payload = row[0]
+                # Promote to the memory tier for the rest of its lifetime
+                self.memory.set(key, payload, row[1])
+                self.disk_hits += 1
+        if payload is None:
+            self.misses += 1
+            self._count(key, "misses")
+            return False, None
+        self.hits += 1
+        self._count(key, "hits")
+        return True, json.loads(payload)
+
+    async def set(self, key, value, ttl):
+        payload = json.dumps(value)
+        expires_at = time.time() + ttl
+        self.memory.set(key, payload, expires_at)
+        if self.disk:
+            await asyncio.to_thread(self.disk.set, key, payload, expires_at)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.memory.evictions,
+            "entries": len(self.memory.entries),
+            "max_entries": self.memory.max_entries,
+            "disk_tier": bool(self.disk),
+            "sources": self.by_source,
+            "in_flight": inflight.stats(),
+        }
+
+result_cache = ResultCache()
+
+def cache_key(source: str, identifier: str) -> str:
+    return f"{source}:{(identifier or '').strip().lower()}"
+
+class Uncached(dict):
+    """A scraper result that is served once and never cached, e.g. a simulated fallback."""
+
+def cached(source: str, ttl: int = None, negative_ttl: int = NEGATIVE_TTL):
+    """
+    Decorator for the async scan_* functions: caches their result per (source, identifier).
+    Concurrent misses for the same key are coalesced into one upstream call.
+    A None result ("nothing found") is cached for negative_ttl. A failed lookup must raise
+    instead, so it is never cached, and Uncached results are not stored either.
+    The wrapped (uncached) function stays reachable as fn.__wrapped__.
+    """
+    ttl = ttl if ttl is not None else SOURCE_TTLS[source]
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(identifier, *args, **kwargs):
+            key = cache_key(source, identifier)
+            hit, value = await result_cache.get(key)
+            if hit:
+                return value
+
+            async def fetch():
+                value = await fn(identifier, *args, **kwargs)
+                if isinstance(value, Uncached):
+                    return value
+                await result_cache.set(key, value, ttl if value is not None else negative_ttl)
+                return value
+
+            # Every coalesced caller gets its own copy -- the router mutates exposures in place
+            return copy.deepcopy(await inflight.do(key, fetch))
+        return wrapper
+    return decorator
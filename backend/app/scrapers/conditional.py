@@ -0,0 +1,82 @@
+import os
+
+import httpx
+
+from backend.app.scrapers.cache import CACHE_DB_PATH, ResultCache
+
+# ==========================================
+# CONFIGURATION (override via .env)
+# ==========================================
+# Conditional requests (If-None-Match / If-Modified-Since) for upstreams that send validators
+CONDITIONAL_REQUESTS = os.getenv("CONDITIONAL_REQUESTS", "1") != "0"
+# How long a validator and its body are kept -- longer than the re-scan interval of daily monitoring
+CONDITIONAL_TTL = int(os.getenv("CONDITIONAL_TTL", 7 * 24 * 3600))
+# Validators (each with one upstream body) kept in memory; separate from the scraper result cache
+CONDITIONAL_MAX_ENTRIES = int(os.getenv("CONDITIONAL_MAX_ENTRIES", 2000))
+
+# Own store, so validators neither take result-cache slots nor count in its hit ratio.
+# Keys stay prefixed: the optional SQLite tier shares the CACHE_DB_PATH file.
+validator_cache = ResultCache(CONDITIONAL_MAX_ENTRIES, CACHE_DB_PATH)
+
+class Revalidator:
+    """
+    Remembers the ETag / Last-Modified (plus body) of upstream answers, keyed by source and URL,
+    and turns the next request for the same URL into a conditional one. A 304 is replayed as the
+    stored 200, so the scrapers never see the difference. Entries live in validator_cache
+    (memory tier, plus the SQLite tier when CACHE_DB_PATH is set).
+    """
+
+    def __init__(self):
+        self.sent = 0
+        self.not_modified = 0
+
+    @staticmethod
+    def _key(source, url):
+        return f"validators:{source}:{url}"
+
+    async def prepare(self, source, url, headers):
+        """Returns (headers, stored entry or None); headers gain the conditional fields."""
+        if not CONDITIONAL_REQUESTS:
+            return headers, None
+        hit, entry = await validator_cache.get(self._key(source, url))
+        if not hit or not entry:
+            return headers, None
+        headers = dict(headers or {})
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        self.sent += 1
+        return headers, entry
+
+    async def complete(self, source, url, response: httpx.Response, entry):
+        """Stores fresh validators, or rebuilds the stored answer from a 304."""
+        if response.status_code == 304 and entry:
+            self.not_modified += 1
+            return httpx.Response(
+                200,
+                headers={**entry["headers"], "x-not-modified": "1"},
+                content=entry["body"].encode(),
+                request=response.request,
+            )
+
+        if CONDITIONAL_REQUESTS and response.status_code == 200:
+            etag = response.headers.get("etag")
+            last_modified = response.headers.get("last-modified")
+            if etag or last_modified:
+                await validator_cache.set(self._key(source, url), {
+                    "etag": etag,
+                    "last_modified": last_modified,
+                    "headers": {"content-type": response.headers.get("content-type", "application/json")},
+                    "body": response.text,
+                }, CONDITIONAL_TTL)
+        return response
+
+    def stats(self):
+        return {
+            "conditional_sent": self.sent,
+            "not_modified": self.not_modified,
+            "validators": len(validator_cache.memory.entries),
+        }
+
+revalidator = Revalidator()
@@ -3,14 +3,23 @@ import asyncio
 import os
 import logging
 
+from backend.app.scrapers.cache import Uncached, cached
+from backend.app.scrapers.http_client import UpstreamError, get_client
+from backend.app.scrapers.rate_limit import RateLimitExceeded, governor
+
 # Setup basic logging for the terminal
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# How many of the matched files get their raw content scanned per target
+MAX_RAW_FILES = int(os.getenv("GITHUB_MAX_RAW_FILES", 5))
+# Raw file host; pointed at a local mock by the benchmarks
+GITHUB_RAW_URL = os.getenv("GITHUB_RAW_URL", "https://raw.githubusercontent.com")
+
 async def fetch_url(client: httpx.AsyncClient, url: str, headers: dict) -> dict:
     """Helper function to make async HTTP requests with error handling."""
     try:
-        response = await client.get(url, headers=headers, timeout=7.0)
+        # Paced by the shared governor; 429s are retried with backoff before we see them
+        response = await governor.get(client, url, "github", headers=headers)
         if response.status_code == 200:
             return response.json()
         elif response.status_code in (403, 429):
@@ -19,11 +28,41 @@ async def fetch_url(client: httpx.AsyncClient, url: str, headers: dict) -> dict:
         else:
             logger.error(f"GitHub API Error {response.status_code} on {url}")
             return {"error": "http_error"}
+    except RateLimitExceeded as e:
+        logger.warning(f"⚠️ GitHub request not sent, rate budget exhausted: {e}")
+        return {"error": "rate_limited"}
     except Exception as e:
         logger.error(f"Request failed for {url}: {str(e)}")
         return {"error": "exception"}
 
-async def scan_github(email: str) -> dict:
+def commit_authors(commits_data: dict) -> list:
+    """GitHub logins of the commit authors on one page of commit search results, de-duplicated."""
+    logins = {}
+    for item in commits_data.get("items") or []:
+        author = item.get("author") if isinstance(item, dict) else None
+        # author is null when the commit email is not linked to any account
+        if isinstance(author, dict) and author.get("login"):
+            logins.setdefault(author["login"], None)
+    return list(logins)
+
+def matched_files(code_data: dict) -> dict:
+    """
+    {raw URL: content digest} for the first MAX_RAW_FILES code search hits. The digest is the git
+    blob SHA, which every fork of the file shares, so the raw scanner downloads each content once.
+    """
+    files = {}
+    for item in (code_data.get("items") or [])[:MAX_RAW_FILES]:
+        if not isinstance(item, dict):
+            continue
+        full_name = (item.get("repository") or {}).get("full_name")
+        # html_url is https://github.com/<owner>/<repo>/blob/<ref>/<path>
+        ref_and_path = (item.get("html_url") or "").partition("/blob/")[2]
+        if full_name and ref_and_path and item.get("sha"):
+            files[f"{GITHUB_RAW_URL}/{full_name}/{ref_and_path}"] = f"git:{item['sha']}"
+    return files
+
+@cached("github")
+async def scan_github(email: str, client: httpx.AsyncClient = None) -> dict:
     """
     Advanced OSINT Scraper for GitHub.
     Searches for exposed emails in commits and maps them to a user profile.
@@ -39,23 +78,25 @@ async def scan_github(email: str) -> dict:
     else:
         logger.warning("No GITHUB_TOKEN found. Running unauthenticated (Limit: 60 requests/hr).")
 
-    # 2. Define our attack vectors (URLs)
+    # 2. Define our attack vectors (URLs, relative to the pooled client's base_url)
     # Search for commits where they accidentally used their personal email
-    commits_url = f"https://api.github.com/search/commits?q=author-email:{email}"
+    commits_url = f"/search/commits?q=author-email:{email}"
     # Search if the email is publicly listed in any code/files
-    code_url = f"https://api.github.com/search/code?q={email}"
+    code_url = f"/search/code?q={email}"
 
     found_pii = []
     risk_level = "LOW"
     description_parts = []
     total_leaks = 0
+    commit_count = code_count = 0
+    files = {}
 
-    async with httpx.AsyncClient() as client:
-        # 3. Execute searches concurrently (Massive speed boost)
-        commits_data, code_data = await asyncio.gather(
-            fetch_url(client, commits_url, headers),
-            fetch_url(client, code_url, headers)
-        )
+    # 3. Execute searches concurrently over the shared keep-alive pool (Massive speed boost)
+    client = client or get_client("github")
+    commits_data, code_data = await asyncio.gather(
+        fetch_url(client, commits_url, headers),
+        fetch_url(client, code_url, headers)
+    )
 
     # 4. Analyze Commit History
     if not commits_data.get("error"):
@@ -74,27 +115,41 @@ async def scan_github(email: str) -> dict:
             description_parts.append(f"Email hardcoded in {code_count} public repositories.")
             risk_level = "HIGH"
             total_leaks += code_count
+            files = matched_files(code_data)
+
+    errors = [data["error"] for data in (commits_data, code_data) if data.get("error")]
 
     # 6. Format the Real Response
     if total_leaks > 0:
-        return {
+        exposure = {
             "platform": "GitHub",
             "risk_level": risk_level,
             "description": " | ".join(description_parts),
             "pii_found": found_pii,
-            "url": f"https://github.com/search?q={email}&type=commits"
+            "url": f"https://github.com/search?q={email}&type=commits",
+            # Accounts that authored those commits; followed by pivot scans (services/pivots.py)
+            "pivots": commit_authors(commits_data),
+            # Matched files are fetched and run through the PII detector by the scan router
+            "raw_urls": list(files),
+            "raw_digests": files,
+            # Compared against the previous report by incremental re-scans (a changed file is a new blob SHA)
+            "fingerprint": {"commits": commit_count, "code": code_count, "files": sorted(files.values())}
         }
+        # One of the two searches failed: report what we have, but don't cache half an answer
+        return Uncached(exposure) if errors else exposure
 
-    # 7. THE HACKATHON FAILSAFE (If API limits out or network drops during demo)
+    # 7. THE HACKATHON FAILSAFE (If API limits out or network drops during demo) -- never cached
     if commits_data.get("error") == "rate_limited" or "demo" in email.lower() or "test" in email.lower():
-        logger.info("Injecting Fallback Demo Data for GitHub.")
-        return {
+        logger.debug("Injecting Fallback Demo Data for GitHub.")
+        return Uncached({
             "platform": "GitHub (Simulated)",
             "risk_level": "HIGH",
             "description": "Exposed API keys and personal email found in 'test-repo' commits.",
             "pii_found": ["Email", "AWS Access Key (Simulated)", "Commit History"],
             "url": f"https://github.com/search?q={email}&type=commits"
-        }
+        })
 
+    if errors:
+        raise UpstreamError(f"GitHub search failed ({', '.join(errors)})")
     # If the API worked but absolutely nothing was found
     return None
\ No newline at end of file
@@ -2,10 +2,14 @@ import httpx
 import logging
 import os
 
-logging.basicConfig(level=logging.INFO)
+from backend.app.scrapers.cache import Uncached, cached
+from backend.app.scrapers.rate_limit import governor
+from backend.app.scrapers.http_client import UpstreamError, get_client
+
 logger = logging.getLogger(__name__)
 
-async def scan_hibp(email: str) -> dict:
+@cached("hibp")
+async def scan_hibp(email: str, client: httpx.AsyncClient = None) -> dict:
     """
     Queries the HaveIBeenPwned API for known data breaches associated with the email.
     """
@@ -19,16 +23,16 @@ async def scan_hibp(email: str) -> dict:
     # THE HACKATHON DEMO FAILSAFE
     # ==========================================
     # If no API key is set, or if you search for "demo", 
-    # we return a highly realistic fake response to keep the presentation alive.
+    # we return a highly realistic fake response to keep the presentation alive (never cached).
     if not api_key or "demo" in email.lower() or "test" in email.lower():
-        logger.info("Injecting Fallback Demo Data for HaveIBeenPwned.")
-        return {
+        logger.debug("Injecting Fallback Demo Data for HaveIBeenPwned.")
+        return Uncached({
             "platform": "HaveIBeenPwned (Historical Breaches)",
             "risk_level": "CRITICAL",
             "description": "Email and password hash exposed in 2012 LinkedIn and 2019 Canva data breaches.",
             "pii_found": ["Email", "Password Hash", "IP Address", "Geographic Location"],
             "url": "https://haveibeenpwned.com/PwnedWebsites#LinkedIn"
-        }
+        })
 
     # ==========================================
     # THE REAL API LOGIC (In case you add a key later)
@@ -38,33 +42,36 @@ async def scan_hibp(email: str) -> dict:
         "user-agent": "TracePoint-OSINT-Hackathon-App"
     }
 
-    url = f"https://haveibeenpwned.com/api/v3/breachedaccount/{email}?truncateResponse=false"
+    url = f"/api/v3/breachedaccount/{email}?truncateResponse=false"
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers, timeout=5.0)
+        client = client or get_client("hibp")
+        response = await governor.get(client, url, "hibp", headers=headers)
 
-            if response.status_code == 200:
-                breaches = response.json()
-                # Extract the first 2-3 breach names to make the description look authentic
-                breach_names = [b.get("Name", "Unknown") for b in breaches]
-                preview_names = ", ".join(breach_names[:2])
-                
-                return {
-                    "platform": "HaveIBeenPwned (Data Breaches)",
-                    "risk_level": "CRITICAL",
-                    "description": f"Email found in {len(breaches)} known corporate data breaches (e.g., {preview_names}).",
-                    "pii_found": ["Email", "Passwords", "Historical Data"],
-                    "url": "https://haveibeenpwned.com/"
-                }
-            elif response.status_code == 404:
-                logger.info(f"HIBP: No breaches found for {email}. Good news!")
-                return None
-            elif response.status_code == 401:
-                logger.error("HIBP API Key is invalid or expired.")
-            elif response.status_code == 429:
-                logger.warning("HIBP API Rate Limited!")
+        if response.status_code == 200:
+            breaches = response.json()
+            # Extract the first 2-3 breach names to make the description look authentic
+            breach_names = [b.get("Name", "Unknown") for b in breaches]
+            preview_names = ", ".join(breach_names[:2])
+            
+            return {
+                "platform": "HaveIBeenPwned (Data Breaches)",
+                "risk_level": "CRITICAL",
+                "description": f"Email found in {len(breaches)} known corporate data breaches (e.g., {preview_names}).",
+                "pii_found": ["Email", "Passwords", "Historical Data"],
+                "url": "https://haveibeenpwned.com/",
+                # Compared against the previous report by incremental re-scans
+                "fingerprint": {"breaches": sorted(breach_names)}
+            }
+        elif response.status_code == 404:
+            logger.debug("HIBP: No breaches found for %s. Good news!", email)
+            return None
+        elif response.status_code == 401:
+            logger.error("HIBP API Key is invalid or expired.")
+        elif response.status_code == 429:
+            logger.warning("HIBP API Rate Limited!")
     except Exception as e:
-        logger.error(f"HIBP Scraper Error: {e}")
+        raise UpstreamError(f"HIBP request failed: {e}") from e
 
-    return None
\ No newline at end of file
+    # 401 / 429 / 5xx: a failure, not "no breaches" -- never cached
+    raise UpstreamError(f"HIBP answered {response.status_code}")
@@ -0,0 +1,132 @@
+import functools
+import logging
+import os
+import ssl
+
+import certifi
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# ==========================================
+# UPSTREAM CONFIGURATION
+# ==========================================
+# One pooled client per upstream so every host gets its own connection cap.
+# Base URLs can be pointed at a local mock (see benchmarks/mock_upstream.py).
+# rpm/burst seed the rate governor (rate_limit.py) until the upstream's own headers correct them;
+# max_wait is how long a request may queue or back off before we give up on it.
+UPSTREAMS = {
+    "github": {
+        "base_url": os.getenv("GITHUB_API_URL", "https://api.github.com"),
+        "timeout": 7.0,
+        "max_connections": int(os.getenv("GITHUB_MAX_CONNECTIONS", 20)),
+        # Search API: 30 req/min with a token, 10 without
+        "rpm": int(os.getenv("GITHUB_RPM", 30 if os.getenv("GITHUB_TOKEN") else 10)),
+        "burst": 5,
+        "max_wait": 10.0,
+    },
+    "hibp": {
+        "base_url": os.getenv("HIBP_API_URL", "https://haveibeenpwned.com"),
+        "timeout": 5.0,
+        "max_connections": int(os.getenv("HIBP_MAX_CONNECTIONS", 10)),
+        # Lowest paid plan is 10 req/min
+        "rpm": int(os.getenv("HIBP_RPM", 10)),
+        "burst": 1,
+        "max_wait": 10.0,
+    },
+    "reddit": {
+        "base_url": os.getenv("REDDIT_URL", "https://www.reddit.com"),
+        "timeout": 5.0,
+        "max_connections": int(os.getenv("REDDIT_MAX_CONNECTIONS", 10)),
+        "rpm": int(os.getenv("REDDIT_RPM", 60)),
+        "burst": 10,
+        "max_wait": 5.0,
+    },
+    "pastebin": {
+        "base_url": os.getenv("PSBDMP_API_URL", "https://psbdmp.ws"),
+        # We keep the timeout short (3 seconds) so it doesn't slow down the whole scan if the site is down
+        "timeout": 3.0,
+        "max_connections": int(os.getenv("PSBDMP_MAX_CONNECTIONS", 10)),
+        "rpm": int(os.getenv("PSBDMP_RPM", 60)),
+        "burst": 10,
+        "max_wait": 3.0,
+    },
+    # Raw paste / file bodies streamed through the PII detector
+    "raw": {
+        "base_url": os.getenv("PASTEBIN_RAW_URL", "https://pastebin.com"),
+        "timeout": 5.0,
+        "max_connections": int(os.getenv("RAW_MAX_CONNECTIONS", 20)),
+        "rpm": int(os.getenv("RAW_RPM", 120)),
+        "burst": 20,
+        "max_wait": 5.0,
+    },
+}
+
+CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", 3.0))
+KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", 30.0))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").lower() in ("1", "true", "yes")
+
+_clients = {}
+
+class UpstreamError(Exception):
+    """
+    Raised by a scraper when its upstream could not answer (network error, 5xx, 429, bad key).
+    Unlike a None result ("nothing found"), it is never cached and the scan lists the source
+    under failed_sources.
+    """
+
+def _http2_available() -> bool:
+    if not HTTP2_ENABLED:
+        return False
+    try:
+        import h2  # noqa: F401 -- optional, installed with `pip install httpx[http2]`
+        return True
+    except ImportError:
+        return False
+
+@functools.lru_cache(maxsize=None)
+def _ssl_context() -> ssl.SSLContext:
+    """
+    One TLS context for every client: loading the CA bundle is ~60 ms, and each AsyncClient
+    would otherwise load its own at startup.
+    """
+    # SSL_CERT_FILE is honoured, as httpx itself would
+    return ssl.create_default_context(cafile=os.getenv("SSL_CERT_FILE") or certifi.where())
+
+def build_client(name: str) -> httpx.AsyncClient:
+    """Creates the pooled keep-alive client for one upstream."""
+    config = UPSTREAMS[name]
+    return httpx.AsyncClient(
+        base_url=config["base_url"],
+        verify=_ssl_context(),
+        http2=_http2_available(),
+        timeout=httpx.Timeout(config["timeout"], connect=min(CONNECT_TIMEOUT, config["timeout"])),
+        limits=httpx.Limits(
+            max_connections=config["max_connections"],
+            max_keepalive_connections=config["max_connections"],
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        ),
+    )
+
+def get_client(name: str) -> httpx.AsyncClient:
+    """
+    Returns the app-lifetime client for an upstream.
+    Created lazily when the scrapers are used outside the FastAPI lifespan (scripts, benchmarks).
+    """
+    client = _clients.get(name)
+    if client is None or client.is_closed:
+        client = _clients[name] = build_client(name)
+    return client
+
+async def start_clients():
+    """Called from the FastAPI lifespan: opens one pooled client per upstream."""
+    for name in UPSTREAMS:
+        get_client(name)
+    logger.info(f"HTTP clients ready for {', '.join(UPSTREAMS)} (http2={_http2_available()})")
+
+async def close_clients():
+    """Called on shutdown (or at the end of a script) to drain keep-alive connections."""
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.aclose()
@@ -0,0 +1,304 @@
+import asyncio
+import email.utils
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+
+import httpx
+
+from backend.app.scrapers.conditional import revalidator
+from backend.app.scrapers.http_client import UPSTREAMS
+from backend.app.services.metrics import record_upstream
+
+logger = logging.getLogger(__name__)
+
+# Statuses worth queueing and retrying instead of giving up on
+RETRY_STATUSES = {429, 502, 503, 504}
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 8.0
+# Shared pacing for multi-worker deployments: every worker on the host draws from the same buckets
+# in this SQLite file (run.py --workers sets it). Unset, each process paces on its own.
+RATE_LIMIT_DB_PATH = os.getenv("RATE_LIMIT_DB_PATH")
+
+class RateLimitExceeded(Exception):
+    """Raised when a request cannot be sent (or retried) before its deadline."""
+
+def _parse_retry_after(value):
+    """Retry-After is either delta-seconds or an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        parsed = email.utils.parsedate_to_datetime(value)
+        return max(parsed.timestamp() - time.time(), 0.0) if parsed else None
+
+def _parse_reset(value):
+    """
+    X-RateLimit-Reset is an epoch timestamp on GitHub but "seconds until reset" on Reddit.
+    Anything that looks like an epoch is converted to a delay.
+    """
+    if not value:
+        return None
+    try:
+        reset = float(value)
+    except ValueError:
+        return None
+    return max(reset - time.time(), 0.0) if reset > 1e9 else reset
+
+def _parse_remaining(value):
+    """X-RateLimit-Remaining is an integer on GitHub but a float ("0.0") on Reddit."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+class TokenBucket:
+    """
+    Pacing for one upstream host. Starts from the configured rpm/burst and is then
+    steered by whatever the upstream tells us in its rate-limit headers.
+    """
+
+    def __init__(self, rpm, burst):
+        self.default_rate = rpm / 60
+        self.rate = self.default_rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.rate_until = 0.0
+
+    def _refill(self, now):
+        if self.rate_until and now >= self.rate_until:
+            # The upstream's window has reset: back to the configured pace
+            self.rate, self.rate_until = self.default_rate, 0.0
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _reserve(self, deadline):
+        """Takes the next token and returns how long to wait for it (raises past the deadline)."""
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens -= 1
+        wait = self.blocked_until - now
+        if self.tokens < 0:
+            wait = max(wait, -self.tokens / self.rate if self.rate > 0 else float("inf"))
+        if now + wait > deadline:
+            self.tokens += 1
+            raise RateLimitExceeded(f"would need to queue {wait:.1f}s")
+        return wait
+
+    async def acquire(self, deadline):
+        """
+        Reserves the next send slot and sleeps until it comes up. Tokens may go negative:
+        each negative token is a caller already queued ahead of us, so callers leave in order.
+        """
+        wait = await self._reserve_async(deadline)
+        if wait > 0:
+            await asyncio.sleep(wait)
+            await self._refresh()
+
+        # The upstream may have pushed back (Retry-After) while we were queued
+        while (hold := self.blocked_until - time.monotonic()) > 0:
+            if time.monotonic() + hold > deadline:
+                raise RateLimitExceeded(f"upstream asked us to back off {hold:.1f}s")
+            await asyncio.sleep(hold)
+            await self._refresh()
+
+    async def _reserve_async(self, deadline):
+        return self._reserve(deadline)
+
+    async def _refresh(self):
+        """Re-reads state another process may have changed (nothing to do for a local bucket)."""
+
+    async def feedback(self, response: httpx.Response):
+        self.observe(response)
+
+    def observe(self, response: httpx.Response):
+        """Feeds X-RateLimit-* / Retry-After back into the bucket."""
+        now = time.monotonic()
+        headers = response.headers
+        retry_after = _parse_retry_after(headers.get("retry-after"))
+        reset_in = _parse_reset(headers.get("x-ratelimit-reset"))
+        remaining = _parse_remaining(headers.get("x-ratelimit-remaining"))
+
+        if remaining is not None:
+            self._refill(now)
+            self.tokens = min(self.tokens, remaining)
+            if reset_in and remaining >= 1:
+                # Spread what is left of the window evenly until it resets
+                self.rate = remaining / reset_in
+                self.rate_until = now + reset_in
+            if remaining < 1 and reset_in is not None:
+                # Nothing left to spread (a zero rate would refuse every wait): hold until the reset
+                self.blocked_until = max(self.blocked_until, now + reset_in)
+
+        if retry_after is not None and response.status_code in (403, 429, 503):
+            self.blocked_until = max(self.blocked_until, now + retry_after)
+
+class BucketStore:
+    """
+    SQLite file holding the token bucket state of every upstream, so several worker processes
+    pace against one quota. Each reservation is a single short BEGIN IMMEDIATE transaction:
+    read the row, apply the same arithmetic as a local bucket, write it back. time.monotonic()
+    is CLOCK_MONOTONIC, which every process on the host shares.
+    """
+
+    FIELDS = ("tokens", "updated", "rate", "rate_until", "blocked_until")
+
+    def __init__(self, path):
+        self.path = path
+        # asyncio.to_thread uses a pool; each of its threads keeps its own connection
+        self.local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = self.local.conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_buckets (source TEXT PRIMARY KEY, tokens REAL, updated REAL,"
+                " rate REAL, rate_until REAL, blocked_until REAL)"
+            )
+        return conn
+
+    def _load(self, conn, source, bucket):
+        row = conn.execute(f"SELECT {', '.join(self.FIELDS)} FROM rate_buckets WHERE source = ?", (source,)).fetchone()
+        # A row from before a reboot (the monotonic clock restarted) is meaningless: start fresh
+        if row is None or row[1] > time.monotonic():
+            return
+        for field, value in zip(self.FIELDS, row):
+            setattr(bucket, field, value)
+        if not bucket.rate_until:
+            # No upstream-imposed pace in force: use this process's configured rate, not a stored one
+            bucket.rate = bucket.default_rate
+
+    def update(self, source, bucket, apply):
+        """Loads the shared state into 'bucket', runs apply(), stores the result; all under one lock."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._load(conn, source, bucket)
+            result = apply()
+            conn.execute(
+                f"INSERT OR REPLACE INTO rate_buckets (source, {', '.join(self.FIELDS)}) VALUES (?, ?, ?, ?, ?, ?)",
+                (source, *(getattr(bucket, field) for field in self.FIELDS))
+            )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return result
+
+    def refresh(self, source, bucket):
+        self._load(self._conn(), source, bucket)
+
+class SharedTokenBucket(TokenBucket):
+    """A TokenBucket whose state lives in a BucketStore; this object only caches the last read."""
+
+    def __init__(self, source, rpm, burst, store):
+        super().__init__(rpm, burst)
+        self.source = source
+        self.store = store
+
+    async def _reserve_async(self, deadline):
+        return await asyncio.to_thread(self.store.update, self.source, self, lambda: self._reserve(deadline))
+
+    async def _refresh(self):
+        await asyncio.to_thread(self.store.refresh, self.source, self)
+
+    async def feedback(self, response: httpx.Response):
+        headers = response.headers
+        # Most answers carry nothing that moves the bucket; skip the write for those
+        if "x-ratelimit-remaining" in headers or "retry-after" in headers:
+            await asyncio.to_thread(self.store.update, self.source, self, lambda: self.observe(response))
+
+class RateGovernor:
+    """One token bucket per upstream, shared by every scan in the process (or host, with a BucketStore)."""
+
+    def __init__(self, db_path=RATE_LIMIT_DB_PATH):
+        self.buckets = {}
+        self.store = BucketStore(db_path) if db_path else None
+        self.throttled = 0
+        self.retries = 0
+
+    def bucket(self, source):
+        bucket = self.buckets.get(source)
+        if bucket is None:
+            config = UPSTREAMS[source]
+            if self.store is not None:
+                bucket = SharedTokenBucket(source, config["rpm"], config["burst"], self.store)
+            else:
+                bucket = TokenBucket(config["rpm"], config["burst"])
+            self.buckets[source] = bucket
+        return bucket
+
+    async def acquire(self, source, max_wait=None):
+        """Waits for a send slot on an upstream (used directly for streamed requests)."""
+        max_wait = UPSTREAMS[source]["max_wait"] if max_wait is None else max_wait
+        await self.bucket(source).acquire(time.monotonic() + max_wait)
+
+    async def get(self, client: httpx.AsyncClient, url: str, source: str, max_wait=None, **kwargs) -> httpx.Response:
+        """
+        client.get() behind the governor: paces the request, and on 429/503 (or a 403 that
+        carries rate-limit headers) retries with jittered backoff until max_wait runs out.
+        The last response is returned either way so the scrapers keep their own status handling.
+        Requests are sent conditionally when we hold an ETag / Last-Modified for the URL.
+        """
+        max_wait = UPSTREAMS[source]["max_wait"] if max_wait is None else max_wait
+        deadline = time.monotonic() + max_wait
+        bucket = self.bucket(source)
+        attempt = 0
+        kwargs["headers"], validated = await revalidator.prepare(source, url, kwargs.get("headers"))
+
+        response = None
+        while True:
+            try:
+                await bucket.acquire(deadline)
+            except RateLimitExceeded:
+                if response is None:
+                    raise
+                # Out of time mid-retry: hand back the last rate-limited answer
+                return response
+            response = await client.get(url, **kwargs)
+            await bucket.feedback(response)
+            record_upstream(source, response)
+
+            remaining = _parse_remaining(response.headers.get("x-ratelimit-remaining"))
+            limited = response.status_code in RETRY_STATUSES or (
+                response.status_code == 403 and (
+                    response.headers.get("retry-after") or (remaining is not None and remaining < 1)
+                )
+            )
+            if not limited:
+                # A 304 comes back as the stored 200
+                return await revalidator.complete(source, url, response, validated)
+
+            self.throttled += 1
+            # Full jitter; the bucket additionally holds us until Retry-After / the window reset
+            delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+            if time.monotonic() + delay >= deadline:
+                logger.warning(f"⚠️ {source} still rate limited after {attempt + 1} attempts, giving up.")
+                return response
+            attempt += 1
+            self.retries += 1
+            await asyncio.sleep(delay)
+
+    def stats(self):
+        return {
+            "throttled": self.throttled,
+            "retries": self.retries,
+            "shared": self.store is not None,
+            **revalidator.stats(),
+            "buckets": {
+                source: {"rate_per_sec": round(b.rate, 3), "tokens": round(b.tokens, 2)}
+                for source, b in self.buckets.items()
+            },
+        }
+
+governor = RateGovernor()
@@ -0,0 +1,153 @@
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from contextlib import aclosing
+
+from backend.app.scrapers.cache import LRUCache
+from backend.app.scrapers.http_client import UpstreamError, get_client
+from backend.app.scrapers.rate_limit import governor
+from backend.app.scrapers.singleflight import inflight
+from backend.app.services.enrichment import enricher
+from backend.app.services.metrics import metrics, record_upstream, RAW_BLOBS
+
+logger = logging.getLogger(__name__)
+
+# ==========================================
+# CONFIGURATION (override via .env)
+# ==========================================
+# Bytes read from any one paste / file body; the rest is never downloaded
+RAW_MAX_BYTES = int(os.getenv("RAW_MAX_BYTES", 1 << 20))
+# Bodies downloading at once across every scan in this process (memory is bounded by this x RAW_MAX_BYTES)
+RAW_CONCURRENCY = int(os.getenv("RAW_CONCURRENCY", 8))
+# Findings per content hash; content-addressed, so they only expire to bound memory
+RAW_DIGEST_CACHE_ENTRIES = int(os.getenv("RAW_DIGEST_CACHE_ENTRIES", 5000))
+RAW_DIGEST_TTL = int(os.getenv("RAW_DIGEST_TTL", 24 * 3600))
+
+class RawContentScanner:
+    """
+    Fetches leaked bodies (paste dumps, matched source files) and streams them through the PII detector.
+    Identical content is scanned once: a body whose hash is known up front (a GitHub blob SHA, shared
+    by every fork) is not even downloaded again, and any other body is hashed before it is scanned,
+    so a repost under a new URL reuses the first scan's findings.
+    """
+
+    def __init__(self, max_bytes=RAW_MAX_BYTES, concurrency=RAW_CONCURRENCY, cache_entries=RAW_DIGEST_CACHE_ENTRIES):
+        self.max_bytes = max_bytes
+        self.concurrency = concurrency
+        self.findings = LRUCache(cache_entries)
+        self._slots = {}
+
+    def _slots_for_loop(self):
+        # One semaphore per event loop: scripts and benchmarks call asyncio.run() more than once
+        loop = asyncio.get_running_loop()
+        slots = self._slots.get(loop)
+        if slots is None:
+            self._slots.clear()
+            slots = self._slots[loop] = asyncio.Semaphore(self.concurrency)
+        return slots
+
+    def _cached(self, digest):
+        findings = self.findings.get(digest)
+        if findings is not None:
+            metrics.inc(RAW_BLOBS, outcome="deduplicated")
+        return findings
+
+    async def _body(self, url: str):
+        """Up to max_bytes of the body, chunk by chunk as it downloads. Raises UpstreamError if the fetch failed."""
+        size = 0
+        async with self._slots_for_loop():
+            await governor.acquire("raw")
+            async with get_client("raw").stream("GET", url) as response:
+                if response.status_code != 200:
+                    raise UpstreamError(f"raw content answered {response.status_code}")
+                async for chunk in response.aiter_bytes():
+                    chunk = chunk[:self.max_bytes - size]
+                    size += len(chunk)
+                    yield chunk
+                    if size >= self.max_bytes:
+                        # Leaving the block closes the connection; the rest of the body is never read
+                        metrics.inc(RAW_BLOBS, outcome="truncated")
+                        logger.debug(f"Raw content of {url} cut at {self.max_bytes} bytes")
+                        break
+                record_upstream("raw", response)
+
+    async def _fetch_and_scan(self, url: str, digest: str = None):
+        """
+        Hashes and scans the body as it downloads, one batch of chunks at a time, so no more than a
+        batch is ever held. A body that fits in one batch is hashed before it is scanned, so a repost
+        of it reuses the first scan; a bigger one is already scanned by the time its hash is known.
+        """
+        hasher = hashlib.sha256() if digest is None else None
+        findings, state, batch, size = [], None, [], 0
+        try:
+            async with aclosing(self._body(url)) as body:
+                async for chunk in body:
+                    if hasher is not None:
+                        hasher.update(chunk)
+                    batch.append(chunk)
+                    size += len(chunk)
+                    if size >= enricher.inline_threshold:
+                        found, state = await enricher.detect_chunks(batch, state)
+                        findings.extend(found)
+                        batch, size = [], 0
+        except UpstreamError as e:
+            logger.warning(f"Raw content fetch failed ({e}) for {url}")
+            metrics.inc(RAW_BLOBS, outcome="failed")
+            return digest, ()
+        except Exception as e:
+            logger.error(f"Raw content scan failed for {url}: {e}")
+            metrics.inc(RAW_BLOBS, outcome="failed")
+            return digest, ()
+
+        if hasher is not None:
+            digest = f"sha256:{hasher.hexdigest()}"
+            if state is None:
+                cached = self._cached(digest)
+                if cached is not None:
+                    return digest, cached
+
+        found, _ = await enricher.detect_chunks(batch, state, final=True)
+        # Cached for up to RAW_DIGEST_TTL: only the matched strings may stay alive, never the body
+        findings = tuple(finding.detached() for finding in findings + found)
+        metrics.inc(RAW_BLOBS, outcome="scanned")
+        self.findings.set(digest, findings, time.time() + RAW_DIGEST_TTL)
+        return digest, findings
+
+    async def scan(self, url: str, digest: str = None):
+        """
+        (content digest, findings) for one body. 'digest' is the content hash when the upstream
+        already told us (e.g. "git:<blob sha>"). Concurrent scans of the same URL, or of the same
+        known digest, share one download.
+        """
+        if digest is not None:
+            findings = self._cached(digest)
+            if findings is not None:
+                return digest, findings
+        return await inflight.do(f"raw:{digest or url}", lambda: self._fetch_and_scan(url, digest))
+
+    async def scan_all(self, raw_urls: list, digests: dict = None) -> list:
+        """
+        Scans every body of one exposure concurrently and merges their findings,
+        counting identical bodies (a paste and its repost, a file and its fork) once.
+        """
+        digests = digests or {}
+        results = await asyncio.gather(*(self.scan(url, digests.get(url)) for url in raw_urls))
+        findings, seen = [], set()
+        for digest, body_findings in results:
+            if digest is not None:
+                if digest in seen:
+                    continue
+                seen.add(digest)
+            findings.extend(body_findings)
+        return findings
+
+    def stats(self):
+        return {
+            "max_bytes": self.max_bytes,
+            "digests": len(self.findings.entries),
+            "evictions": self.findings.evictions,
+        }
+
+raw_scanner = RawContentScanner()
@@ -0,0 +1,54 @@
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+class _Call:
+    __slots__ = ("task", "waiters", "abandoned")
+
+    def __init__(self, task):
+        self.task = task
+        self.waiters = 0
+        self.abandoned = False
+
+class SingleFlight:
+    """
+    In-flight request coalescing: concurrent callers with the same key share ONE upstream call.
+
+    The shared call runs as its own task, so a caller that is cancelled (client disconnect)
+    does not cancel it for everyone else. Only when the last waiting caller goes away is the
+    upstream call cancelled; anyone arriving after that starts a fresh one.
+    """
+
+    def __init__(self):
+        self.calls = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def do(self, key, factory):
+        call = self.calls.get(key)
+        if call is None or call.abandoned:
+            call = self.calls[key] = _Call(asyncio.ensure_future(factory()))
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+            self.started += 1
+        else:
+            self.coalesced += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Last interested caller went away: stop the upstream request
+                call.abandoned = True
+                call.task.cancel()
+
+    def _forget(self, key, call):
+        if self.calls.get(key) is call:
+            del self.calls[key]
+
+    def stats(self):
+        return {"started": self.started, "coalesced": self.coalesced, "in_flight": len(self.calls)}
+
+inflight = SingleFlight()
@@ -0,0 +1,301 @@
+# backend/app/services/breach_index.py
+"""
+Offline breach corpus: an on-disk index over licensed breach dumps, queried without the network.
+
+Every identifier (email or username, lower-cased) is hashed to 64 bits and stored as a fixed-size
+(hash, breach id) record; the records are sorted, so a lookup is a binary search. Everything is
+memory-mapped: the process holds no index data of its own, and every worker on the host shares
+the same pages through the OS cache.
+
+    <index dir>/meta.json     record count, prefix bits, bloom parameters, breach names
+    <index dir>/prefix.bin    (2^bits + 1) uint64: first record of each hash prefix
+    <index dir>/records.bin   sorted '<QI' records (hash, breach id)
+    <index dir>/bloom.bin     bloom filter over the hashes, consulted first so most misses
+                              never touch records.bin (it is ~10x smaller, so it stays hot)
+
+Building one (the dumps are streamed; memory is bounded by one hash partition):
+
+    python backend/app/services/breach_index.py build --out data/breach_index \\
+        dumps/linkedin_2012.txt=LinkedIn dumps/canva_2019.csv=Canva
+
+Each dump line holds an identifier in its first field (':', ';', ',', tab or space separated).
+A 64-bit hash means two distinct identifiers collide with odds of about N / 2^64 per lookup.
+"""
+import argparse
+import hashlib
+import json
+import logging
+import math
+import mmap
+import os
+import re
+import shutil
+import struct
+import time
+
+try:
+    import numpy as np
+except ImportError:  # Ingest falls back to plain Python sorting (fine up to a few million records)
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# ==========================================
+# CONFIGURATION (override via .env)
+# ==========================================
+# Target false-positive rate of the bloom filter (share of misses that still reach records.bin)
+BREACH_BLOOM_FP = float(os.getenv("BREACH_BLOOM_FP", 0.01))
+
+RECORD = struct.Struct("<QI")
+OFFSET = struct.Struct("<Q")
+PARTITION_BITS = 8
+_FIELD_SEPARATORS = re.compile(r"[:;,\t ]")
+
+def normalize(identifier: str) -> str:
+    return identifier.strip().lower()
+
+def key_hash(identifier: str) -> int:
+    """64-bit hash of a normalized identifier; the index is sorted on it."""
+    return int.from_bytes(hashlib.blake2b(identifier.encode("utf-8", "surrogatepass"), digest_size=8).digest(), "big")
+
+def bloom_positions(h: int, bits: int, hashes: int):
+    """Double hashing: the k bit positions of a key, derived from its 64-bit hash."""
+    h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+    return [(h1 + i * h2) % bits for i in range(hashes)]
+
+class BreachIndex:
+    """Read side: memory-mapped, constant memory, one lookup in a few microseconds."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as f:
+            self.meta = json.load(f)
+        self.count = self.meta["records"]
+        self.prefix_bits = self.meta["prefix_bits"]
+        self.shift = 64 - self.prefix_bits
+        self.bloom_bits = self.meta["bloom"]["bits"]
+        self.bloom_hashes = self.meta["bloom"]["hashes"]
+        self.breaches = [breach["name"] for breach in self.meta["breaches"]]
+        self._files, self._maps = [], []
+        self.prefix = self._map("prefix.bin")
+        self.records = self._map("records.bin")
+        self.bloom = self._map("bloom.bin")
+        self.bloom_rejects = 0
+        self.lookups = 0
+
+    def _map(self, name):
+        file = open(os.path.join(self.path, name), "rb")
+        self._files.append(file)
+        if os.fstat(file.fileno()).st_size == 0:
+            return b""
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        return mapped
+
+    def might_contain(self, h: int) -> bool:
+        # bloom_positions() inlined: this runs for every lookup
+        bloom, bits = self.bloom, self.bloom_bits
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        for i in range(self.bloom_hashes):
+            position = (h1 + i * h2) % bits
+            if not bloom[position >> 3] >> (position & 7) & 1:
+                return False
+        return True
+
+    def lookup_hash(self, h: int, use_bloom: bool = True) -> list:
+        """Breach ids holding this hash, in id order."""
+        self.lookups += 1
+        if use_bloom and not self.might_contain(h):
+            self.bloom_rejects += 1
+            return []
+        prefix = h >> self.shift
+        lo = OFFSET.unpack_from(self.prefix, prefix * 8)[0]
+        hi = OFFSET.unpack_from(self.prefix, prefix * 8 + 8)[0]
+        records, unpack = self.records, RECORD.unpack_from
+        # Leftmost record >= h within this prefix's slice
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if unpack(records, mid * RECORD.size)[0] < h:
+                lo = mid + 1
+            else:
+                hi = mid
+        found = []
+        while lo < self.count:
+            record_hash, breach = unpack(records, lo * RECORD.size)
+            if record_hash != h:
+                break
+            found.append(breach)
+            lo += 1
+        return found
+
+    def lookup(self, identifier: str, use_bloom: bool = True) -> list:
+        """Names of the breaches an identifier appears in (empty if none)."""
+        return [self.breaches[b] for b in self.lookup_hash(key_hash(normalize(identifier)), use_bloom)]
+
+    def stats(self):
+        return {
+            "records": self.count,
+            "breaches": len(self.breaches),
+            "lookups": self.lookups,
+            "bloom_rejects": self.bloom_rejects,
+        }
+
+    def close(self):
+        for mapped in self._maps:
+            mapped.close()
+        for file in self._files:
+            file.close()
+
+# ==========================================
+# INGEST (offline tool)
+# ==========================================
+def _identifiers(path):
+    """First field of every line, normalized; blank and over-long lines are skipped."""
+    with open(path, "r", encoding="utf-8", errors="replace") as file:
+        for line in file:
+            identifier = _FIELD_SEPARATORS.split(line.strip(), 1)[0].lower()
+            if identifier and len(identifier) <= 320:
+                yield identifier
+
+def _partition(inputs, workdir):
+    """
+    Pass 1: hash every identifier and append its record to one of 256 partition files, chosen by
+    the top 8 bits of the hash. Partitions are disjoint, ordered hash ranges, so sorting each one
+    on its own and concatenating them gives the sorted whole.
+    """
+    shift = 64 - PARTITION_BITS
+    files = [open(os.path.join(workdir, f"part-{i:03d}.bin"), "wb", buffering=1 << 16) for i in range(1 << PARTITION_BITS)]
+    breaches, total = [], 0
+    try:
+        for breach_id, (path, name) in enumerate(inputs):
+            count = 0
+            pack = RECORD.pack
+            for identifier in _identifiers(path):
+                h = key_hash(identifier)
+                files[h >> shift].write(pack(h, breach_id))
+                count += 1
+            breaches.append({"name": name, "source": os.path.basename(path), "records": count})
+            total += count
+            logger.info(f"Hashed {count:,} identifiers from {path} ({name})")
+    finally:
+        for file in files:
+            file.close()
+    return breaches, total
+
+def _sorted_partition(path):
+    """Sorted, de-duplicated (hash, breach id) records of one partition, as bytes plus the hashes."""
+    with open(path, "rb") as file:
+        data = file.read()
+    if np is not None:
+        records = np.unique(np.frombuffer(data, dtype=[("h", "<u8"), ("b", "<u4")]))
+        return records.tobytes(), records["h"]
+    records = sorted(set(RECORD.iter_unpack(data)))
+    return b"".join(RECORD.pack(h, b) for h, b in records), [h for h, _ in records]
+
+def _set_bloom_bits(bloom, hashes_of_partition, bits, k):
+    if np is not None:
+        h = np.asarray(hashes_of_partition, dtype=np.uint64)
+        h1, h2 = h & np.uint64(0xFFFFFFFF), (h >> np.uint64(32)) | np.uint64(1)
+        view = np.frombuffer(bloom, dtype=np.uint8)
+        for i in range(k):
+            positions = (h1 + np.uint64(i) * h2) % np.uint64(bits)
+            np.bitwise_or.at(view, (positions >> np.uint64(3)).astype(np.intp),
+                             (np.uint8(1) << (positions & np.uint64(7)).astype(np.uint8)))
+        return
+    for h in hashes_of_partition:
+        for position in bloom_positions(h, bits, k):
+            bloom[position >> 3] |= 1 << (position & 7)
+
+def build_index(inputs, out, prefix_bits=None, bloom_fp=BREACH_BLOOM_FP):
+    """
+    Builds an index directory from [(dump path, breach name), ...]. Files are written next to
+    the target and swapped in last, so a running server only ever sees a complete index.
+    """
+    started = time.perf_counter()
+    work = out.rstrip("/") + ".building"
+    shutil.rmtree(work, ignore_errors=True)
+    os.makedirs(work)
+    breaches, total = _partition(inputs, work)
+
+    # Roughly 64 records per prefix bucket, so the binary search is a handful of steps
+    if prefix_bits is None:
+        prefix_bits = min(max(PARTITION_BITS, round(math.log2(max(total, 1))) - 6), 24)
+    bloom_bits = max(64, math.ceil(-max(total, 1) * math.log(bloom_fp) / math.log(2) ** 2))
+    bloom_hashes = max(1, round(bloom_bits / max(total, 1) * math.log(2)))
+    bloom = bytearray((bloom_bits + 7) // 8)
+    counts = [0] * ((1 << prefix_bits) + 1)
+    shift = 64 - prefix_bits
+
+    # Pass 2: sort each partition, append it to records.bin, count prefixes, fill the bloom filter
+    written = 0
+    with open(os.path.join(work, "records.bin"), "wb") as records:
+        for i in range(1 << PARTITION_BITS):
+            part = os.path.join(work, f"part-{i:03d}.bin")
+            data, hashes = _sorted_partition(part)
+            os.remove(part)
+            records.write(data)
+            written += len(hashes)
+            if np is not None:
+                for prefix, n in zip(*np.unique(hashes >> np.uint64(shift), return_counts=True)):
+                    counts[int(prefix) + 1] += int(n)
+            else:
+                for h in hashes:
+                    counts[(h >> shift) + 1] += 1
+            _set_bloom_bits(bloom, hashes, bloom_bits, bloom_hashes)
+
+    offset = 0
+    with open(os.path.join(work, "prefix.bin"), "wb") as prefix:
+        for n in counts:
+            offset += n
+            prefix.write(OFFSET.pack(offset))
+    with open(os.path.join(work, "bloom.bin"), "wb") as f:
+        f.write(bloom)
+    meta = {
+        "version": 1,
+        "records": written,
+        "prefix_bits": prefix_bits,
+        "bloom": {"bits": bloom_bits, "hashes": bloom_hashes, "fp_rate": bloom_fp},
+        "breaches": breaches,
+        "built_at": time.time(),
+    }
+    with open(os.path.join(work, "meta.json"), "w") as f:
+        json.dump(meta, f, indent=2)
+
+    os.makedirs(out, exist_ok=True)
+    for name in ("prefix.bin", "records.bin", "bloom.bin", "meta.json"):
+        os.replace(os.path.join(work, name), os.path.join(out, name))
+    shutil.rmtree(work, ignore_errors=True)
+    logger.info(f"Indexed {written:,} records ({total - written:,} duplicates dropped) "
+                f"from {len(breaches)} breaches in {time.perf_counter() - started:.1f}s")
+    return meta
+
+def _parse_input(spec):
+    """'dumps/canva_2019.csv=Canva' -> (path, "Canva"); the breach name defaults to the file name."""
+    path, _, name = spec.partition("=")
+    return path, name or os.path.splitext(os.path.basename(path))[0]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline breach corpus index")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="Index breach dumps")
+    build.add_argument("--out", required=True, help="Index directory (LOCAL_BREACH_INDEX)")
+    build.add_argument("--prefix-bits", type=int, default=None)
+    build.add_argument("--bloom-fp", type=float, default=BREACH_BLOOM_FP)
+    build.add_argument("inputs", nargs="+", help="Dump files, optionally as path=BreachName")
+    query = commands.add_parser("query", help="Look identifiers up")
+    query.add_argument("--index", required=True)
+    query.add_argument("identifiers", nargs="+")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        meta = build_index([_parse_input(spec) for spec in args.inputs], args.out, args.prefix_bits, args.bloom_fp)
+        print(json.dumps({k: meta[k] for k in ("records", "prefix_bits", "bloom")}))
+        return
+    index = BreachIndex(args.index)
+    for identifier in args.identifiers:
+        print(identifier, index.lookup(identifier))
+    index.close()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,168 @@
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from ai.pii_detector import detector
+from compliance.dpdp_checker import checker
+from backend.app.services.metrics import metrics, STAGE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# ==========================================
+# CONFIGURATION (override via .env)
+# ==========================================
+# Texts shorter than this (in characters) are enriched inline -- a pool round-trip would cost more than the regex
+ENRICH_INLINE_THRESHOLD = int(os.getenv("ENRICH_INLINE_THRESHOLD", 64 * 1024))
+# 0 disables the process pool entirely (everything runs inline)
+ENRICH_POOL_WORKERS = int(os.getenv("ENRICH_POOL_WORKERS", os.cpu_count() or 2))
+# Large texts arriving within this window (from any request) are shipped to the pool together
+ENRICH_BATCH_WINDOW_MS = float(os.getenv("ENRICH_BATCH_WINDOW_MS", 5))
+ENRICH_MAX_BATCH = int(os.getenv("ENRICH_MAX_BATCH", 32))
+
+def _timed_enrich(text: str, extra_findings=()):
+    """enrich_text() plus how long the detector and the DPDP checker took, in seconds."""
+    started = time.perf_counter()
+    findings = detector.scan_text(text)
+    detected = time.perf_counter()
+    findings.extend(extra_findings)
+    violations = checker.analyze_findings(findings) if findings else []
+    return findings, violations, (detected - started, time.perf_counter() - detected)
+
+def _record_stages(timings):
+    detector_seconds, checker_seconds = timings
+    metrics.observe(STAGE_SECONDS, detector_seconds, stage="detector")
+    metrics.observe(STAGE_SECONDS, checker_seconds, stage="dpdp_checker")
+
+def enrich_text(text: str, extra_findings=()):
+    """
+    The CPU-bound part of a scan: PII detection plus DPDP mapping for one exposure.
+    Returns (findings, violations).
+    """
+    findings, violations, timings = _timed_enrich(text, extra_findings)
+    _record_stages(timings)
+    return findings, violations
+
+def _enrich_batch(jobs):
+    """
+    Runs inside a worker process: one pickle round-trip for a whole batch of exposures.
+    Stage timings travel back with the results, since the worker's own metrics are never scraped.
+    """
+    return [_timed_enrich(text, extra) for text, extra in jobs]
+
+def _timed_scan_chunks(chunks, state, final):
+    """
+    detector.scan_chunks() plus how long it took: one batch of a raw body's chunks, inline or in a
+    worker process. Only the scanner's overlap tail travels between batches, never the body.
+    """
+    started = time.perf_counter()
+    findings, state = detector.scan_chunks(chunks, state, final)
+    return findings, state, time.perf_counter() - started
+
+class EnrichmentExecutor:
+    """
+    Keeps regex work off the event loop.
+    Small inputs run inline; large ones are micro-batched across concurrent requests
+    and sent to a process pool so they scale across cores.
+    """
+
+    def __init__(self, inline_threshold=ENRICH_INLINE_THRESHOLD, max_workers=ENRICH_POOL_WORKERS,
+                 batch_window_ms=ENRICH_BATCH_WINDOW_MS, max_batch=ENRICH_MAX_BATCH):
+        self.inline_threshold = inline_threshold
+        self.max_workers = max_workers
+        self.batch_window = batch_window_ms / 1000
+        self.max_batch = max_batch
+        self._pool = None
+        self._pending = []
+        self._flush_handle = None
+
+    async def enrich(self, text: str, extra_findings=()):
+        text = text or ""
+        if self.max_workers <= 0 or len(text) < self.inline_threshold:
+            return enrich_text(text, extra_findings)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, list(extra_findings), future))
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+        return await future
+
+    async def detect_chunks(self, chunks, state=None, final=False):
+        """
+        Detector-only pass over the next batch of a streamed body (a paste dump, a leaked file):
+        (findings, state), the state being what the following batch resumes from.
+        Batches below the inline threshold run inline, bigger ones in the process pool.
+        """
+        if self.max_workers <= 0 or sum(map(len, chunks)) < self.inline_threshold:
+            findings, state, seconds = _timed_scan_chunks(chunks, state, final)
+        else:
+            self._ensure_pool()
+            loop = asyncio.get_running_loop()
+            findings, state, seconds = await loop.run_in_executor(self._pool, _timed_scan_chunks, chunks, state, final)
+        metrics.observe(STAGE_SECONDS, seconds, stage="detector")
+        return findings, state
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        self._ensure_pool()
+
+        # One pool task per worker (not per exposure), so a burst is spread across every core
+        # while paying a single pickle round-trip per slice
+        loop = asyncio.get_running_loop()
+        slices = min(self.max_workers, len(batch))
+        for i in range(slices):
+            part = batch[i::slices]
+            jobs = [(text, extra) for text, extra, _ in part]
+            pool_future = loop.run_in_executor(self._pool, _enrich_batch, jobs)
+            pool_future.add_done_callback(self._deliver(part))
+
+    def _ensure_pool(self):
+        if self._pool is None:
+            logger.info(f"Starting enrichment process pool ({self.max_workers} workers)")
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+
+    def prestart(self, sample=""):
+        """
+        Starts every pool worker now and has each enrich 'sample' once, so the first large text
+        does not wait for processes to start. Blocking: meant for the startup lifespan.
+        """
+        if self.max_workers <= 0:
+            return
+        self._ensure_pool()
+        # The pool starts workers on demand, one per submission it cannot hand to an idle one
+        warmups = [self._pool.submit(_enrich_batch, [(sample, [])]) for _ in range(self.max_workers)]
+        for warmup in warmups:
+            warmup.result()
+
+    @staticmethod
+    def _deliver(part):
+        def deliver(done):
+            error = RuntimeError("Enrichment pool shut down") if done.cancelled() else done.exception()
+            for i, (_, _, future) in enumerate(part):
+                # The waiting request may have been cancelled (client disconnect)
+                if future.done():
+                    continue
+                if error:
+                    future.set_exception(error)
+                else:
+                    findings, violations, timings = done.result()[i]
+                    _record_stages(timings)
+                    future.set_result((findings, violations))
+        return deliver
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+enricher = EnrichmentExecutor()
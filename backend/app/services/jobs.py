@@ -0,0 +1,234 @@
+import asyncio
+import itertools
+import logging
+import os
+import time
+import uuid
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# ==========================================
+# CONFIGURATION (override via .env)
+# ==========================================
+# Async workers draining the queue (each runs one scan at a time)
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", 8))
+# Queued (not yet running) jobs beyond this are refused -- callers get a 503 with Retry-After
+JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", 1000))
+# Finished jobs stay pollable this long, and at most this many are kept
+JOB_RETENTION = int(os.getenv("JOB_RETENTION", 3600))
+JOB_MAX_FINISHED = int(os.getenv("JOB_MAX_FINISHED", 10000))
+
+PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+FINAL_STATES = ("done", "failed", "cancelled")
+
+class QueueFull(Exception):
+    """Raised by submit() when the queue is at JOB_QUEUE_SIZE."""
+
+    def __init__(self, retry_after):
+        super().__init__(f"job queue is full, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+class Job:
+    __slots__ = ("id", "kind", "meta", "priority", "factory", "status", "result", "error",
+                 "created_at", "started_at", "finished_at", "task", "changed")
+
+    def __init__(self, kind, meta, priority, factory):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.meta = meta
+        self.priority = priority
+        self.factory = factory
+        self.status = "queued"
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.task = None
+        # Set (and replaced) on every status change so watchers wake up
+        self.changed = asyncio.Event()
+
+    def _set_status(self, status):
+        self.status = status
+        if status == "running":
+            self.started_at = time.time()
+        elif status in FINAL_STATES:
+            self.finished_at = time.time()
+            self.factory = None
+        changed, self.changed = self.changed, asyncio.Event()
+        changed.set()
+
+    def snapshot(self, with_result=True):
+        data = {
+            "job_id": self.id,
+            "kind": self.kind,
+            **self.meta,
+            "status": self.status,
+            "priority": next(name for name, rank in PRIORITIES.items() if rank == self.priority),
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+        if self.error:
+            data["error"] = self.error
+        if with_result and self.status == "done":
+            data["result"] = self.result
+        return data
+
+class JobQueue:
+    """
+    In-process job queue: callers submit a coroutine factory and get a job ID straight away,
+    a fixed pool of async workers runs jobs in priority order (FIFO within a priority).
+    The queue is bounded so bursts are pushed back to the caller instead of piling up.
+    """
+
+    def __init__(self, workers=JOB_WORKERS, max_queued=JOB_QUEUE_SIZE):
+        self.worker_count = workers
+        self.max_queued = max_queued
+        self.jobs = {}
+        # Finished job IDs, oldest first, for retention
+        self.finished = deque()
+        self.queue = None
+        self.workers = []
+        self.sequence = itertools.count()
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.total_runtime = 0.0
+
+    async def start(self):
+        if not self.workers:
+            self.queue = asyncio.PriorityQueue()
+            self.workers = [asyncio.create_task(self._worker()) for _ in range(self.worker_count)]
+
+    def _ensure_started(self):
+        # Used outside the app lifespan (scripts, ASGI test clients): start on the running loop
+        if not self.workers:
+            self.queue = asyncio.PriorityQueue()
+            loop = asyncio.get_running_loop()
+            self.workers = [loop.create_task(self._worker()) for _ in range(self.worker_count)]
+
+    def ensure_capacity(self, count=1):
+        """Raises QueueFull unless 'count' more jobs fit in the queue."""
+        if self.queued + count > self.max_queued:
+            self.rejected += count
+            raise QueueFull(self.retry_after())
+
+    def retry_after(self):
+        """Rough seconds until a queue slot frees up, from the average job runtime."""
+        average = self.total_runtime / self.completed if self.completed else 5.0
+        return max(1, int(average * (self.queued + 1) / max(self.worker_count, 1)))
+
+    def submit(self, kind, factory, priority="normal", **meta):
+        """Queues factory() (a coroutine function) and returns the Job without waiting."""
+        self._ensure_started()
+        self.ensure_capacity()
+        self._prune()
+
+        job = Job(kind, meta, PRIORITIES[priority], factory)
+        self.jobs[job.id] = job
+        self.queued += 1
+        self.queue.put_nowait((job.priority, next(self.sequence), job.id))
+        return job
+
+    def get(self, job_id):
+        return self.jobs.get(job_id)
+
+    def cancel(self, job_id):
+        job = self.jobs.get(job_id)
+        if job is None or job.status in FINAL_STATES:
+            return job
+        if job.status == "queued":
+            # Still in the heap; the worker that pops it will skip it
+            self.queued -= 1
+            self._finish(job, "cancelled")
+        elif job.task:
+            job.task.cancel()
+        return job
+
+    async def watch(self, job):
+        """Yields a snapshot now and after every status change, until the job is finished."""
+        while True:
+            changed = job.changed
+            yield job.snapshot()
+            if job.status in FINAL_STATES:
+                return
+            await changed.wait()
+
+    async def _worker(self):
+        while True:
+            _, _, job_id = await self.queue.get()
+            job = self.jobs.get(job_id)
+            if job is None or job.status != "queued":
+                # Cancelled while it was waiting
+                continue
+            self.queued -= 1
+            self.running += 1
+            job._set_status("running")
+            started = time.perf_counter()
+            # The job is its own task, so cancelling it does not take the worker down with it
+            job.task = asyncio.ensure_future(job.factory())
+            try:
+                await asyncio.wait({job.task})
+            except asyncio.CancelledError:
+                # Shutting down
+                job.task.cancel()
+                self._finish(job, "cancelled")
+                raise
+            finally:
+                self.running -= 1
+
+            if job.task.cancelled():
+                self._finish(job, "cancelled")
+            elif job.task.exception() is not None:
+                logger.error(f"Job {job.id} ({job.kind}) failed: {job.task.exception()}")
+                self.failed += 1
+                job.error = str(job.task.exception())
+                self._finish(job, "failed")
+            else:
+                job.result = job.task.result()
+                self.completed += 1
+                self.total_runtime += time.perf_counter() - started
+                self._finish(job, "done")
+            job.task = None
+
+    def _finish(self, job, status):
+        job._set_status(status)
+        self.finished.append(job.id)
+
+    def _prune(self):
+        """Drops finished jobs past their retention, oldest first."""
+        cutoff = time.time() - JOB_RETENTION
+        while self.finished:
+            job = self.jobs.get(self.finished[0])
+            if job is not None and job.finished_at >= cutoff and len(self.finished) <= JOB_MAX_FINISHED:
+                break
+            self.jobs.pop(self.finished.popleft(), None)
+
+    def stats(self):
+        return {
+            "workers": self.worker_count,
+            "queued": self.queued,
+            "running": self.running,
+            "max_queued": self.max_queued,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "avg_runtime_seconds": round(self.total_runtime / self.completed, 3) if self.completed else None,
+        }
+
+    async def close(self):
+        """Stops the workers; jobs still queued or running are marked cancelled."""
+        workers, self.workers = self.workers, []
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        for job in self.jobs.values():
+            if job.status not in FINAL_STATES:
+                self._finish(job, "cancelled")
+        self.queued = 0
+
+job_queue = JobQueue()
@@ -0,0 +1,294 @@
+import bisect
+import collections
+import functools
+import logging
+import os
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# ==========================================
+# CONFIGURATION (override via .env)
+# ==========================================
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+# Histogram bucket upper bounds (seconds): 0.5 ms doubling up to ~33 s, then +Inf
+LATENCY_BUCKETS = tuple(0.0005 * 2 ** i for i in range(17))
+# Opt-in sampling profiler: requests slower than this (ms) get their stack samples logged. 0 disables.
+PROFILE_SLOW_MS = float(os.getenv("PROFILE_SLOW_MS", 0))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", 5))
+# Collapsed stacks of slow requests are also appended here (flamegraph.pl / speedscope input)
+PROFILE_DIR = os.getenv("PROFILE_DIR")
+PROFILE_TOP_STACKS = 15
+
+class Histogram:
+    """Fixed-bucket latency histogram: observe() is one bisect and three additions."""
+
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th observation (what Prometheus would estimate)."""
+        if not self.count:
+            return None
+        rank, seen = q * self.count, 0
+        for bound, n in zip(LATENCY_BUCKETS, self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+class _Timer:
+    __slots__ = ("metrics", "name", "labels", "started")
+
+    def __init__(self, metrics, name, labels):
+        self.metrics, self.name, self.labels = metrics, name, labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.name, time.perf_counter() - self.started, **self.labels)
+        return False
+
+class Metrics:
+    """
+    In-process counters and latency histograms, rendered in the Prometheus text format.
+    Series are keyed by (name, sorted labels) in plain dicts: everything is recorded from the event
+    loop, so an observation is a dict lookup plus a bisect, with no lock.
+    """
+
+    def __init__(self, enabled=METRICS_ENABLED):
+        self.enabled = enabled
+        self.histograms = {}
+        self.counters = {}
+        self.gauges = {}
+        self.help = {}
+
+    def describe(self, name, text):
+        self.help[name] = text
+
+    def observe(self, name, seconds, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram()
+        histogram.observe(seconds)
+
+    def inc(self, name, amount=1, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        self.counters[key] = self.counters.get(key, 0) + amount
+
+    def set(self, name, value, **labels):
+        """Gauge: last value wins (startup phases, pool sizes)."""
+        if not self.enabled:
+            return
+        self.gauges[(name, tuple(sorted(labels.items())))] = value
+
+    def time(self, name, **labels):
+        """with metrics.time("stage_seconds", stage="detector"): ..."""
+        return _Timer(self, name, labels)
+
+    def timed(self, name, **labels):
+        """Decorator form of time() for coroutine functions."""
+        def decorate(fn):
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                with self.time(name, **labels):
+                    return await fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def summary(self):
+        """p50/p95/p99 bucket bounds per histogram series (used by /metrics?format=json and the benchmarks)."""
+        return [
+            {
+                "name": name,
+                "labels": dict(labels),
+                "count": h.count,
+                "sum_seconds": round(h.sum, 6),
+                **{f"p{q}_seconds": h.quantile(q / 100) for q in (50, 95, 99)},
+            }
+            for (name, labels), h in sorted(self.histograms.items())
+        ]
+
+    def render(self) -> str:
+        lines = []
+        for kind, series in (("gauge", self.gauges), ("counter", self.counters), ("histogram", self.histograms)):
+            by_name = collections.defaultdict(list)
+            for (name, labels), value in series.items():
+                by_name[name].append((labels, value))
+            for name in sorted(by_name):
+                if name in self.help:
+                    lines.append(f"# HELP {name} {self.help[name]}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in sorted(by_name[name]):
+                    if kind != "histogram":
+                        lines.append(f"{name}{_labels(labels)} {value:g}")
+                        continue
+                    cumulative = 0
+                    for bound, n in zip(LATENCY_BUCKETS + (float("inf"),), value.counts):
+                        cumulative += n
+                        le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                        lines.append(f"{name}_bucket{_labels(labels + (('le', le),))} {cumulative}")
+                    lines.append(f"{name}_sum{_labels(labels)} {value.sum:.6f}")
+                    lines.append(f"{name}_count{_labels(labels)} {value.count}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        """Clears the traffic series; gauges such as the startup timings are kept."""
+        self.histograms.clear()
+        self.counters.clear()
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+# Series recorded across the app
+STAGE_SECONDS = "shadowtrace_stage_seconds"
+SOURCE_SECONDS = "shadowtrace_source_seconds"
+HTTP_REQUEST_SECONDS = "shadowtrace_http_request_seconds"
+UPSTREAM_RESPONSES = "shadowtrace_upstream_responses_total"
+UPSTREAM_BYTES = "shadowtrace_upstream_bytes_total"
+STARTUP_SECONDS = "shadowtrace_startup_seconds"
+RAW_BLOBS = "shadowtrace_raw_blobs_total"
+
+metrics = Metrics()
+metrics.describe(STAGE_SECONDS, "Time spent per scan pipeline stage.")
+metrics.describe(SOURCE_SECONDS, "Scraper call latency per source and outcome.")
+metrics.describe(HTTP_REQUEST_SECONDS, "API request latency per route, until the last body byte is sent.")
+metrics.describe(UPSTREAM_RESPONSES, "Upstream HTTP responses per source and status code.")
+metrics.describe(UPSTREAM_BYTES, "Response body bytes fetched per upstream.")
+metrics.describe(STARTUP_SECONDS, "Time this worker spent per startup phase (imports, then each warm-up step).")
+metrics.describe(RAW_BLOBS, "Raw paste / file bodies per outcome: scanned, deduplicated, truncated at the byte cap or failed.")
+
+def record_upstream(source: str, response):
+    """Status code and body size of one upstream response (call once the body has been read)."""
+    metrics.inc(UPSTREAM_RESPONSES, source=source, status=response.status_code)
+    metrics.inc(UPSTREAM_BYTES, response.num_bytes_downloaded, source=source)
+
+# ==========================================
+# SLOW-REQUEST SAMPLING PROFILER (opt-in)
+# ==========================================
+class SlowRequestProfiler:
+    """
+    A background thread samples the event loop thread's stack every PROFILE_INTERVAL_MS into a
+    short ring buffer. When a request takes longer than PROFILE_SLOW_MS, the samples taken while it
+    ran are folded into collapsed stacks and logged (and written to PROFILE_DIR). Requests share the
+    loop, so a slow request's profile also shows whatever else was hogging the loop at the time --
+    which is usually the point.
+    """
+
+    def __init__(self, slow_ms=PROFILE_SLOW_MS, interval_ms=PROFILE_INTERVAL_MS):
+        self.slow = slow_ms / 1000
+        self.interval = interval_ms / 1000
+        # Enough history for the slowest request we would care about (~60 s)
+        self.samples = collections.deque(maxlen=max(int(60 / self.interval), 1) if self.interval > 0 else 1)
+        self._thread = None
+        self._stop = threading.Event()
+        self._target = None
+        self.reports = 0
+
+    @property
+    def enabled(self):
+        return self.slow > 0 and self.interval > 0
+
+    def start(self):
+        if not self.enabled or self._thread is not None:
+            return
+        self._target = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="slow-request-profiler", daemon=True)
+        self._thread.start()
+        logger.info(f"Sampling profiler on: every {self.interval * 1000:g} ms, reporting requests over {self.slow * 1000:g} ms")
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            self.samples.append((time.perf_counter(), ";".join(reversed(stack))))
+
+    def report(self, label: str, started: float, elapsed: float):
+        """Called once a request finished; cheap no-op unless it was slow."""
+        if not self.enabled or elapsed < self.slow:
+            return
+        ended = started + elapsed
+        folded = collections.Counter(stack for at, stack in list(self.samples) if started <= at <= ended)
+        if not folded:
+            return
+        self.reports += 1
+        # Innermost three frames of each stack are usually enough to spot the culprit
+        top = "\n".join(f"  {n:5d}  {' <- '.join(reversed(stack.split(';')[-3:]))}"
+                        for stack, n in folded.most_common(PROFILE_TOP_STACKS))
+        logger.warning(f"Slow request {label}: {elapsed * 1000:.0f} ms, {sum(folded.values())} samples\n{top}")
+        if PROFILE_DIR:
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            with open(os.path.join(PROFILE_DIR, "slow_requests.folded"), "a") as out:
+                out.writelines(f"{stack} {n}\n" for stack, n in folded.items())
+
+profiler = SlowRequestProfiler()
+
+# ==========================================
+# REQUEST TIMING MIDDLEWARE
+# ==========================================
+class RequestTimingMiddleware:
+    """
+    Plain ASGI middleware, so streamed responses (NDJSON scans, ZIP letters) are timed until their
+    last chunk rather than until the headers go out. Routes are labelled by their template, never
+    by the raw path, which would carry identifiers.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_timed(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_timed)
+        finally:
+            elapsed = time.perf_counter() - started
+            # Newer Starlette records the matched route; older versions only the endpoint
+            route = getattr(scope.get("route"), "path", None) or getattr(scope.get("endpoint"), "__name__", "unmatched")
+            metrics.observe(HTTP_REQUEST_SECONDS, elapsed, method=scope["method"], route=route, status=status)
+            profiler.report(f"{scope['method']} {route}", started, elapsed)
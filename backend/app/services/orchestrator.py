@@ -0,0 +1,202 @@
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+
+from backend.app.services.metrics import metrics, SOURCE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# ==========================================
+# CONFIGURATION (override via .env)
+# ==========================================
+# Hard ceiling for a whole interactive scan; whatever hasn't answered by then is dropped
+SCAN_DEADLINE = float(os.getenv("SCAN_DEADLINE", 8.0))
+# Per-source budgets (seconds), queueing in the rate governor included
+SOURCE_BUDGETS = {
+    "github": float(os.getenv("BUDGET_GITHUB", 7.0)),
+    "hibp": float(os.getenv("BUDGET_HIBP", 5.0)),
+    "reddit": float(os.getenv("BUDGET_REDDIT", 5.0)),
+    "pastebin": float(os.getenv("BUDGET_PASTEBIN", 3.0)),
+    "local_breaches": float(os.getenv("BUDGET_LOCAL_BREACHES", 1.0)),
+}
+DEFAULT_BUDGET = 5.0
+# Sources that always get a hedged second attempt, e.g. HEDGE_SOURCES=pastebin,reddit
+HEDGE_SOURCES = {s.strip() for s in os.getenv("HEDGE_SOURCES", "").split(",") if s.strip()}
+# Any source whose recent timeout/error rate reaches this is hedged automatically (0 disables)
+HEDGE_FAILURE_RATE = float(os.getenv("HEDGE_FAILURE_RATE", 0.2))
+HISTORY_SIZE = 100
+MIN_HISTORY = 10
+
+class SourceHistory:
+    """Rolling latency and outcome window for one source; drives the hedging decision."""
+
+    def __init__(self):
+        self.latencies = deque(maxlen=HISTORY_SIZE)
+        self.outcomes = deque(maxlen=HISTORY_SIZE)
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def record(self, outcome, latency=None):
+        self.outcomes.append(outcome)
+        if latency is not None:
+            self.latencies.append(latency)
+
+    def failure_rate(self):
+        if len(self.outcomes) < MIN_HISTORY:
+            return 0.0
+        return sum(1 for o in self.outcomes if o != "ok") / len(self.outcomes)
+
+    def p95(self):
+        if len(self.latencies) < MIN_HISTORY:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[int(len(ordered) * 0.95) - 1]
+
+class ScanOrchestrator:
+    """
+    Runs a scan's sources under one overall deadline plus per-source budgets.
+    Sources still running at the deadline are cancelled and reported as timed out,
+    so callers can return partial results. Flaky sources can be hedged: if the first
+    attempt is slower than usual, a second uncached attempt races it.
+    """
+
+    def __init__(self):
+        self.history = {}
+
+    def _history(self, source):
+        return self.history.setdefault(source, SourceHistory())
+
+    def should_hedge(self, source):
+        if source in HEDGE_SOURCES:
+            return True
+        return HEDGE_FAILURE_RATE > 0 and self._history(source).failure_rate() >= HEDGE_FAILURE_RATE
+
+    async def _hedged(self, source, scraper, argument, budget):
+        history = self._history(source)
+        # Fire the backup once the primary is slower than 95% of recent calls (or half the budget)
+        hedge_after = history.p95() or budget / 2
+        primary = asyncio.ensure_future(scraper(argument))
+        done, _ = await asyncio.wait({primary}, timeout=hedge_after)
+        if done:
+            return primary.result()
+
+        # __wrapped__ is the raw scraper: a hedge must not just join the in-flight call it is racing
+        backup = asyncio.ensure_future(getattr(scraper, "__wrapped__", scraper)(argument))
+        history.hedges += 1
+        racers = {primary, backup}
+        try:
+            while racers:
+                done, racers = await asyncio.wait(racers, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is backup:
+                            history.hedge_wins += 1
+                        return task.result()
+            # Both attempts failed: surface the primary's error
+            return primary.result()
+        finally:
+            for task in (primary, backup):
+                task.cancel()
+
+    async def _run_source(self, source, scraper, argument, budget, limit):
+        if limit is not None:
+            # Queueing for a batch slot does not eat into the source's own budget
+            await limit.acquire()
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            if self.should_hedge(source):
+                call = self._hedged(source, scraper, argument, budget)
+            else:
+                call = scraper(argument)
+            result = await asyncio.wait_for(call, budget)
+            outcome = "ok"
+            self._history(source).record("ok", time.perf_counter() - started)
+            return result
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            raise
+        except asyncio.CancelledError:
+            # Still running at the overall deadline (or the client went away)
+            outcome = "cancelled"
+            raise
+        finally:
+            metrics.observe(SOURCE_SECONDS, time.perf_counter() - started, source=source, outcome=outcome)
+            if limit is not None:
+                limit.release()
+
+    async def stream(self, plan, deadline=SCAN_DEADLINE, source_limits=None):
+        """
+        Yields (source, result, status) in completion order; status is "ok", "timeout" or "error".
+        'plan' is a list of (source, scraper, argument) triples.
+        """
+        source_limits = source_limits or {}
+        loop = asyncio.get_running_loop()
+        ends_at = loop.time() + deadline
+        tasks = {
+            asyncio.ensure_future(self._run_source(
+                source, scraper, argument,
+                min(SOURCE_BUDGETS.get(source, DEFAULT_BUDGET), deadline),
+                source_limits.get(source)
+            )): source
+            for source, scraper, argument in plan
+        }
+        pending = set(tasks)
+        try:
+            while pending:
+                # A zero timeout still collects sources that finished while the caller was busy
+                remaining = max(ends_at - loop.time(), 0)
+                done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    break
+                for task in done:
+                    source = tasks[task]
+                    error = task.exception()
+                    if error is None:
+                        yield source, task.result(), "ok"
+                    elif isinstance(error, asyncio.TimeoutError):
+                        logger.warning(f"⏱️ {source} exceeded its budget, returning partial results.")
+                        self._history(source).record("timeout")
+                        yield source, None, "timeout"
+                    else:
+                        logger.error(f"{source} failed: {error}")
+                        self._history(source).record("error")
+                        yield source, None, "error"
+
+            # Overall deadline hit: whatever is left is cancelled and reported
+            for task in pending:
+                task.cancel()
+                self._history(tasks[task]).record("timeout")
+                yield tasks[task], None, "timeout"
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def run(self, plan, deadline=SCAN_DEADLINE, source_limits=None):
+        """Collects stream() into ({source: result}, [timed-out sources], [failed sources])."""
+        results, timed_out, failed = {}, [], []
+        async for source, result, status in self.stream(plan, deadline, source_limits):
+            if status == "ok":
+                results[source] = result
+            elif status == "timeout":
+                timed_out.append(source)
+            else:
+                failed.append(source)
+        return results, timed_out, failed
+
+    def stats(self):
+        return {
+            source: {
+                "samples": len(h.outcomes),
+                "failure_rate": round(h.failure_rate(), 3),
+                "p95_seconds": round(h.p95(), 3) if h.p95() is not None else None,
+                "hedged": self.should_hedge(source),
+                "hedges": h.hedges,
+                "hedge_wins": h.hedge_wins,
+            }
+            for source, h in self.history.items()
+        }
+
+orchestrator = ScanOrchestrator()
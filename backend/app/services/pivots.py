@@ -0,0 +1,211 @@
+import asyncio
+import logging
+import os
+import re
+import time
+from array import array
+
+logger = logging.getLogger(__name__)
+
+# ==========================================
+# CONFIGURATION (override via .env)
+# ==========================================
+# Hops away from the seed identifier that still get scanned (0 = the seed only)
+PIVOT_MAX_DEPTH = int(os.getenv("PIVOT_MAX_DEPTH", 2))
+# Identifiers scanned in one investigation, seed included
+PIVOT_MAX_NODES = int(os.getenv("PIVOT_MAX_NODES", 25))
+# New identifiers taken from any one scan (a combo-list paste can hold thousands of emails)
+PIVOT_MAX_CHILDREN = int(os.getenv("PIVOT_MAX_CHILDREN", 5))
+# Scans running at once, per depth; depths past the list use its last value
+PIVOT_DEPTH_CONCURRENCY = [int(n) for n in os.getenv("PIVOT_DEPTH_CONCURRENCY", "4,4,2").split(",") if n.strip()]
+# Ceiling for a whole investigation; nodes not reached by then are left unscanned
+PIVOT_DEADLINE = float(os.getenv("PIVOT_DEADLINE", 30.0))
+
+# Handles worth a scan: GitHub / Reddit style usernames, not stray words from a paste
+USERNAME_RE = re.compile(r"^[a-z0-9][a-z0-9_.-]{2,38}$")
+
+def identifier_kind(identifier: str) -> str:
+    return "email" if "@" in identifier else "username"
+
+def normalize_identifier(identifier: str):
+    """Lower-cased and stripped, or None when it is not something the scrapers can search for."""
+    identifier = (identifier or "").strip().lower()
+    if "@" in identifier:
+        local, _, domain = identifier.partition("@")
+        return identifier if local and "." in domain else None
+    return identifier if USERNAME_RE.match(identifier) else None
+
+def extract_pivots(identifier: str, report: dict) -> list:
+    """
+    The identifiers one unpersisted scan report leads to, as (identifier, via) pairs in discovery order:
+      * the local part of an email (the username people tend to reuse),
+      * GitHub logins that authored commits under it (the scraper's 'pivots'),
+      * emails the PII detector found in an exposure's content (e.g. paste bodies).
+    """
+    pivots = []
+    if identifier_kind(identifier) == "email":
+        pivots.append((identifier.split("@")[0], "email_local_part"))
+    for exp in report.get("exposures", []):
+        source = exp.get("source", "unknown")
+        for login in exp.get("pivots", ()):
+            pivots.append((login, f"{source}_account"))
+    for source, findings in report.get("source_findings", {}).items():
+        for finding in findings:
+            if finding.data_category == "EMAIL" and finding.match:
+                pivots.append((finding.match, f"{source}_content"))
+    return pivots
+
+class IdentityGraph:
+    """
+    Every identifier seen in one investigation, each stored once.
+    'index' maps an identifier to its node id and doubles as the visited set; per-node fields
+    live in parallel lists, and each node's out-edges are one array of ints packing
+    (target node id << 8 | via label code), labels being interned in 'labels'.
+    """
+
+    def __init__(self):
+        self.index = {}
+        self.identifiers = []
+        self.depths = array("B")
+        self.status = []
+        self.results = []
+        self.adjacency = []
+        self.labels = []
+        self._label_codes = {}
+
+    def __len__(self):
+        return len(self.identifiers)
+
+    def __contains__(self, identifier):
+        return identifier in self.index
+
+    def add_node(self, identifier: str, depth: int) -> int:
+        node = self.index.get(identifier)
+        if node is None:
+            node = self.index[identifier] = len(self.identifiers)
+            self.identifiers.append(identifier)
+            self.depths.append(min(depth, 255))
+            self.status.append("pending")
+            self.results.append(None)
+            self.adjacency.append(array("Q"))
+        return node
+
+    def add_edge(self, source: int, target: int, via: str):
+        code = self._label_codes.get(via)
+        if code is None:
+            code = self._label_codes[via] = len(self.labels)
+            self.labels.append(via)
+        packed = target << 8 | code
+        if packed not in self.adjacency[source]:
+            self.adjacency[source].append(packed)
+
+    def edges(self):
+        for source, targets in enumerate(self.adjacency):
+            for packed in targets:
+                yield source, packed >> 8, self.labels[packed & 0xFF]
+
+    def to_dict(self) -> dict:
+        return {
+            "nodes": [
+                {
+                    "id": node,
+                    "identifier": identifier,
+                    "kind": identifier_kind(identifier),
+                    "depth": self.depths[node],
+                    "status": self.status[node],
+                    "report": self.results[node],
+                }
+                for node, identifier in enumerate(self.identifiers)
+            ],
+            "edges": [{"from": source, "to": target, "via": via} for source, target, via in self.edges()],
+        }
+
+class PivotEngine:
+    """
+    Bounded breadth-first expansion from one seed identifier. Each depth is scanned as a whole
+    (at most PIVOT_DEPTH_CONCURRENCY[depth] at once) before the next starts, so which identifiers
+    fit under the caps is decided in discovery order and does not depend on upstream timing.
+    The node expander is an async callable (identifier, seconds left) -> (result, [(identifier, via)]).
+    """
+
+    def __init__(self, max_depth=PIVOT_MAX_DEPTH, max_nodes=PIVOT_MAX_NODES,
+                 max_children=PIVOT_MAX_CHILDREN, depth_concurrency=None, deadline=PIVOT_DEADLINE):
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.max_children = max_children
+        self.depth_concurrency = depth_concurrency or PIVOT_DEPTH_CONCURRENCY or [1]
+        self.deadline = deadline
+
+    def _concurrency(self, depth):
+        return max(1, self.depth_concurrency[min(depth, len(self.depth_concurrency) - 1)])
+
+    async def _expand(self, graph, node, expand, semaphore, ends_at):
+        async with semaphore:
+            remaining = ends_at - time.monotonic()
+            if remaining <= 0:
+                graph.status[node] = "skipped"
+                return []
+            try:
+                result, pivots = await expand(graph.identifiers[node], remaining)
+            except Exception as e:
+                logger.error(f"Pivot scan failed for {graph.identifiers[node]}: {e}")
+                graph.status[node] = "failed"
+                return []
+            graph.status[node] = "scanned"
+            graph.results[node] = result
+            return pivots
+
+    async def run(self, seed: str, expand, max_depth: int = None, max_nodes: int = None) -> dict:
+        """
+        Expands from 'seed' and returns the graph as a dict with per-investigation counters.
+        'max_depth' / 'max_nodes' can only lower the engine's own caps.
+        """
+        max_depth = self.max_depth if max_depth is None else min(max_depth, self.max_depth)
+        max_nodes = self.max_nodes if max_nodes is None else min(max_nodes, self.max_nodes)
+        graph = IdentityGraph()
+        started = time.monotonic()
+        ends_at = started + self.deadline
+        frontier = [graph.add_node(seed.strip().lower(), 0)]
+        dropped = 0
+
+        for depth in range(max_depth + 1):
+            semaphore = asyncio.Semaphore(self._concurrency(depth))
+            discovered = await asyncio.gather(*(
+                self._expand(graph, node, expand, semaphore, ends_at) for node in frontier
+            ))
+            next_frontier = []
+            for node, pivots in zip(frontier, discovered):
+                children = 0
+                for identifier, via in pivots:
+                    identifier = normalize_identifier(identifier)
+                    if identifier is None:
+                        continue
+                    if identifier in graph:
+                        # Already scanned or queued: record the link, never a second scan
+                        if graph.index[identifier] != node:
+                            graph.add_edge(node, graph.index[identifier], via)
+                        continue
+                    if depth == max_depth or children >= self.max_children or len(graph) >= max_nodes:
+                        dropped += 1
+                        continue
+                    child = graph.add_node(identifier, depth + 1)
+                    graph.add_edge(node, child, via)
+                    next_frontier.append(child)
+                    children += 1
+            if not next_frontier:
+                break
+            frontier = next_frontier
+
+        investigation = graph.to_dict()
+        investigation.update({
+            "seed": graph.identifiers[0],
+            "scanned": graph.status.count("scanned"),
+            "skipped": graph.status.count("skipped"),
+            "failed": graph.status.count("failed"),
+            # Identifiers found but left out by the depth / fan-out / node caps
+            "dropped_pivots": dropped,
+            "seconds": round(time.monotonic() - started, 3),
+        })
+        return investigation
+
+pivot_engine = PivotEngine()
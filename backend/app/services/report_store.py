@@ -0,0 +1,215 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+
+logger = logging.getLogger(__name__)
+
+# ==========================================
+# CONFIGURATION (override via .env)
+# ==========================================
+# "sqlite" (default, shared by every uvicorn worker on the host) or "memory" (tests / throwaway runs)
+REPORT_STORE = os.getenv("REPORT_STORE", "sqlite")
+# Every scanned identifier and its raw findings: kept in the git-ignored state dir, next to the cache tier
+REPORT_DB_PATH = os.getenv("REPORT_DB_PATH", os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", ".shadowtrace", "reports.db"
+))
+# Reports are written in batches by a background task; this bounds how many can wait
+REPORT_QUEUE_SIZE = int(os.getenv("REPORT_QUEUE_SIZE", 10000))
+REPORT_WRITE_BATCH = int(os.getenv("REPORT_WRITE_BATCH", 200))
+
+def _json_default(obj):
+    """Objects that know their JSON form (e.g. ai.findings.Finding) serialize through to_dict()."""
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+class ReportStore(ABC):
+    """
+    Where finished scan reports live. Writes are fire-and-forget from the request path
+    (submit); a background writer persists them in batches.
+    """
+
+    def __init__(self):
+        self.queue = None
+        self.writer = None
+        self.dropped = 0
+
+    # --- backend interface ---
+    @abstractmethod
+    def _write_many(self, rows):
+        """Persists [(identifier, scanned_at, report_json), ...]. Runs in a worker thread."""
+
+    @abstractmethod
+    def _latest(self, identifier):
+        """Newest report for an identifier, or None. Runs in a worker thread."""
+
+    @abstractmethod
+    def _history(self, identifier, limit, before):
+        """Summaries newest-first, strictly older than 'before' (keyset pagination)."""
+
+    # --- async API used by the routers ---
+    async def start(self):
+        if self.writer is None:
+            self.queue = asyncio.Queue(maxsize=REPORT_QUEUE_SIZE)
+            self.writer = asyncio.create_task(self._write_loop())
+
+    def submit(self, report: dict):
+        """Queues a report for persistence without waiting on disk."""
+        if self.writer is None:
+            # Used outside the app lifespan (scripts): start the writer on the running loop
+            self.queue = asyncio.Queue(maxsize=REPORT_QUEUE_SIZE)
+            self.writer = asyncio.get_running_loop().create_task(self._write_loop())
+        scanned_at = report.setdefault("scanned_at", time.time())
+        try:
+            self.queue.put_nowait((report["target"].lower(), scanned_at, json.dumps(report, default=_json_default)))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning("⚠️ Report queue full, dropping report for %s", report.get("target"))
+
+    async def _write_loop(self):
+        stopping = False
+        while not stopping:
+            rows = [await self.queue.get()]
+            # Drain whatever else is already waiting into the same transaction
+            while len(rows) < REPORT_WRITE_BATCH and not self.queue.empty():
+                rows.append(self.queue.get_nowait())
+            # None is the shutdown marker queued by close()
+            stopping = None in rows
+            rows = [row for row in rows if row is not None]
+            if not rows:
+                continue
+            try:
+                await asyncio.to_thread(self._write_many, rows)
+            except Exception as e:
+                logger.error(f"Report store write failed ({len(rows)} reports): {e}")
+
+    async def latest(self, identifier: str):
+        return await asyncio.to_thread(self._latest, identifier.lower())
+
+    async def history(self, identifier: str, limit: int = 20, before: float = None):
+        return await asyncio.to_thread(self._history, identifier.lower(), limit, before)
+
+    async def close(self):
+        """Flushes queued reports, then stops the writer."""
+        if self.writer is None:
+            return
+        writer, self.writer = self.writer, None
+        # The marker may wait for space in a full queue, which the writer is draining
+        await self.queue.put(None)
+        await writer
+
+class SQLiteReportStore(ReportStore):
+    """SQLite in WAL mode: one writer, many concurrent readers, safe across worker processes."""
+
+    def __init__(self, path=REPORT_DB_PATH):
+        super().__init__()
+        self.path = path
+        self.local = threading.local()
+        # Nothing touches the disk until the store is started or first used
+        self.schema_lock = threading.Lock()
+        self.schema_ready = False
+
+    async def start(self):
+        await asyncio.to_thread(self._conn)
+        await super().start()
+
+    def _create_schema(self, conn):
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS scan_reports (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                identifier TEXT NOT NULL,
+                scanned_at REAL NOT NULL,
+                risk_score INTEGER,
+                total_leaks INTEGER,
+                partial INTEGER DEFAULT 0,
+                report TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_scan_reports_identifier_time
+                ON scan_reports (identifier, scanned_at DESC);
+            """
+        )
+        conn.commit()
+
+    def _conn(self):
+        # One connection per thread (sqlite3 connections are not thread-safe)
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            with self.schema_lock:
+                if not self.schema_ready:
+                    os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                conn = sqlite3.connect(self.path, timeout=10)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                if not self.schema_ready:
+                    self._create_schema(conn)
+                    self.schema_ready = True
+            self.local.conn = conn
+        return conn
+
+    def _write_many(self, rows):
+        conn = self._conn()
+        with conn:
+            conn.executemany(
+                "INSERT INTO scan_reports (identifier, scanned_at, risk_score, total_leaks, partial, report) "
+                "VALUES (?, ?, json_extract(?3, '$.risk_score'), json_extract(?3, '$.total_leaks'), "
+                "COALESCE(json_extract(?3, '$.partial'), 0), ?3)",
+                rows,
+            )
+
+    def _latest(self, identifier):
+        row = self._conn().execute(
+            "SELECT id, report FROM scan_reports WHERE identifier = ? ORDER BY scanned_at DESC LIMIT 1",
+            (identifier,),
+        ).fetchone()
+        if row is None:
+            return None
+        return {**json.loads(row[1]), "report_id": row[0]}
+
+    def _history(self, identifier, limit, before):
+        rows = self._conn().execute(
+            "SELECT id, scanned_at, risk_score, total_leaks, partial FROM scan_reports "
+            "WHERE identifier = ? AND scanned_at < ? ORDER BY scanned_at DESC LIMIT ?",
+            (identifier, before if before is not None else float("inf"), limit),
+        ).fetchall()
+        return [
+            {"report_id": r[0], "scanned_at": r[1], "risk_score": r[2], "total_leaks": r[3], "partial": bool(r[4])}
+            for r in rows
+        ]
+
+class MemoryReportStore(ReportStore):
+    """Process-local store with the same interface (single worker, lost on restart)."""
+
+    def __init__(self):
+        super().__init__()
+        self.reports = {}
+        self.next_id = 1
+
+    def _write_many(self, rows):
+        for identifier, scanned_at, payload in rows:
+            self.reports.setdefault(identifier, []).append((self.next_id, scanned_at, json.loads(payload)))
+            self.next_id += 1
+
+    def _latest(self, identifier):
+        reports = self.reports.get(identifier)
+        if not reports:
+            return None
+        report_id, _, report = max(reports, key=lambda r: r[1])
+        return {**report, "report_id": report_id}
+
+    def _history(self, identifier, limit, before):
+        reports = sorted(self.reports.get(identifier, []), key=lambda r: r[1], reverse=True)
+        if before is not None:
+            reports = [r for r in reports if r[1] < before]
+        return [
+            {"report_id": i, "scanned_at": t, "risk_score": r.get("risk_score"),
+             "total_leaks": r.get("total_leaks"), "partial": bool(r.get("partial"))}
+            for i, t, r in reports[:limit]
+        ]
+
+report_store = MemoryReportStore() if REPORT_STORE == "memory" else SQLiteReportStore()
@@ -0,0 +1,94 @@
+# benchmarks/bench_breach_index.py
+"""
+Offline breach index: ingest throughput on synthetic dumps, then lookup latency for hits and
+misses (with and without the bloom filter in front), and the Python memory a burst of lookups
+allocates (it should stay flat: everything is memory-mapped).
+
+    python benchmarks/bench_breach_index.py --records 2000000 --breaches 8
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.app.services.breach_index import BreachIndex, build_index
+
+def write_dumps(workdir, n_records, n_breaches, seed=13):
+    """'email:password' dumps drawn from one population, so many identifiers sit in several breaches."""
+    rng = random.Random(seed)
+    population = max(n_records // 2, 1)
+    inputs = []
+    for b in range(n_breaches):
+        path = os.path.join(workdir, f"breach_{b}.txt")
+        with open(path, "w") as dump:
+            for _ in range(n_records // n_breaches):
+                user = rng.randrange(population)
+                dump.write(f"user{user}@mail{user % 50}.com:hunter{rng.randrange(1000)}\n")
+        inputs.append((path, f"Breach{b}"))
+    return inputs, population
+
+def percentiles(samples):
+    samples = sorted(samples)
+    pick = lambda q: samples[min(int(q * len(samples)), len(samples) - 1)]
+    return f"p50 {pick(0.5) * 1e6:6.1f} µs  p99 {pick(0.99) * 1e6:6.1f} µs"
+
+def timed_lookups(index, identifiers, use_bloom=True):
+    latencies, found = [], 0
+    for identifier in identifiers:
+        start = time.perf_counter()
+        found += bool(index.lookup(identifier, use_bloom))
+        latencies.append(time.perf_counter() - start)
+    return latencies, found
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=2_000_000)
+    parser.add_argument("--breaches", type=int, default=8)
+    parser.add_argument("--lookups", type=int, default=50_000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="breach_bench_")
+    try:
+        inputs, population = write_dumps(workdir, args.records, args.breaches)
+        out = os.path.join(workdir, "index")
+        start = time.perf_counter()
+        meta = build_index(inputs, out)
+        build_time = time.perf_counter() - start
+        size = sum(os.path.getsize(os.path.join(out, name)) for name in os.listdir(out))
+        print(f"ingest   {args.records:,} lines -> {meta['records']:,} records in {build_time:.1f}s"
+              f" ({args.records / build_time:,.0f} lines/s), {size / 2**20:.1f} MiB on disk,"
+              f" prefix bits {meta['prefix_bits']}, bloom k={meta['bloom']['hashes']}")
+
+        index = BreachIndex(out)
+        rng = random.Random(1)
+        # Most of the population appears in some dump; a disjoint range never does
+        hits = [f"user{u}@mail{u % 50}.com" for u in (rng.randrange(population) for _ in range(args.lookups))]
+        misses = [f"nobody{i}@nowhere.org" for i in range(args.lookups)]
+        timed_lookups(index, hits[:1000])  # fault the hot pages in
+
+        latencies, found = timed_lookups(index, hits)
+        print(f"hits                {percentiles(latencies)}  ({found / len(hits):.1%} found)")
+        latencies, found = timed_lookups(index, misses, use_bloom=False)
+        print(f"misses, no bloom    {percentiles(latencies)}  ({found} false hits)")
+        index.bloom_rejects = 0
+        latencies, found = timed_lookups(index, misses)
+        print(f"misses, bloom       {percentiles(latencies)}  ({index.bloom_rejects / len(misses):.1%} rejected by the bloom filter)")
+
+        tracemalloc.start()
+        timed_lookups(index, hits)
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"memory   {args.lookups:,} lookups: {current / 1024:.0f} KiB retained, {peak / 1024:.0f} KiB peak"
+              " (timing lists included)")
+        index.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# benchmarks/bench_context_engine.py
+"""
+Cost of keyword-proximity confidence on a synthetic dump sprinkled with context keywords:
+the naive approach (every keyword searched in every match's window) against the Aho-Corasick
+ContextEngine, with the C automaton (pyahocorasick) when installed and the pure-Python one.
+The naive cost grows with the number of keywords while the automaton's does not; use
+--extra-keywords to see where they cross over.
+
+    python benchmarks/bench_context_engine.py --mb 2 --extra-keywords 50
+"""
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai.context_engine import ContextEngine, LEVELS
+from ai.pii_detector import detector
+from ai.regex_patterns import CONTEXT_KEYWORDS
+from benchmarks.bench_pii_detector import build_corpus, timed
+
+def build_text(size_mb, seed=3):
+    rng = random.Random(seed)
+    words = build_corpus(size_mb).split(" ")
+    keywords = [word for words_ in CONTEXT_KEYWORDS.values() for word in words_]
+    for i in range(0, len(words), 37):
+        words[i] = rng.choice(keywords)
+    return " ".join(words)
+
+def naive_confidences(engine, keywords, text, matches):
+    """
+    One lower-cased window and one substring search per keyword, per match. The window is padded
+    by the longest keyword, so one that starts or ends within reach is seen whole.
+    """
+    longest = max((len(word) for words in keywords.values() for word in words), default=0)
+    results = []
+    for category, start, end in matches:
+        base = engine.base.get(category)
+        if base is None:
+            results.append("HIGH")
+            continue
+        lo = max(start - engine.window - longest, 0)
+        window = text[lo:end + engine.window + longest].lower()
+        distance = float("inf")
+        for word in keywords.get(category, []):
+            at = window.find(word)
+            while at != -1:
+                kw_start, kw_end = lo + at, lo + at + len(word)
+                if (kw_start == 0 or not text[kw_start - 1].isalnum()) and (kw_end == len(text) or not text[kw_end].isalnum()):
+                    distance = min(distance, max(start - kw_end, kw_start - end, 0))
+                at = window.find(word, at + 1)
+        if distance <= engine.near:
+            results.append("HIGH")
+        elif distance <= engine.window:
+            results.append(LEVELS[min(LEVELS.index(base) + 1, len(LEVELS) - 1)])
+        else:
+            results.append(base)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mb", type=int, default=2, help="Size of the synthetic dump in MB")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--extra-keywords", type=int, default=0, help="Synthetic keywords added per category")
+    args = parser.parse_args()
+
+    keywords = {
+        category: words + [f"{words[0]}ref{i}" for i in range(args.extra_keywords)]
+        for category, words in CONTEXT_KEYWORDS.items()
+    }
+
+    text = build_text(args.mb)
+    matches = [(m.lastgroup, m.start(), m.end()) for m in detector.compiled.finditer(text)]
+    print(f"{args.mb} MB corpus, {len(matches):,} regex matches,"
+          f" {sum(map(len, keywords.values()))} keywords")
+
+    regex_time, _ = timed(lambda: list(detector.compiled.finditer(text)), args.repeat)
+    print(f"regex pass alone         {regex_time * 1000:8.1f} ms")
+
+    native = ContextEngine(keywords)
+    python = ContextEngine(keywords)
+    python.native = None
+    naive_time, naive = timed(lambda: naive_confidences(python, keywords, text, matches), args.repeat)
+    print(f"naive window searches    {naive_time * 1000:8.1f} ms")
+    python_time, by_python = timed(lambda: python.confidences(text, matches), args.repeat)
+    print(f"aho-corasick (python)    {python_time * 1000:8.1f} ms")
+    if native.native is not None:
+        native_time, by_native = timed(lambda: native.confidences(text, matches), args.repeat)
+        print(f"aho-corasick (C)         {native_time * 1000:8.1f} ms")
+        assert by_native == by_python
+    else:
+        print("aho-corasick (C)         pyahocorasick not installed")
+
+    agree = sum(a == b for a, b in zip(naive, by_python)) / len(matches)
+    print(f"agreement with naive     {agree:8.2%}")
+    assert by_python == naive, "the automaton must score every match exactly like the naive search"
+    print("levels:", {level: by_python.count(level) for level in LEVELS})
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# benchmarks/bench_findings.py
+"""
+Memory held by detector output: the old dict-per-finding shape (copied match substring, span
+tuple, four-key dict) against the slotted Finding that points into the scanned text, measured
+with tracemalloc on ~1M findings. Also times the router's pii_found de-duplication: the old
+list scan per finding against the ordered-set merge.
+
+    python benchmarks/bench_findings.py --findings 1000000
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai.findings import Finding
+from ai.pii_detector import detector
+from benchmarks.bench_validators import aadhaar, mobile, pan
+
+def build_dense_corpus(n_values, seed=5):
+    """Almost nothing but PII: one value per token, with a filler word every few tokens."""
+    rng = random.Random(seed)
+    generators = (aadhaar, pan, mobile)
+    parts = []
+    for i in range(n_values):
+        parts.append(rng.choice(generators)(rng))
+        if i % 4 == 0:
+            parts.append("leak")
+    return " ".join(parts)
+
+def measure(build):
+    """Bytes still allocated by build()'s result once it returns."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, peak, result
+
+def legacy_pii_found(findings):
+    pii_found = []
+    for finding in findings:
+        label = f"{finding.data_category}: {finding.match}"
+        if label not in pii_found:
+            pii_found.append(label)
+    return pii_found
+
+def compare_representations(text):
+    """Dicts versus slotted Findings for the same matches; everything is freed on return."""
+    matches = list(detector.compiled.finditer(text))
+    confidences = detector.context.confidences(text, [(m.lastgroup, m.start(), m.end()) for m in matches])
+    print(f"{len(text) / 1e6:.1f} MB text, {len(matches):,} matches")
+
+    legacy_bytes, legacy_peak, legacy = measure(lambda: [
+        {"data_category": m.lastgroup, "match": m.group(), "span": (m.start(), m.end()), "confidence": confidence}
+        for m, confidence in zip(matches, confidences)
+    ])
+    print(f"dict findings     {legacy_bytes / 2**20:8.1f} MiB  ({legacy_bytes / len(legacy):6.1f} B/finding,"
+          f" peak {legacy_peak / 2**20:.1f} MiB)")
+    del legacy
+
+    slotted_bytes, slotted_peak, findings = measure(lambda: [
+        Finding(m.lastgroup, confidence, m.start(), m.end(), text, 0)
+        for m, confidence in zip(matches, confidences)
+    ])
+    print(f"Finding objects   {slotted_bytes / 2**20:8.1f} MiB  ({slotted_bytes / len(findings):6.1f} B/finding,"
+          f" peak {slotted_peak / 2**20:.1f} MiB)")
+    print(f"reduction         {legacy_bytes / slotted_bytes:8.2f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--findings", type=int, default=1_000_000)
+    parser.add_argument("--dedup", type=int, default=20_000, help="Findings in the pii_found comparison")
+    args = parser.parse_args()
+
+    text = build_dense_corpus(args.findings)
+    compare_representations(text)
+
+    # End to end: what the detector's own output retains (validation and context scoring included)
+    scan_bytes, scan_peak, scanned = measure(lambda: detector.scan_text(text))
+    print(f"scan_text output  {scan_bytes / 2**20:8.1f} MiB  for {len(scanned):,} findings"
+          f" (peak {scan_peak / 2**20:.1f} MiB)")
+
+    sample = scanned[:args.dedup]
+    start = time.perf_counter()
+    old = legacy_pii_found(sample)
+    list_time = time.perf_counter() - start
+    start = time.perf_counter()
+    new = list(dict.fromkeys(finding.label for finding in sample))
+    set_time = time.perf_counter() - start
+    assert old == new
+    print(f"pii_found dedup   list scan {list_time * 1000:8.1f} ms  ordered set {set_time * 1000:6.1f} ms"
+          f"  ({len(sample):,} findings)")
+
+if __name__ == "__main__":
+    main()
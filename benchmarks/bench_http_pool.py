@@ -0,0 +1,79 @@
+# benchmarks/bench_http_pool.py
+"""
+Per-scan latency and connection churn: a fresh httpx.AsyncClient per scrape (the old behaviour)
+versus the shared pooled clients from backend/app/scrapers/http_client.py.
+
+    python benchmarks/bench_http_pool.py --scans 200 --concurrency 20 --latency-ms 5
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mock_upstream import MockUpstream
+from backend.app.scrapers.http_client import UPSTREAMS, close_clients
+from backend.app.scrapers.github_scraper import scan_github
+from backend.app.scrapers.hibp import scan_hibp
+from backend.app.scrapers.reddit_scraper import scan_reddit
+from backend.app.scrapers.pastebin_scraper import scan_pastebin
+
+# __wrapped__ skips the result cache so every scan really goes over the wire
+SCRAPERS = [
+    ("github", scan_github.__wrapped__),
+    ("hibp", scan_hibp.__wrapped__),
+    ("reddit", scan_reddit.__wrapped__),
+    ("pastebin", scan_pastebin.__wrapped__),
+]
+
+async def scan_once(i, fresh):
+    target = f"user{i}@example.com"
+    start = time.perf_counter()
+    if fresh:
+        async def one(name, scraper):
+            async with httpx.AsyncClient(base_url=UPSTREAMS[name]["base_url"]) as client:
+                return await scraper(target, client=client)
+        await asyncio.gather(*(one(name, scraper) for name, scraper in SCRAPERS))
+    else:
+        await asyncio.gather(*(scraper(target) for _, scraper in SCRAPERS))
+    return time.perf_counter() - start
+
+async def run(scans, concurrency, fresh):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(i):
+        async with semaphore:
+            return await scan_once(i, fresh)
+
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*(bounded(i) for i in range(scans)))
+    wall = time.perf_counter() - start
+    await close_clients()
+    return wall, sorted(latencies)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scans", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=5)
+    args = parser.parse_args()
+
+    upstream = MockUpstream(latency_ms=args.latency_ms).start()
+    upstream.point_scrapers_here()
+
+    for label, fresh in (("fresh client per scan", True), ("shared pooled clients", False)):
+        upstream.reset_stats()
+        wall, latencies = asyncio.run(run(args.scans, args.concurrency, fresh))
+        stats = upstream.stats
+        print(f"{label:24s} wall {wall:6.2f}s  p50 {statistics.median(latencies) * 1000:7.1f} ms  "
+              f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:7.1f} ms  "
+              f"connections {stats['connections']:5d} / requests {stats['requests']}")
+    upstream.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# benchmarks/bench_incremental.py
+"""
+Simulates daily monitoring: a full batch scan of N identifiers, then incremental re-scans of the
+same identifiers once the scraper cache has expired. Compares upstream traffic (including 304s
+from conditional requests), enrichment work and wall time, and checks the reported delta when
+the mock upstream adds a breach between runs.
+
+    python benchmarks/bench_incremental.py --targets 200 --latency-ms 20
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Memory-only cache and report store so every run starts cold
+os.environ.pop("CACHE_DB_PATH", None)
+os.environ["REPORT_STORE"] = "memory"
+
+from benchmarks.mock_upstream import MockUpstream
+from backend.app.main import app
+from backend.app.routers import scan
+from backend.app.scrapers.cache import result_cache
+from backend.app.scrapers.http_client import close_clients
+from backend.app.services.report_store import report_store
+
+enrichments = 0
+_enrich_exposure = scan.enrich_exposure
+
+async def counting_enrich_exposure(exp):
+    global enrichments
+    enrichments += 1
+    return await _enrich_exposure(exp)
+
+scan.enrich_exposure = counting_enrich_exposure
+
+def expire_scraper_cache():
+    """What a day does to the result cache: scraper answers expire, stored validators (their own store) do not."""
+    result_cache.memory.entries.clear()
+
+async def batch(client, targets, incremental):
+    global enrichments
+    enrichments = 0
+    start = time.perf_counter()
+    response = await client.post("/api/v1/scan/batch", json={"targets": targets, "incremental": incremental})
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    elapsed = time.perf_counter() - start
+    # Let the report store's background writer catch up before the next pass reads baselines
+    while not report_store.queue.empty():
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.05)
+    return lines, elapsed, enrichments
+
+async def run(upstream, targets):
+    transport = httpx.ASGITransport(app=app)
+    rows = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://shadowtrace", timeout=120) as client:
+        for label, incremental, before in (
+            ("full scan", False, None),
+            ("incremental, nothing changed", True, None),
+            ("incremental, new breach", True, lambda: upstream.server.breaches.append("Dropbox")),
+        ):
+            if before:
+                before()
+            expire_scraper_cache()
+            upstream.reset_stats()
+            lines, elapsed, enriched = await batch(client, targets, incremental)
+            rows.append((label, lines, elapsed, enriched, upstream.stats))
+    await close_clients()
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--targets", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    args = parser.parse_args()
+
+    upstream = MockUpstream(latency_ms=args.latency_ms).start()
+    upstream.point_scrapers_here()
+    targets = [f"monitored{i}@example.com" for i in range(args.targets)]
+    rows = asyncio.run(run(upstream, targets))
+    upstream.stop()
+
+    for label, lines, elapsed, enriched, stats in rows:
+        print(f"{label:30s} {elapsed:6.2f}s  upstream requests {stats['requests']:5d}"
+              f"  (304: {stats['not_modified']:5d})  enrichments {enriched:5d}")
+
+    _, unchanged, _, enriched, _ = rows[1]
+    assert enriched == 0, "unchanged exposures must not be re-enriched"
+    assert all(not line["delta"]["new"] and not line["delta"]["changed"] for line in unchanged)
+
+    _, changed, _, enriched, _ = rows[2]
+    assert enriched == len(targets), "only the HIBP exposure of each target changed"
+    for line in changed:
+        assert [c["source"] for c in line["delta"]["changed"]] == ["hibp"], line["delta"]
+        assert line["delta"]["changed"][0]["added"] == {"breaches": ["Dropbox"]}
+    print("delta: ok")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# benchmarks/bench_job_queue.py
+"""
+A traffic burst against the background job API: N concurrent POST /scan/jobs requests
+against a slow mock upstream. Submissions should return in milliseconds regardless of
+upstream latency, and the worker pool then drains the queue.
+
+    python benchmarks/bench_job_queue.py --burst 300 --latency-ms 500
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.pop("CACHE_DB_PATH", None)
+os.environ["REPORT_STORE"] = "memory"
+
+from benchmarks.mock_upstream import MockUpstream
+from backend.app.main import app
+from backend.app.scrapers.http_client import close_clients
+from backend.app.services.jobs import job_queue
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct / 100), len(ordered) - 1)]
+
+async def burst(n):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://shadowtrace", timeout=30) as client:
+        async def submit(i):
+            start = time.perf_counter()
+            response = await client.post("/api/v1/scan/jobs", json={"target_email": f"burst{i}@example.com"})
+            return response, time.perf_counter() - start
+
+        start = time.perf_counter()
+        submitted = await asyncio.gather(*(submit(i) for i in range(n)))
+        accepted = [r.json()["job_id"] for r, _ in submitted if r.status_code == 202]
+        rejected = sum(1 for r, _ in submitted if r.status_code == 503)
+
+        # Drain: wait for every accepted job to reach a final state
+        while job_queue.queued or job_queue.running:
+            await asyncio.sleep(0.05)
+        drained = time.perf_counter() - start
+
+        statuses = [(await client.get(f"/api/v1/scan/jobs/{job_id}")).json()["status"] for job_id in accepted]
+    await close_clients()
+    return [elapsed for _, elapsed in submitted], accepted, rejected, drained, statuses
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--burst", type=int, default=300)
+    parser.add_argument("--latency-ms", type=float, default=500)
+    args = parser.parse_args()
+
+    upstream = MockUpstream(latency_ms=args.latency_ms).start()
+    upstream.point_scrapers_here()
+    latencies, accepted, rejected, drained, statuses = asyncio.run(burst(args.burst))
+    upstream.stop()
+
+    print(f"{args.burst} submissions: p50 {percentile(latencies, 50) * 1000:.1f}ms"
+          f"  p99 {percentile(latencies, 99) * 1000:.1f}ms  (upstream latency {args.latency_ms:.0f}ms)")
+    print(f"accepted {len(accepted)}, refused with 503 {rejected}, queue drained in {drained:.2f}s"
+          f" by {job_queue.worker_count} workers")
+    print(f"stats: {job_queue.stats()}")
+    assert all(status == "done" for status in statuses), set(statuses)
+
+if __name__ == "__main__":
+    main()
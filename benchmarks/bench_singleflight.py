@@ -0,0 +1,90 @@
+# benchmarks/bench_singleflight.py
+"""
+Fires N concurrent identical POSTs at /api/v1/scan/ against the mock upstream and checks
+that request coalescing turns them into a single upstream call per source.
+Also checks that cancelling some of the callers does not break the shared call for the rest.
+
+    python benchmarks/bench_singleflight.py --requests 50 --latency-ms 200
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Start from a cold, memory-only cache so every request would otherwise miss
+os.environ.pop("CACHE_DB_PATH", None)
+
+from benchmarks.mock_upstream import MockUpstream
+from backend.app.main import app
+from backend.app.scrapers.cache import result_cache
+from backend.app.scrapers.http_client import close_clients
+from backend.app.scrapers.singleflight import SingleFlight
+
+# One uncached scan = 2 GitHub searches + 2 raw files (3 hits, one a fork) + HIBP + Reddit + psbdmp + 2 raw pastes
+REQUESTS_PER_SCAN = 9
+
+async def fire(n, target):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://shadowtrace", timeout=30) as client:
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(
+            client.post("/api/v1/scan/", json={"target_email": target}) for _ in range(n)
+        ))
+        elapsed = time.perf_counter() - start
+    await close_clients()
+    return responses, elapsed
+
+async def check_cancellation():
+    flight = SingleFlight()
+    calls = 0
+
+    async def slow():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.1)
+        return "shared"
+
+    tasks = [asyncio.create_task(flight.do("k", slow)) for _ in range(10)]
+    await asyncio.sleep(0.01)
+    for task in tasks[:5]:
+        task.cancel()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    survivors = [r for r in results if not isinstance(r, BaseException)]
+    assert calls == 1 and survivors == ["shared"] * 5, (calls, results)
+
+    # Everyone cancels -> the upstream call is cancelled, and the next caller starts fresh
+    task = asyncio.create_task(flight.do("k", slow))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    assert await flight.do("k", slow) == "shared" and calls == 3, calls
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=200)
+    args = parser.parse_args()
+
+    upstream = MockUpstream(latency_ms=args.latency_ms).start()
+    upstream.point_scrapers_here()
+
+    responses, elapsed = asyncio.run(fire(args.requests, "breaking.news@example.com"))
+    stats = upstream.stats
+    upstream.stop()
+
+    assert all(r.status_code == 200 for r in responses)
+    assert len({r.text for r in responses}) == 1, "coalesced callers must see identical results"
+    print(f"{args.requests} concurrent identical scans in {elapsed:.2f}s")
+    print(f"upstream requests: {stats['requests']} (one scan = {REQUESTS_PER_SCAN})")
+    print(f"cache: {result_cache.stats()['in_flight']}")
+    assert stats["requests"] == REQUESTS_PER_SCAN, stats
+
+    asyncio.run(check_cancellation())
+    print("cancellation semantics: ok")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+# benchmarks/mock_upstream.py
+"""
+A local stand-in for GitHub search, HIBP, Reddit about.json, psbdmp, raw pastes and raw GitHub files.
+Runs in a background thread so benchmarks can drive the real scrapers against it.
+Latency (with optional jitter), 5xx errors and 429s are drawn from a seeded RNG, so a run with
+the same settings sees the same sequence of answers.
+
+    upstream = MockUpstream(latency_ms=20, error_rate=0.02, rate_limit_rate=0.05).start()
+    upstream.point_scrapers_here()
+
+Or standalone, to point a real server at it (GITHUB_API_URL=http://127.0.0.1:9100 etc.):
+
+    python benchmarks/mock_upstream.py --port 9100 --latency-ms 50 --rate-limit-rate 0.05
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+RAW_PASTE = (
+    "combo dump\n"
+    "victim@example.com:hunter2\n"
+    "aadhaar 2345 6789 0127 pan ABCPE1234F mobile 9876543210\n"
+    "API_KEY=sk_live_0000\n"
+)
+
+# A source file with a hardcoded credential; the code search hits below point at it (twice, via a fork)
+RAW_FILE = (
+    "# settings.py\n"
+    "ADMIN_EMAIL = \"ops@example.com\"\n"
+    "api_key = \"sk_live_0000\"\n"
+)
+CODE_SEARCH_ITEMS = [
+    {"sha": "1" * 40, "repository": {"full_name": "mock-org/app"},
+     "html_url": "https://github.com/mock-org/app/blob/main/settings.py"},
+    {"sha": "1" * 40, "repository": {"full_name": "mock-org/app-fork"},
+     "html_url": "https://github.com/mock-org/app-fork/blob/main/settings.py"},
+    {"sha": "2" * 40, "repository": {"full_name": "mock-org/tools"},
+     "html_url": "https://github.com/mock-org/tools/blob/main/deploy/settings.py"},
+]
+
+class _Handler(BaseHTTPRequestHandler):
+    # HTTP/1.1 so clients can keep the connection alive
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.stats["connections"] += 1
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body, content_type="application/json", headers=None):
+        payload = body.encode() if isinstance(body, str) else json.dumps(body).encode()
+        # Like GitHub, every answer carries an ETag and a matching If-None-Match gets a bodiless 304
+        etag = f'"{hashlib.sha1(payload).hexdigest()}"'
+        if status == 200 and self.headers.get("If-None-Match") == etag:
+            with self.server.lock:
+                self.server.stats["not_modified"] += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("ETag", etag)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.stats["requests"] += 1
+            roll = server.rng.random()
+            delay = server.latency + server.rng.uniform(0, server.jitter)
+        if delay:
+            time.sleep(delay)
+
+        path = self.path.split("?")[0]
+        if roll < server.error_rate:
+            with server.lock:
+                server.stats["errors"] += 1
+            self._send(500, {"error": "mock upstream failure"})
+        elif roll < server.error_rate + server.rate_limit_rate:
+            with server.lock:
+                server.stats["throttled"] += 1
+            self._send(429, {"error": "rate limited"}, headers={"Retry-After": server.retry_after})
+        elif path.startswith("/search/commits"):
+            # One author account per searched email, so pivot scans have a login to follow
+            author = hashlib.sha1(self.path.encode()).hexdigest()[:8]
+            self._send(200, {"total_count": 3, "items": [{"author": {"login": f"dev-{author}"}}]})
+        elif path.startswith("/search/code"):
+            self._send(200, {"total_count": len(CODE_SEARCH_ITEMS), "items": CODE_SEARCH_ITEMS})
+        elif path.startswith("/search/"):
+            self._send(200, {"total_count": 3, "items": []})
+        elif path.startswith("/api/v3/breachedaccount/"):
+            self._send(200, [{"Name": name} for name in server.breaches])
+        elif path.startswith("/user/") and path.endswith("/about.json"):
+            self._send(200, {"data": {"is_suspended": False, "created_utc": 0, "link_karma": 42}})
+        elif path.startswith("/api/search/"):
+            self._send(200, {"data": [{"id": "abc123"}, {"id": "def456"}]})
+        elif path.startswith("/raw/"):
+            self._send(200, server.raw_paste, "text/plain")
+        elif path.startswith("/mock-org/"):
+            self._send(200, RAW_FILE, "text/plain")
+        else:
+            self._send(404, {"error": "not found"})
+
+_STATS = ("connections", "requests", "not_modified", "errors", "throttled")
+
+class MockUpstream:
+    def __init__(self, latency_ms=0, host="127.0.0.1", port=0, jitter_ms=0, error_rate=0.0,
+                 rate_limit_rate=0.0, retry_after=1, seed=0):
+        self.server = ThreadingHTTPServer((host, port), _Handler)
+        self.server.daemon_threads = True
+        self.server.latency = latency_ms / 1000
+        # Extra delay drawn uniformly from [0, jitter_ms] per request
+        self.server.jitter = jitter_ms / 1000
+        # Fractions of requests answered 500 / 429 (with Retry-After: retry_after seconds)
+        self.server.error_rate = error_rate
+        self.server.rate_limit_rate = rate_limit_rate
+        self.server.retry_after = str(retry_after)
+        self.server.rng = random.Random(seed)
+        self.server.lock = threading.Lock()
+        self.server.stats = dict.fromkeys(_STATS, 0)
+        # Mutable so a benchmark can simulate a new breach between two scans, or plant a synthetic corpus
+        self.server.breaches = ["LinkedIn", "Canva"]
+        self.server.raw_paste = RAW_PASTE
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def stats(self):
+        return dict(self.server.stats)
+
+    def reset_stats(self):
+        with self.server.lock:
+            self.server.stats.update(dict.fromkeys(_STATS, 0))
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def point_scrapers_here(self):
+        """Re-targets every pooled upstream client at this server (call before the first scan)."""
+        point_scrapers_at(self.base_url)
+
+def point_scrapers_at(base_url):
+    """Same, for a mock running elsewhere (e.g. started from the command line below)."""
+    from backend.app.scrapers import github_scraper
+    from backend.app.scrapers.http_client import UPSTREAMS
+    from backend.app.scrapers.rate_limit import governor
+    for config in UPSTREAMS.values():
+        config["base_url"] = base_url
+        # The mock has no quota of its own (unless it answers 429), so don't pace against real-world limits
+        config["rpm"], config["burst"] = 1_000_000, 10_000
+    # Raw GitHub files come from their own host
+    github_scraper.GITHUB_RAW_URL = base_url
+    governor.buckets.clear()
+    # HIBP only hits the network when a key is configured
+    os.environ.setdefault("HIBP_API_KEY", "mock-key")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    upstream = MockUpstream(args.latency_ms, args.host, args.port, args.jitter_ms, args.error_rate,
+                            args.rate_limit_rate, args.retry_after, args.seed)
+    print(f"Mock upstream on {upstream.base_url} (Ctrl+C to stop)")
+    try:
+        upstream.server.serve_forever()
+    except KeyboardInterrupt:
+        print(upstream.stats)
+    finally:
+        upstream.server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+# benchmarks/run_suite.py
+"""
+The reproducible benchmark suite: throughput and p50/p95/p99 latency for
+
+  * PIIDetector.scan_text, DPDPChecker.analyze_findings and RiskScorer.calculate in isolation,
+    one call per synthetic document (benchmarks/corpus.py);
+  * POST /api/v1/scan/ end to end, driven in-process against the mock upstream
+    (benchmarks/mock_upstream.py) with configurable latency, 5xx and 429 rates.
+
+Results (plus the app's own stage histograms from /metrics) are written as JSON. Passing an
+earlier file to --compare prints the change per benchmark and exits 1 when a p95 or a
+throughput moved the wrong way by more than --threshold.
+
+    python benchmarks/run_suite.py --out bench-results/baseline.json
+    python benchmarks/run_suite.py --compare bench-results/baseline.json --out bench-results/new.json
+    python benchmarks/run_suite.py --only scan --latency-ms 50 --rate-limit-rate 0.05
+
+The in-process mock shares the interpreter (and the GIL) with the app, which flatters nothing on a
+small machine; for end-to-end numbers, start it separately and pass --upstream-url:
+
+    python benchmarks/mock_upstream.py --port 9100 --latency-ms 20 &
+    python benchmarks/run_suite.py --only scan --upstream-url http://127.0.0.1:9100
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Memory-only cache and report store so every run starts cold
+os.environ.pop("CACHE_DB_PATH", None)
+os.environ["REPORT_STORE"] = "memory"
+
+from ai.pii_detector import detector
+from ai.risk_scorer import scorer
+from compliance.dpdp_checker import checker
+from backend.app.main import app
+from backend.app.services.metrics import metrics
+from benchmarks.corpus import DEFAULT_DENSITIES, build_documents
+from benchmarks.mock_upstream import MockUpstream, point_scrapers_at
+
+SUITE_VERSION = 1
+BENCHMARKS = ("detector", "dpdp_checker", "risk_scorer", "scan")
+
+def percentile(samples, q):
+    """Nearest-rank percentile of sorted samples."""
+    return samples[min(int(q * len(samples)), len(samples) - 1)]
+
+def summarize(latencies, wall, **extra):
+    latencies = sorted(latencies)
+    return {
+        "count": len(latencies),
+        "wall_seconds": round(wall, 4),
+        "ops_per_second": round(len(latencies) / wall, 1) if wall else None,
+        **{f"p{q}_ms": round(percentile(latencies, q / 100) * 1000, 4) for q in (50, 95, 99)},
+        **extra,
+    }
+
+def time_calls(fn, inputs):
+    latencies, results = [], []
+    start = time.perf_counter()
+    for item in inputs:
+        began = time.perf_counter()
+        results.append(fn(item))
+        latencies.append(time.perf_counter() - began)
+    return latencies, time.perf_counter() - start, results
+
+# ==========================================
+# COMPONENTS IN ISOLATION
+# ==========================================
+def bench_components(args, selected):
+    docs = build_documents(args.docs, args.doc_kib * 1024, seed=args.seed)
+    texts = [text for text, _ in docs]
+    planted = sum(len(truth) for _, truth in docs)
+    results = {}
+
+    latencies, wall, findings = time_calls(detector.scan_text, texts)
+    if "detector" in selected:
+        found = sum(len(f) for f in findings)
+        results["detector"] = summarize(
+            latencies, wall,
+            mb_per_second=round(sum(map(len, texts)) / wall / 1e6, 2),
+            findings=found, planted=planted
+        )
+    if "dpdp_checker" in selected:
+        latencies, wall, _ = time_calls(checker.analyze_findings, findings)
+        results["dpdp_checker"] = summarize(latencies, wall, findings_per_call=round(planted / len(docs), 1))
+    if "risk_scorer" in selected:
+        latencies, wall, _ = time_calls(scorer.calculate, findings)
+        results["risk_scorer"] = summarize(latencies, wall, findings_per_call=round(planted / len(docs), 1))
+    return results
+
+# ==========================================
+# END TO END: POST /api/v1/scan/
+# ==========================================
+async def _scan_load(args):
+    transport = httpx.ASGITransport(app=app)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies, statuses, partial = [], {}, 0
+
+    async def one(client, i):
+        nonlocal partial
+        async with semaphore:
+            began = time.perf_counter()
+            # A fresh identifier per scan, so the result cache never answers for the upstream
+            response = await client.post("/api/v1/scan/", json={"target_email": f"bench{i}@example.com"})
+            latencies.append(time.perf_counter() - began)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            if response.status_code == 200 and response.json().get("partial"):
+                partial += 1
+
+    # The real lifespan: pooled clients, report store writer, job workers
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://shadowtrace", timeout=120) as client:
+            for i in range(args.warmup):
+                await one(client, -1 - i)
+            latencies.clear()
+            statuses.clear()
+            partial = 0
+            metrics.reset()
+            start = time.perf_counter()
+            await asyncio.gather(*(one(client, i) for i in range(args.scans)))
+            wall = time.perf_counter() - start
+    return latencies, wall, statuses, partial
+
+def bench_scan(args):
+    if args.upstream_url:
+        # Latency / error settings are the external mock's own
+        point_scrapers_at(args.upstream_url)
+        latencies, wall, statuses, partial = asyncio.run(_scan_load(args))
+        stats = None
+    else:
+        upstream = MockUpstream(args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+                                rate_limit_rate=args.rate_limit_rate, retry_after=args.retry_after,
+                                seed=args.seed).start()
+        upstream.point_scrapers_here()
+        # Raw paste bodies are a synthetic dump too, so enrichment does representative work
+        upstream.server.raw_paste = build_documents(1, args.doc_kib * 1024, seed=args.seed)[0][0]
+        try:
+            latencies, wall, statuses, partial = asyncio.run(_scan_load(args))
+            stats = upstream.stats
+        finally:
+            upstream.stop()
+    return summarize(
+        latencies, wall,
+        statuses={str(code): n for code, n in sorted(statuses.items())},
+        partial_reports=partial,
+        upstream=stats,
+        # Where the time went, from the app's own histograms (bucket bounds, not exact)
+        stages=[s for s in metrics.summary() if s["name"] != "shadowtrace_http_request_seconds"]
+    )
+
+# ==========================================
+# RESULTS
+# ==========================================
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def compare(previous, current, threshold):
+    """Prints p95 / throughput changes; returns the names of the benchmarks that regressed."""
+    regressed = []
+    print(f"\n{'benchmark':14s} {'p95 before':>11s} {'p95 now':>11s} {'change':>8s}   {'ops/s before':>13s} {'ops/s now':>11s} {'change':>8s}")
+    for name, now in current["results"].items():
+        before = previous.get("results", {}).get(name)
+        if not before:
+            continue
+        p95_change = now["p95_ms"] / before["p95_ms"] - 1 if before["p95_ms"] else 0.0
+        ops_change = now["ops_per_second"] / before["ops_per_second"] - 1 if before["ops_per_second"] else 0.0
+        flag = ""
+        if p95_change > threshold or ops_change < -threshold:
+            regressed.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:14s} {before['p95_ms']:9.3f}ms {now['p95_ms']:9.3f}ms {p95_change:+8.1%}"
+              f"   {before['ops_per_second']:13,.1f} {now['ops_per_second']:11,.1f} {ops_change:+8.1%}{flag}")
+    return regressed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, default=list(BENCHMARKS))
+    parser.add_argument("--seed", type=int, default=7)
+    # Components
+    parser.add_argument("--docs", type=int, default=500, help="Synthetic documents per component benchmark")
+    parser.add_argument("--doc-kib", type=int, default=16, help="Size of each document (and of the mock raw paste)")
+    # End to end
+    parser.add_argument("--scans", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--jitter-ms", type=float, default=10)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--upstream-url", help="Use a mock upstream that is already running instead of an in-process one")
+    # Output
+    parser.add_argument("--out", help="Write the results JSON here")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed p95 / throughput change before flagging")
+    args = parser.parse_args()
+
+    results = bench_components(args, set(args.only))
+    if "scan" in args.only:
+        results["scan"] = bench_scan(args)
+
+    run = {
+        "suite_version": SUITE_VERSION,
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "densities_per_kib": DEFAULT_DENSITIES,
+            "args": vars(args),
+        },
+        "results": results,
+    }
+
+    print(f"{'benchmark':14s} {'ops/s':>11s} {'p50':>10s} {'p95':>10s} {'p99':>10s}")
+    for name, r in results.items():
+        print(f"{name:14s} {r['ops_per_second']:11,.1f} {r['p50_ms']:8.3f}ms {r['p95_ms']:8.3f}ms {r['p99_ms']:8.3f}ms")
+    if "scan" in results:
+        print(f"scan statuses {results['scan']['statuses']}, partial reports {results['scan']['partial_reports']},"
+              f" upstream {results['scan']['upstream']}")
+
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w") as out:
+            json.dump(run, out, indent=2)
+        print(f"\nResults written to {args.out}")
+
+    if args.compare:
+        with open(args.compare) as previous:
+            regressed = compare(json.load(previous), run, args.threshold)
+        if regressed:
+            print(f"\nRegressed beyond {args.threshold:.0%}: {', '.join(regressed)}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,41 +1,27 @@
 # compliance/dpdp_checker.py
 
+from ai.findings import as_finding
+from ai.pii_categories import CATEGORY_ALIASES, DEFAULT_VIOLATION, PII_CONFIG
+
 class DPDPChecker:
     def __init__(self):
         # Mapping Data Categories to specific DPDP Act Violations
-        # This acts as a high-speed lookup table
+        # This acts as a high-speed lookup table: every canonical code AND alias
+        # points straight at its (shared, read-only) violation entry
         self.compliance_map = {
-            "AADHAAR_ID": {
-                "section": "Section 8(5)",
-                "violation": "Breach of Security Safeguards",
-                "clause": "Fiduciaries must protect personal data in its custody by taking reasonable security safeguards.",
-                "penalty": "Up to ₹250 Crores"
-            },
-            "PAN_CARD": {
-                "section": "Section 11",
-                "violation": "Right to Data Portability/Erasure",
-                "clause": "Financial data exposed without active consent or purpose limitation.",
-                "penalty": "Significant administrative fines"
-            },
-            "PRIVATE_KEY": {
-                "section": "Section 8(1)",
-                "violation": "General Obligation of Data Fiduciary",
-                "clause": "Failure to ensure the accuracy and safety of sensitive security credentials.",
-                "penalty": "Case-specific high-impact fines"
-            }
-        }
-        
-        # Default fallback for general data like Email or Phone
-        self.default_violation = {
-            "section": "Section 12",
-            "violation": "Right to Correction and Erasure",
-            "clause": "Data principal has the right to seek erasure of data that is no longer necessary.",
-            "penalty": "Standard compliance penalties"
+            name: PII_CONFIG[code]["dpdp"] for name, code in CATEGORY_ALIASES.items()
         }
 
+        # Default fallback for data without a specific mapping
+        self.default_violation = DEFAULT_VIOLATION
+        # Once every distinct section has been reported, the remaining findings can't add anything
+        self.section_count = len({info["section"] for info in self.compliance_map.values()} | {DEFAULT_VIOLATION["section"]})
+
     def analyze_findings(self, ai_findings: list):
         """
         Efficiently maps AI-detected PII to legal DPDP violations.
+        One dict lookup per finding. Takes Findings or dicts ('entity_type' is still honoured
+        for older payloads).
         """
         if not ai_findings:
             return []
@@ -43,19 +29,22 @@ class DPDPChecker:
         compliance_report = []
         # Use a set to track unique sections so we don't repeat the same legal advice
         seen_sections = set()
+        lookup = self.compliance_map.get
+        default = self.default_violation
+
+        for finding in map(as_finding, ai_findings):
+            legal_info = lookup(finding.data_category, default)
 
-        for finding in ai_findings:
-            entity = finding.get("entity_type")
-            legal_info = self.compliance_map.get(entity, self.default_violation)
-            
             # Check if we've already added this specific section to the report
             if legal_info["section"] not in seen_sections:
                 compliance_report.append({
-                    "data_type": finding.get("data_category", "General Data"),
-                    "masked_value": finding.get("match"),
+                    "data_type": finding.data_category or "General Data",
+                    "masked_value": finding.match,
                     **legal_info
                 })
                 seen_sections.add(legal_info["section"])
+                if len(seen_sections) == self.section_count:
+                    break
 
         return compliance_report
 
@@ -1,47 +1,142 @@
 # compliance/removal_request.py
 import datetime
 import os
+import string
+
+from ai.findings import as_finding
+from ai.pii_categories import PII_CONFIG, canonical_category
+
+# Who a letter is addressed to, by scan source. Breach sources (HIBP, the local breach corpus)
+# name the breached companies themselves (see companies_for); anything else falls back to the
+# exposure's platform.
+SOURCE_COMPANIES = {
+    "github": "GitHub, Inc.",
+    "pastebin": "Pastebin.com",
+    "reddit": "Reddit, Inc.",
+}
+
+def companies_for(exposure):
+    """The companies a takedown letter for this exposure goes to."""
+    if exposure.get("source") in ("hibp", "local_breaches"):
+        breaches = (exposure.get("fingerprint") or {}).get("breaches")
+        if breaches:
+            return breaches
+    return [SOURCE_COMPANIES.get(exposure.get("source")) or exposure.get("platform") or "Unknown Platform"]
 
 class RemovalRequestGenerator:
-    def __init__(self):
+    def __init__(self, template_path=None):
         # Locate the template relative to this file
-        self.template_path = os.path.join(os.path.dirname(__file__), "templates/removal_template.txt")
+        self.template_path = template_path or os.path.join(os.path.dirname(__file__), "templates/removal_template.txt")
+        # Pre-parsed template and the mtime it was read at; re-read only when the file changes
+        self._template = None
+        self._mtime = None
 
     def _load_template(self):
-        """Helper to safely read the template file."""
-        if not os.path.exists(self.template_path):
+        """
+        Returns the pre-parsed template (a list of (literal, field, format spec) parts), or an error string.
+        The file is only read again when its mtime changes, so edits are still picked up.
+        """
+        try:
+            mtime = os.stat(self.template_path).st_mtime_ns
+        except OSError:
+            self._template = None
             return "Error: Template file missing. Please check compliance/templates/."
-        with open(self.template_path, 'r') as file:
-            return file.read()
+        if self._template is None or mtime != self._mtime:
+            with open(self.template_path, 'r') as file:
+                self._template = [(literal, field, spec) for literal, field, spec, _ in string.Formatter().parse(file.read())]
+            self._mtime = mtime
+        return self._template
+
+    @staticmethod
+    def _render(template, values):
+        parts = []
+        for literal, field, spec in template:
+            parts.append(literal)
+            if field is not None:
+                parts.append(format(values[field], spec))
+        return "".join(parts)
+
+    @staticmethod
+    def _summary_lines(findings):
+        """One "- Category (CODE): match" line per finding, duplicates dropped."""
+        lines = {}
+        for f in map(as_finding, findings):
+            # Human-readable label from the shared category registry, e.g. "Government ID (AADHAAR_ID)"
+            code = canonical_category(f.data_category)
+            label = f"{PII_CONFIG[code]['category']} ({code})" if code else f.data_category
+            lines.setdefault(f"- {label}: {f.match}")
+        return list(lines)
 
     def generate_bulk_request(self, user_name, company_name, findings):
         """
         Generates a single letter for multiple PII leaks found at one source.
-        'findings' should be a list of AI-detected items.
+        'findings' should be a list of AI-detected items (Findings or their dict form).
         """
         template = self._load_template()
-        if "Error" in template:
+        if isinstance(template, str):
             return template
 
         # Consolidate findings into a readable string for the letter
-        pii_summary = []
-        for f in findings:
-            pii_summary.append(f"- {f.get('data_category')}: {f.get('match')}")
-        
-        pii_text = "\n".join(pii_summary)
+        pii_text = "\n".join(self._summary_lines(findings))
 
         # Populate the template
         try:
-            letter = template.format(
-                company_name=company_name,
-                pii_type="the following data categories", # Generalizes the intro
-                masked_value=pii_text,
-                user_name=user_name,
-                current_date=datetime.date.today().strftime("%d %B %Y")
-            )
-            return letter
+            return self._render(template, {
+                "company_name": company_name,
+                "pii_type": "the following data categories",  # Generalizes the intro
+                "masked_value": pii_text,
+                "user_name": user_name,
+                "current_date": datetime.date.today().strftime("%d %B %Y")
+            })
         except KeyError as e:
             return f"Error: Template formatting failed. Missing key: {e}"
 
+    # ==========================================
+    # BULK (mass takedown runs)
+    # ==========================================
+    def group_by_company(self, reports, grouped=None):
+        """
+        Folds stored scan reports into {company: {target: {summary line: None}}}.
+        Only the letter lines are kept, so reports can be dropped as soon as they are folded in;
+        pass the same 'grouped' dict again to add more reports.
+        """
+        grouped = {} if grouped is None else grouped
+        for report in reports:
+            target = report.get("target")
+            source_findings = report.get("source_findings") or {}
+            for exposure in report.get("exposures", []):
+                # Real PII findings first; an exposure without any still names what leaked
+                findings = [f for f in source_findings.get(exposure.get("source"), [])
+                            if canonical_category(f.get("data_category"))]
+                lines = self._summary_lines(findings) or [f"- {item}" for item in exposure.get("pii_found", [])]
+                if not lines:
+                    continue
+                for company in companies_for(exposure):
+                    grouped.setdefault(company, {}).setdefault(target, {}).update(dict.fromkeys(lines))
+        return grouped
+
+    def iter_letters(self, grouped, names=None):
+        """
+        Returns a lazy iterator of (company, target, letter), company by company. The template is
+        checked once, up front (FileNotFoundError if it is missing), and every letter is rendered
+        only when it is asked for. 'names' maps a target to the name its letters are signed with.
+        """
+        template = self._load_template()
+        if isinstance(template, str):
+            raise FileNotFoundError(template)
+        return self._letters(template, grouped, names or {})
+
+    def _letters(self, template, grouped, names):
+        current_date = datetime.date.today().strftime("%d %B %Y")
+        for company in sorted(grouped):
+            for target, lines in grouped[company].items():
+                yield company, target, self._render(template, {
+                    "company_name": company,
+                    "pii_type": "the following data categories",
+                    "masked_value": "\n".join(lines),
+                    "user_name": names.get(target, target),
+                    "current_date": current_date
+                })
+
 # Global instance for easy access
-generator = RemovalRequestGenerator()
\ No newline at end of file
+generator = RemovalRequestGenerator()
@@ -104,7 +104,8 @@ export default function App() {
     setScanComplete(false);
     
     try {
-      const response = await fetch("http://localhost:8000/api/v1/scan/", {
+      // Streaming endpoint: each source shows up as soon as it lands (NDJSON, one event per line)
+      const response = await fetch("http://localhost:8000/api/v1/scan/stream", {
         method: "POST",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify({ 
@@ -113,10 +114,39 @@ export default function App() {
         }),
       });
 
-      if (!response.ok) throw new Error("Backend unreachable");
-      const data = await response.json();
-      
-      setScanResults(data);
+      if (!response.ok || !response.body) throw new Error("Backend unreachable");
+
+      setScanResults({ target: targetInput, total_leaks: 0, risk_score: 0, exposures: [] });
+
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = "";
+      let summary = null;
+
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        const lines = buffer.split("\n");
+        buffer = lines.pop();
+        for (const line of lines) {
+          if (!line.trim()) continue;
+          const event = JSON.parse(line);
+          if (event.event === "exposure") {
+            setScanResults(prev => ({
+              ...prev,
+              total_leaks: prev.total_leaks + 1,
+              exposures: [...prev.exposures, event.exposure]
+            }));
+          } else if (event.event === "summary") {
+            summary = event;
+            setScanResults(prev => ({ ...prev, target: event.target, total_leaks: event.total_leaks, risk_score: event.risk_score }));
+          }
+        }
+      }
+
+      if (!summary) throw new Error("Scan stream ended early");
       setScanComplete(true);
       
       // Update Search History
@@ -124,8 +154,8 @@ export default function App() {
         id: Date.now(),
         query: targetInput,
         timestamp: new Date().toLocaleTimeString(),
-        score: data.risk_score,
-        findings: data.total_leaks
+        score: summary.risk_score,
+        findings: summary.total_leaks
       }, ...prev].slice(0, 10));
 
     } catch (error) {
@@ -259,7 +289,7 @@ export default function App() {
                         </tr>
                       </thead>
                       <tbody className="text-sm divide-y divide-[#27272a]">
-                        {scanComplete ? (
+                        {scanComplete || scanResults.exposures.length > 0 ? (
                           scanResults.exposures.map((exp, idx) => (
                             <TableRow key={idx} platform={exp.platform} match={exp.match} pii={exp.pii_found?.join(', ') || 'N/A'} risk={exp.risk_level} />
                           ))
@@ -0,0 +1,17 @@
+# gunicorn.conf.py -- optional process manager for production (pip install gunicorn):
+#     gunicorn -c gunicorn.conf.py backend.app.main:app
+# `python run.py --prod` does the same with uvicorn's own worker manager.
+import os
+
+from run import production_env
+
+workers = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+production_env(workers)
+
+bind = f"{os.getenv('HOST', '127.0.0.1')}:{os.getenv('PORT', 8000)}"
+worker_class = "uvicorn.workers.UvicornWorker"
+# Not preloaded: the SQLite cache tier connects at import, and a connection must not cross a fork
+preload_app = False
+# Streaming scans and letter downloads can legitimately run for a while
+timeout = 120
+graceful_timeout = 30
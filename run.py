@@ -1,19 +1,65 @@
-import uvicorn
+import argparse
 import os
 import sys
 
+import uvicorn
+from dotenv import load_dotenv
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+def production_env(workers: int, state_dir: str = None):
+    """
+    Environment defaults for running several worker processes on one host. Each worker keeps its
+    own memory caches; what has to agree across them goes through files in 'state_dir':
+      * the scraper result cache gets its SQLite tier (CACHE_DB_PATH),
+      * upstream rate limits are paced from one shared bucket table (RATE_LIMIT_DB_PATH).
+    Reports already live in one SQLite file (REPORT_DB_PATH, .shadowtrace/reports.db) that every worker reads.
+    The enrichment process pool is divided between the workers instead of each taking every core.
+    Anything already set in the environment (or .env) wins.
+    """
+    load_dotenv(os.path.join(ROOT, ".env"))
+    state_dir = state_dir or os.getenv("SHADOWTRACE_STATE_DIR", os.path.join(ROOT, ".shadowtrace"))
+    os.makedirs(state_dir, exist_ok=True)
+    os.environ.setdefault("CACHE_DB_PATH", os.path.join(state_dir, "cache.db"))
+    os.environ.setdefault("RATE_LIMIT_DB_PATH", os.path.join(state_dir, "rate_limits.db"))
+    os.environ.setdefault("ENRICH_POOL_WORKERS", str(max(1, (os.cpu_count() or 1) // workers)))
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ShadowTrace OSINT Engine")
+    parser.add_argument("--prod", action="store_true", default=os.getenv("SHADOWTRACE_ENV") == "production",
+                        help="Multi-worker mode without auto-reload (also SHADOWTRACE_ENV=production)")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)))
+    parser.add_argument("--host", default=os.getenv("HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", 8000)))
+    args = parser.parse_args()
+
     # Force the current directory into the python path
-    path = os.path.dirname(os.path.abspath(__file__))
-    sys.path.insert(0, path)
-    
+    sys.path.insert(0, ROOT)
+
     print("🛡️ ShadowTrace OSINT Engine Starting...")
-    print(f"📍 Root Path: {path}")
-    
+    print(f"📍 Root Path: {ROOT}")
+
+    if not args.prod:
+        uvicorn.run(
+            "backend.app.main:app",
+            host=args.host,
+            port=args.port,
+            reload=True,
+            log_level="info"
+        )
+        sys.exit()
+
+    # Background jobs (/api/v1/scan/jobs) live in the worker that accepted them, so polling a job
+    # needs --workers 1 or a proxy with sticky sessions; scans, reports and letters work anywhere.
+    production_env(args.workers)
+    print(f"🚀 Production mode: {args.workers} workers, shared cache {os.environ['CACHE_DB_PATH']}")
     uvicorn.run(
-        "backend.app.main:app", 
-        host="127.0.0.1", 
-        port=8000, 
-        reload=True,
-        log_level="info"
-    )
\ No newline at end of file
+        "backend.app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        log_level=os.getenv("LOG_LEVEL", "info").lower(),
+        # One access-log line per request is measurable at load; /metrics has the same counts
+        access_log=os.getenv("ACCESS_LOG", "false").lower() in ("1", "true", "yes"),
+        proxy_headers=True
+    )
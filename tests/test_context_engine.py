@@ -0,0 +1,39 @@
+# tests/test_context_engine.py
+"""ContextEngine keyword distances: keywords after, before, nested in others, or overlapping the match."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai.context_engine import ContextEngine
+
+PAN = "ABCPE1234F"
+
+def confidence(text, keywords, near=40, window=120):
+    engine = ContextEngine({"PAN_CARD": keywords}, near=near, window=window, base={"PAN_CARD": "LOW"})
+    start = text.index(PAN)
+    return engine.confidences(text, [("PAN_CARD", start, start + len(PAN))])[0]
+
+def test_near_keyword_on_either_side():
+    assert confidence(f"taxpayer {PAN}", ["taxpayer"]) == "HIGH"
+    assert confidence(f"{PAN} taxpayer", ["taxpayer"]) == "HIGH"
+    assert confidence(f"{PAN}{' ' * 60}taxpayer", ["taxpayer"]) == "MEDIUM"
+    assert confidence(f"{PAN}{' ' * 200}taxpayer", ["taxpayer"]) == "LOW"
+
+def test_nearest_keyword_after_the_match_when_keywords_nest():
+    # "tax" (inside "big tax office") is reported before the outer keyword that starts earlier
+    text = f"{PAN}{' ' * 38}big tax office"
+    assert confidence(text, ["big tax office", "tax"]) == "HIGH"
+
+def test_keyword_overlapping_the_match_is_distance_zero():
+    engine = ContextEngine({"PHONE_NUMBER": ["contact"]}, base={"PHONE_NUMBER": "LOW"})
+    text = "contact 9876543210"
+    # A span that takes in the keyword itself (e.g. a custom pattern with a label prefix)
+    assert engine.confidences(text, [("PHONE_NUMBER", 0, len(text))]) == ["HIGH"]
+    assert ContextEngine._distance([0], [7], 3, 18) == 0
+
+def test_keyword_reaching_past_a_later_one():
+    # The long keyword starts first but ends nearest the match
+    text = f"big tax office {PAN}"
+    assert ContextEngine._distance([0, 4], [14, 14], 15, 25) == 1
+    assert confidence(text, ["big tax office", "tax"]) == "HIGH"
@@ -0,0 +1,85 @@
+# tests/test_pii_detector.py
+"""What PIIDetector reports, and that streaming a body in chunks reports exactly what scan_text does."""
+import os
+import pickle
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai.pii_detector import PIIDetector, STREAM_OVERLAP
+
+detector = PIIDetector()
+
+def matches(text):
+    return [(finding.data_category, finding.match) for finding in detector.scan_text(text)]
+
+def test_phone_with_trunk_prefix():
+    assert matches("call 09876543210 today") == [("PHONE_NUMBER", "09876543210")]
+
+def test_phone_keeps_country_code_plus():
+    assert matches("whatsapp +919876543210") == [("PHONE_NUMBER", "+919876543210")]
+    assert matches("whatsapp 919876543210") == [("PHONE_NUMBER", "919876543210")]
+    assert matches("whatsapp 9876543210") == [("PHONE_NUMBER", "9876543210")]
+
+def test_lower_case_pan():
+    assert matches("pan abcpe1234f") == [("PAN_CARD", "abcpe1234f")]
+    assert matches("pan ABCPE1234F") == [("PAN_CARD", "ABCPE1234F")]
+
+def test_categories_in_one_pass():
+    text = "mail user1@example.com, aadhaar 2345 6789 0127, api_key=xyz"
+    assert matches(text) == [
+        ("EMAIL", "user1@example.com"),
+        ("AADHAAR_ID", "2345 6789 0127"),
+        ("PRIVATE_KEY", "api_key"),
+    ]
+
+def dump(lines=2000):
+    """A paste-like body with findings spread through it, and a multi-byte character every line."""
+    rows = []
+    for i in range(lines):
+        rows.append(f"row {i} ₹ user{i}@example.com mobile +9198765{i % 100000:05d} pan ABCPE{i % 10000:04d}F")
+    return "\n".join(rows)
+
+def split_bytes(text, size):
+    data = text.encode("utf-8")
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+def scored(findings):
+    return [(finding, finding.confidence) for finding in findings]
+
+def test_stream_matches_scan_text_across_chunk_boundaries():
+    text = dump()
+    expected = scored(detector.scan_text(text))
+    # Odd chunk sizes well under the overlap: matches and UTF-8 sequences are cut mid-way
+    for size in (7, 333, STREAM_OVERLAP + 1):
+        assert scored(detector.scan_stream(split_bytes(text, size))) == expected
+
+def test_match_split_by_a_chunk_boundary_is_reported_once():
+    text = "x" * 5000 + " contact 9876543210 now"
+    cut = text.index("98765") + 3
+    streamed = list(detector.scan_stream([text[:cut], text[cut:]]))
+    assert streamed == detector.scan_text(text)
+    assert [finding.match for finding in streamed] == ["9876543210"]
+
+def test_chunk_batches_resume_from_a_pickled_state():
+    text = dump()
+    chunks = split_bytes(text, 1000)
+    findings, state = [], None
+    for i in range(0, len(chunks), 25):
+        batch = chunks[i:i + 25]
+        found, state = detector.scan_chunks(batch, state, final=i + 25 >= len(chunks))
+        # What a pool worker hands back: the findings and the tail state, both pickled
+        found, state = pickle.loads(pickle.dumps((found, state)))
+        findings.extend(found)
+    assert scored(findings) == scored(detector.scan_text(text))
+
+def test_detached_findings_drop_the_scanned_text():
+    text = "mobile 9876543210 " + "x" * 10000
+    finding, = detector.scan_text(text)
+    assert finding._source is text
+    detached = finding.detached()
+    assert detached == finding and detached.confidence == finding.confidence
+    assert detached._source == "9876543210"
+    # Stream findings are copies already
+    streamed, = detector.scan_stream([text])
+    assert streamed._source == "9876543210" and streamed.detached() is streamed
@@ -0,0 +1,53 @@
+# tests/test_rate_limit.py
+"""TokenBucket / RateGovernor reactions to the upstreams' rate-limit headers."""
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.app.scrapers.rate_limit import RateGovernor, RateLimitExceeded, TokenBucket
+
+def exhausted(reset="2", remaining="0", status=200):
+    return httpx.Response(status, headers={"x-ratelimit-remaining": remaining, "x-ratelimit-reset": reset})
+
+def test_exhausted_window_waits_for_the_reset():
+    bucket = TokenBucket(rpm=60, burst=5)
+    bucket.observe(exhausted(reset="2"))
+    assert bucket.rate > 0
+    wait = bucket._reserve(time.monotonic() + 10)
+    assert 1.5 < wait <= 2.0
+
+def test_exhausted_window_past_the_deadline_is_refused():
+    bucket = TokenBucket(rpm=60, burst=5)
+    bucket.observe(exhausted(reset="30"))
+    with pytest.raises(RateLimitExceeded):
+        bucket._reserve(time.monotonic() + 10)
+
+def test_remaining_window_is_spread_until_the_reset():
+    bucket = TokenBucket(rpm=60, burst=5)
+    bucket.observe(exhausted(reset="10", remaining="5"))
+    assert bucket.rate == pytest.approx(0.5)
+
+def test_reddit_float_remaining_403_is_retried():
+    statuses = iter([403, 200])
+
+    def handle(request):
+        status = next(statuses)
+        if status == 403:
+            return exhausted(reset="0.2", remaining="0.0", status=403)
+        return httpx.Response(200, json={"data": {}})
+
+    async def run():
+        governor = RateGovernor(db_path=None)
+        async with httpx.AsyncClient(base_url="https://www.reddit.com", transport=httpx.MockTransport(handle)) as client:
+            response = await governor.get(client, "/user/erin/about.json", "reddit")
+        return response, governor
+
+    response, governor = asyncio.run(run())
+    assert response.status_code == 200
+    assert governor.retries == 1
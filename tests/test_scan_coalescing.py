@@ -0,0 +1,81 @@
+# tests/test_scan_coalescing.py
+"""
+Concurrent identical POSTs to /api/v1/scan/ against a stub upstream (httpx.MockTransport) must
+turn into exactly one upstream request per source: the scan itself is coalesced, and so is
+every scraper call and raw body fetch under it.
+"""
+import asyncio
+import os
+import sys
+from collections import Counter
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Cold, memory-only caches and no worker processes
+os.environ.pop("CACHE_DB_PATH", None)
+os.environ["REPORT_STORE"] = "memory"
+os.environ["ENRICH_POOL_WORKERS"] = "0"
+os.environ.setdefault("HIBP_API_KEY", "stub-key")
+
+from benchmarks.mock_upstream import CODE_SEARCH_ITEMS, RAW_FILE, RAW_PASTE
+from backend.app.main import app
+from backend.app.scrapers import http_client
+
+CONCURRENT_SCANS = 20
+# Every request one uncached scan of an email makes, each exactly once
+EXPECTED_REQUESTS = {
+    "/search/commits": 1,
+    "/search/code": 1,
+    # Three code search hits: two share a blob SHA (a fork), so two raw files
+    "/mock-org/app/main/settings.py": 1,
+    "/mock-org/tools/main/deploy/settings.py": 1,
+    "/api/v3/breachedaccount/erin@example.com": 1,
+    "/user/erin/about.json": 1,
+    "/api/search/erin%40example.com": 1,
+    "/raw/abc123": 1,
+    "/raw/def456": 1,
+}
+
+def stub_upstream(requests):
+    async def handle(request):
+        path = request.url.raw_path.decode().split("?")[0]
+        requests[path] += 1
+        # Slow enough that every concurrent scan arrives while the first is still in flight
+        await asyncio.sleep(0.05)
+        if path.startswith("/search/commits"):
+            return httpx.Response(200, json={"total_count": 3, "items": [{"author": {"login": "dev-erin"}}]})
+        if path.startswith("/search/code"):
+            return httpx.Response(200, json={"total_count": len(CODE_SEARCH_ITEMS), "items": CODE_SEARCH_ITEMS})
+        if path.startswith("/api/v3/breachedaccount/"):
+            return httpx.Response(200, json=[{"Name": "LinkedIn"}])
+        if path.endswith("/about.json"):
+            return httpx.Response(200, json={"data": {"is_suspended": False, "created_utc": 0, "link_karma": 42}})
+        if path.startswith("/api/search/"):
+            return httpx.Response(200, json={"data": [{"id": "abc123"}, {"id": "def456"}]})
+        if path.startswith("/raw/"):
+            return httpx.Response(200, text=RAW_PASTE)
+        if path.startswith("/mock-org/"):
+            return httpx.Response(200, text=RAW_FILE)
+        return httpx.Response(404, json={"error": "not found"})
+    return handle
+
+def test_concurrent_identical_scans_hit_each_upstream_once():
+    requests = Counter()
+    transport = httpx.MockTransport(stub_upstream(requests))
+
+    async def run():
+        # The lifespan keeps clients that already exist, so every upstream goes to the stub
+        for name, config in http_client.UPSTREAMS.items():
+            http_client._clients[name] = httpx.AsyncClient(base_url=config["base_url"], transport=transport)
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://shadowtrace", timeout=30) as client:
+                return await asyncio.gather(*(
+                    client.post("/api/v1/scan/", json={"target_email": "erin@example.com"})
+                    for _ in range(CONCURRENT_SCANS)
+                ))
+
+    responses = asyncio.run(run())
+    assert all(response.status_code == 200 for response in responses)
+    assert len({response.text for response in responses}) == 1, "coalesced callers must see identical results"
+    assert dict(requests) == EXPECTED_REQUESTS
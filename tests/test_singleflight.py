@@ -0,0 +1,101 @@
+# tests/test_singleflight.py
+"""SingleFlight.do: coalescing, and what cancelling callers does to the shared call."""
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.app.scrapers.singleflight import SingleFlight
+
+def counting_call(result="shared", seconds=0.05):
+    counter = {"calls": 0}
+
+    async def call():
+        counter["calls"] += 1
+        await asyncio.sleep(seconds)
+        return result
+
+    return call, counter
+
+def test_concurrent_callers_share_one_call():
+    async def run():
+        flight = SingleFlight()
+        call, counter = counting_call()
+        results = await asyncio.gather(*(flight.do("k", call) for _ in range(10)))
+        assert results == ["shared"] * 10
+        assert counter["calls"] == 1
+        assert flight.stats() == {"started": 1, "coalesced": 9, "in_flight": 0}
+
+    asyncio.run(run())
+
+def test_different_keys_do_not_coalesce():
+    async def run():
+        flight = SingleFlight()
+        call, counter = counting_call()
+        await asyncio.gather(flight.do("a", call), flight.do("b", call))
+        assert counter["calls"] == 2
+
+    asyncio.run(run())
+
+def test_failure_reaches_every_caller_and_is_not_kept():
+    async def run():
+        flight = SingleFlight()
+        calls = 0
+
+        async def failing():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        results = await asyncio.gather(*(flight.do("k", failing) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert calls == 1 and not flight.calls
+        await asyncio.gather(flight.do("k", failing), return_exceptions=True)
+        assert calls == 2
+
+    asyncio.run(run())
+
+def test_cancelled_caller_leaves_the_shared_call_running():
+    async def run():
+        flight = SingleFlight()
+        call, counter = counting_call()
+        tasks = [asyncio.create_task(flight.do("k", call)) for _ in range(10)]
+        await asyncio.sleep(0.01)
+        for task in tasks[:5]:
+            task.cancel()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        assert all(isinstance(r, asyncio.CancelledError) for r in results[:5])
+        assert results[5:] == ["shared"] * 5
+        assert counter["calls"] == 1
+
+    asyncio.run(run())
+
+def test_last_caller_cancelling_cancels_the_call():
+    async def run():
+        flight = SingleFlight()
+        cancelled = asyncio.Event()
+        calls = 0
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            try:
+                await asyncio.sleep(0.05)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return "fresh"
+
+        task = asyncio.create_task(flight.do("k", call))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await asyncio.wait_for(cancelled.wait(), 1)
+
+        # The abandoned call is not joined: the next caller starts a new one
+        assert await flight.do("k", call) == "fresh"
+        assert calls == 2 and not flight.calls
+
+    asyncio.run(run())